@@ -24,18 +24,34 @@
 
 """Ansys SCADE ALM Gateway Python Toolbox."""
 
-try:
-    import importlib.metadata as importlib_metadata
-except ModuleNotFoundError:
-    import importlib_metadata
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    # the version is computed on first access: loading importlib.metadata
+    # is a significant part of the connectors' startup time
+    if name == '__version__':
+        try:
+            import importlib.metadata as importlib_metadata
+        except ModuleNotFoundError:
+            import importlib_metadata
+
+        try:
+            version = importlib_metadata.version(__name__.replace('.', '-'))
+        except importlib_metadata.PackageNotFoundError:
+            # happens with pre-commit, the package is not installed in the virtual environment
+            version = '<unknown>'
+        globals()['__version__'] = version
+        return version
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
 
-try:
-    __version__ = importlib_metadata.version(__name__.replace('.', '-'))
-except importlib_metadata.PackageNotFoundError:
-    # happens with pre-commit, the package is not installed in the virtual environment
-    __version__ = '<unknown>'
 
 # constants for built-in settings
 TOOL = 'ALMGW'
 LLRSCHEMA = 'LLRSCHEMA'
 LLRSCHEMA_DEFAULT = ''
+
+# environment variable to forward the commands to a server, cf. daemon.py
+DAEMON_VARIABLE = 'PYALMGW_DAEMON'
+# environment variable to profile the commands, cf. profiling.py
+PROFILE_VARIABLE = 'PYALMGW_PROFILE'
@@ -0,0 +1,111 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides a base class for connectors based on ``asyncio``.
+
+The ``on_*`` methods of an ``AsyncConnector`` can be coroutines, so that
+the connector can send concurrent requests to the REST API of the ALM tool
+with an ``HttpClient``.
+"""
+
+import asyncio
+from typing import Any, Iterable, List, Optional, Tuple
+
+# fetch_documents is defined in the client module, which does not depend on SCADE
+from ansys.scade.pyalmgw.client import (  # noqa: F401
+    NOT_MODIFIED,
+    HttpClient,
+    fetch_documents,
+)
+from ansys.scade.pyalmgw.connector import Connector
+
+
+class AsyncConnector(Connector):
+    """
+    Base class for connectors with asynchronous ``on_*`` methods.
+
+    Each command runs its coroutine in a new event loop.
+    The connector creates an ``HttpClient`` on demand with ``create_client``,
+    shared by the commands of a batch and closed at the end of the command.
+
+    Parameters
+    ----------
+    id : str
+        Identifier of the connector.
+    project : Project
+        Input SCADE project, optional.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._client: Optional[HttpClient] = None
+        # whether the commands are executed by execute_batch
+        self._batch = False
+
+    def create_client(self) -> HttpClient:
+        """
+        Return a new HTTP client for the ALM tool.
+
+        The default implementation raises an exception: connectors
+        that use ``client`` must redefine it, for example with the
+        URL and the credentials stored in the settings.
+        """
+        raise NotImplementedError('create_client')
+
+    @property
+    def client(self) -> HttpClient:
+        """Return the HTTP client, created on the first access."""
+        if self._client is None:
+            self._client = self.create_client()
+        return self._client
+
+    def close_client(self):
+        """Close the HTTP client, if any."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def resolve(self, result: Any) -> int:
+        """Run the coroutine returned by an ``on_*`` method, if any, and return its status code."""
+        if asyncio.iscoroutine(result):
+            return asyncio.run(result)
+        return result
+
+    def execute(self, command: str, *args: str) -> int:
+        """Execute a command and close the HTTP client."""
+        try:
+            return super().execute(command, *args)
+        finally:
+            # the connections are not bound to the event loop of the command:
+            # keep them for the next commands of a batch
+            if not self._batch:
+                self.close_client()
+
+    def execute_batch(self, lines: Iterable[str]) -> List[Tuple[List[str], int]]:
+        """Execute a sequence of commands with the same HTTP client."""
+        self._batch = True
+        try:
+            return super().execute_batch(lines)
+        finally:
+            self._batch = False
+            self.close_client()
@@ -0,0 +1,530 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides an HTTP client for the REST APIs of the ALM tools.
+
+The client is based on the standard library: the requests are sent with
+``http.client`` connections, kept alive in a pool, by a pool of threads.
+The coroutines of the client await these requests, so that a connector
+can send many requests concurrently, up to the size of the pools.
+
+The failed requests are retried with an exponential backoff, when
+the error is transient: network errors, or status codes such as 503.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import json
+import queue
+import random
+import ssl
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlencode, urljoin, urlsplit
+
+from ansys.scade.pyalmgw.log import get_logger
+
+if TYPE_CHECKING:
+    from ansys.scade.pyalmgw.doccache import DocumentCache
+    from ansys.scade.pyalmgw.documents import ReqDocument, ReqProject
+
+_logger = get_logger(__name__)
+
+# default maximum number of concurrent requests
+MAX_CONNECTIONS = 8
+# default timeout of the requests, in seconds
+TIMEOUT = 30.0
+# default number of retries for transient errors
+RETRIES = 3
+# default initial and maximum delays between two retries, in seconds
+BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+# status codes of transient errors
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+# methods that can be sent again without side effects
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+# status of a conditional request for an unchanged resource
+NOT_MODIFIED = 304
+
+
+class HttpError(Exception):
+    """
+    Error status returned by the server.
+
+    Parameters
+    ----------
+    response : Response
+        Response of the server.
+    """
+
+    def __init__(self, response: 'Response'):
+        super().__init__(
+            '%s %s: %d %s' % (response.method, response.url, response.status, response.reason)
+        )
+        self.response = response
+
+    @property
+    def status(self) -> int:
+        """Return the status code of the response."""
+        return self.response.status
+
+
+class Response:
+    """
+    Response of the server.
+
+    Parameters
+    ----------
+    method : str
+        Method of the request.
+    url : str
+        URL of the request.
+    status : int
+        Status code.
+    reason : str
+        Reason phrase.
+    headers : Dict[str, str]
+        Headers, with lowercase names.
+    body : bytes
+        Content of the response.
+    """
+
+    def __init__(
+        self, method: str, url: str, status: int, reason: str, headers: Dict[str, str], body: bytes
+    ):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the status is a success."""
+        return 200 <= self.status < 300
+
+    def text(self) -> str:
+        """Return the content as text."""
+        content_type = self.headers.get('content-type', '')
+        charset = 'utf-8'
+        if 'charset=' in content_type:
+            charset = content_type.split('charset=', 1)[1].split(';')[0].strip()
+        return self.body.decode(charset, errors='replace')
+
+    def json(self) -> Any:
+        """Return the content as a ``json`` object."""
+        return json.loads(self.text())
+
+    def raise_for_status(self):
+        """Raise an ``HttpError`` when the status is not a success."""
+        if not self.ok:
+            raise HttpError(self)
+
+
+class HttpClient:
+    """
+    Pooled HTTP client, with retries and helpers for paginated resources.
+
+    Parameters
+    ----------
+    base_url : str
+        URL of the service, for example ``https://alm.example.com/api/``.
+        The URLs of the requests are relative to this one.
+    headers : Mapping[str, str]
+        Headers added to all the requests, for example ``Authorization``.
+    max_connections : int
+        Maximum number of concurrent requests, and connections kept alive.
+    timeout : float
+        Timeout of the network operations, in seconds.
+    retries : int
+        Number of retries for the transient errors.
+    backoff : float
+        Initial delay between two retries, in seconds, doubled after each retry.
+    max_backoff : float
+        Maximum delay between two retries, in seconds.
+    context : ssl.SSLContext
+        Context for the ``https`` connections, default the system's one.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        max_connections: int = MAX_CONNECTIONS,
+        timeout: float = TIMEOUT,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+        context: Optional[ssl.SSLContext] = None,
+    ):
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.headers = dict(headers or {})
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.context = context
+        # idle connections, indexed by scheme and location
+        self._connections: Dict[Tuple[str, str], queue.LifoQueue] = {}
+        self._executor = ThreadPoolExecutor(max_connections, thread_name_prefix='pyalmgw-http')
+        # statistics, updated by the threads of the executor
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    # context manager
+    async def __aenter__(self) -> 'HttpClient':
+        """Return the client."""
+        return self
+
+    async def __aexit__(self, *args):
+        """Close the client."""
+        self.close()
+
+    def close(self):
+        """Close the connections and stop the threads."""
+        self._executor.shutdown(wait=True)
+        for idle in self._connections.values():
+            while not idle.empty():
+                idle.get_nowait().close()
+        self._connections = {}
+
+    # requests
+    def get_url(self, url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        """Return the absolute URL of a request."""
+        url = urljoin(self.base_url, url)
+        if params:
+            url += ('&' if '?' in url else '?') + urlencode(params, doseq=True)
+        return url
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        check: bool = True,
+    ) -> Response:
+        """
+        Send a request and return the response.
+
+        The request is sent again after a transient error, if the method is idempotent.
+        Any request is sent again with a new connection when a kept-alive connection
+        has been closed by the server, before any response.
+
+        Parameters
+        ----------
+        method : str
+            Method of the request, for example ``GET``.
+        url : str
+            URL of the request, relative to the base URL.
+        params : Mapping[str, Any]
+            Parameters of the query.
+        json : Any
+            Content of the request, serialized to ``json``.
+        data : bytes
+            Content of the request, when ``json`` is None.
+        headers : Mapping[str, str]
+            Additional headers.
+        check : bool
+            Whether to raise an ``HttpError`` for an error status.
+
+        Returns
+        -------
+        Response
+            Response of the server.
+        """
+        full_url = self.get_url(url, params)
+        all_headers = dict(self.headers)
+        if headers:
+            all_headers.update(headers)
+        if json is not None:
+            data = _json_dumps(json)
+            all_headers.setdefault('Content-Type', 'application/json')
+        retries = self.retries if method.upper() in IDEMPOTENT_METHODS else 0
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            try:
+                response = await loop.run_in_executor(
+                    self._executor, self._send, method.upper(), full_url, data, all_headers
+                )
+            except (OSError, http.client.HTTPException) as e:
+                if attempt >= retries:
+                    raise
+                delay = self._get_delay(attempt, None)
+                _logger.warning('%s %s: %s, retrying in %.2f s', method, full_url, e, delay)
+            else:
+                if response.status not in RETRY_STATUSES or attempt >= retries:
+                    break
+                delay = self._get_delay(attempt, response.headers.get('retry-after'))
+                _logger.warning(
+                    '%s %s: %d, retrying in %.2f s', method, full_url, response.status, delay
+                )
+            attempt += 1
+            await asyncio.sleep(delay)
+        if check:
+            response.raise_for_status()
+        return response
+
+    async def get(self, url: str, params: Optional[Mapping[str, Any]] = None, **kwargs) -> Response:
+        """Send a ``GET`` request."""
+        return await self.request('GET', url, params=params, **kwargs)
+
+    async def post(self, url: str, json: Any = None, **kwargs) -> Response:
+        """Send a ``POST`` request."""
+        return await self.request('POST', url, json=json, **kwargs)
+
+    async def get_json(self, url: str, params: Optional[Mapping[str, Any]] = None) -> Any:
+        """Send a ``GET`` request and return the content of the response as ``json``."""
+        response = await self.get(url, params=params)
+        return response.json()
+
+    async def paginate(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        items: str = 'items',
+        next: str = 'next',
+    ) -> AsyncIterator[Any]:
+        """
+        Iterate over the items of a paginated resource.
+
+        Each page is a ``json`` object with the list of items and the
+        URL of the next page, if any. For example
+        ``{"items": [...], "next": "requirements?page=2"}``.
+
+        Parameters
+        ----------
+        url : str
+            URL of the first page.
+        params : Mapping[str, Any]
+            Parameters of the query of the first page.
+        items : str
+            Name of the list of items in a page.
+        next : str
+            Name of the URL of the next page in a page.
+
+        Yields
+        ------
+        Any
+            Items of the pages.
+        """
+        page_url: Optional[str] = self.get_url(url, params)
+        while page_url:
+            page = await self.get_json(page_url)
+            for item in page.get(items, []):
+                yield item
+            next_url = page.get(next)
+            # relative to the current page
+            page_url = urljoin(page_url, next_url) if next_url else None
+
+    # implementation
+    def _get_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Return the delay before the next retry."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                # HTTP date: not supported
+                pass
+        delay = min(self.backoff * (2**attempt), self.max_backoff)
+        # jitter, so that concurrent clients do not retry at the same time
+        return random.uniform(delay / 2, delay)  # nosec B311  # not a security purpose
+
+    def _get_connection(
+        self, scheme: str, netloc: str, reuse: bool = True
+    ) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return an idle connection or a new one, and whether the connection is reused."""
+        idle = self._connections.setdefault((scheme, netloc), queue.LifoQueue())
+        if reuse:
+            try:
+                return idle.get_nowait(), True
+            except queue.Empty:
+                pass
+        with self._lock:
+            self.connections += 1
+        if scheme == 'https':
+            connection = http.client.HTTPSConnection(
+                netloc, timeout=self.timeout, context=self.context
+            )
+        else:
+            connection = http.client.HTTPConnection(netloc, timeout=self.timeout)
+        return connection, False
+
+    def _send(
+        self, method: str, url: str, data: Optional[bytes], headers: Dict[str, str]
+    ) -> Response:
+        """Send a request with a pooled connection, in a thread of the executor."""
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        with self._lock:
+            self.requests += 1
+        start = time.perf_counter()
+        connection, reused = self._get_connection(parts.scheme, parts.netloc)
+        while True:
+            try:
+                connection.request(method, path, body=data, headers=headers)
+                response = connection.getresponse()
+                break
+            except ConnectionError as e:
+                # includes RemoteDisconnected: no response has been received
+                connection.close()
+                if not reused:
+                    raise
+                # the server has closed the idle connection: the request is sent again,
+                # whatever the method, with a new connection
+                _logger.debug('%s %s: %s, new connection', method, url, e)
+                connection, reused = self._get_connection(parts.scheme, parts.netloc, False)
+            except BaseException:
+                connection.close()
+                raise
+        try:
+            body = response.read()
+        except BaseException:
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            # keep alive
+            self._connections[(parts.scheme, parts.netloc)].put(connection)
+        _logger.debug(
+            '%s %s: %d (%.3f ms)',
+            method,
+            url,
+            response.status,
+            (time.perf_counter() - start) * 1000,
+        )
+        headers_ = {name.lower(): value for name, value in response.getheaders()}
+        return Response(method, url, response.status, response.reason, headers_, body)
+
+
+def _json_dumps(object_: Any) -> bytes:
+    """Serialize an object to ``json``."""
+    return json.dumps(object_).encode('utf-8')
+
+
+async def fetch_documents(
+    client: HttpClient,
+    project: 'ReqProject',
+    urls: Iterable[str],
+    build: Callable[['ReqDocument', Any], None],
+    cache: Optional['DocumentCache'] = None,
+    revisions: Optional[Mapping[str, str]] = None,
+) -> List['ReqDocument']:
+    """
+    Fetch documents concurrently and add them to a requirements project.
+
+    The documents are added in the order of the URLs, whatever the order
+    of the responses.
+
+    When a cache is provided, the requests are conditional: the documents
+    that the server reports as not modified, or whose revision is the cached one,
+    are restored from the cache instead of being parsed again.
+
+    Parameters
+    ----------
+    client : HttpClient
+        HTTP client.
+    project : ReqProject
+        Requirements project to complete.
+    urls : Iterable[str]
+        URLs of the documents, relative to the base URL of the client.
+    build : Callable[[ReqDocument, Any], None]
+        Function that completes a new document from the ``json`` content of its URL,
+        for example with its name, sections and requirements.
+    cache : DocumentCache
+        Cache of the documents, indexed by URL, optional.
+        The index of the cache is not saved.
+    revisions : Mapping[str, str]
+        Revisions of the documents, indexed by URL, if known before the requests,
+        for example from the list of the documents.
+
+    Returns
+    -------
+    List[ReqDocument]
+        New documents.
+    """
+    from ansys.scade.pyalmgw.documents import ReqDocument
+
+    urls = list(urls)
+    revisions = revisions or {}
+
+    async def fetch(url: str) -> Optional[Response]:
+        headers = {}
+        if cache:
+            if cache.is_current(url, revisions.get(url, '')):
+                # no request
+                return None
+            entry = cache.get_entry(url)
+            if entry:
+                headers = entry.get_conditional_headers()
+        response = await client.get(url, headers=headers, check=False)
+        if response.status != NOT_MODIFIED:
+            response.raise_for_status()
+        return response
+
+    responses = await asyncio.gather(*(fetch(url) for url in urls))
+    documents = []
+    for url, response in zip(urls, responses):
+        if cache and (response is None or response.status == NOT_MODIFIED):
+            document = cache.load(url, project)
+            if document:
+                cache.set_revision(url, revisions.get(url, ''))
+                documents.append(document)
+                continue
+            # the snapshot is not readable: the document must be downloaded
+            response = await client.get(url)
+        assert response is not None  # nosec B101  # addresses linter
+        document = ReqDocument(project)
+        build(document, response.json())
+        documents.append(document)
+        if cache:
+            cache.store(
+                url,
+                document,
+                response.headers.get('etag', ''),
+                response.headers.get('last-modified', ''),
+                revisions.get(url, ''),
+            )
+    return documents
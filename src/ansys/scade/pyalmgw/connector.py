@@ -29,10 +29,16 @@ The other methods can be also overridden to provide alternative implementations.
 """
 
 from abc import ABCMeta, abstractmethod
+import json
+import logging
+import os
 from pathlib import Path
+import shlex
 import shutil
 import sys
-from typing import Optional
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
 
 # shall modify sys.path to access SCACE APIs
 from ansys.scade.apitools import declare_project
@@ -42,9 +48,37 @@ from ansys.scade.apitools import declare_project
 from scade.model.project.stdproject import Project, get_roots as get_projects
 
 import ansys.scade.pyalmgw as pyalmgw
-from ansys.scade.pyalmgw.llrs import LLRExport, get_export_class
+from ansys.scade.pyalmgw.log import configure, get_logger, span, timed
+from ansys.scade.pyalmgw.metrics import Metrics, append_record
 import ansys.scade.pyalmgw.utils as utils
 
+# the modules for exporting the surrogate model, that load most of the SCADE APIs,
+# and the server are imported on first use: most of the commands don't need them
+if TYPE_CHECKING:  # pragma: no cover
+    from ansys.scade.pyalmgw.llrs import LLRExport
+
+
+def _split_command_line(line: str) -> List[str]:
+    """Split a command line, keeping the backslashes of Windows paths."""
+    args = []
+    for arg in shlex.split(line, posix=False):
+        if len(arg) >= 2 and arg[0] == arg[-1] and arg[0] in '"\'':
+            arg = arg[1:-1]
+        args.append(arg)
+    return args
+
+
+_logger = get_logger(__name__)
+
+# default time, in seconds, to wait for an asynchronous export
+WAIT_TIMEOUT = 600
+# interval, in seconds, between two updates of the status by the background process
+HEARTBEAT_INTERVAL = 5.0
+# time, in seconds, without any update of the status before the export is considered stale
+STALE_TIMEOUT = 30.0
+# interval, in seconds, between two reads of the status of an asynchronous export
+POLL_INTERVAL = 0.5
+
 
 class Connector(metaclass=ABCMeta):
     """Top-level class for an external ALM Gateway connector."""
@@ -52,6 +86,14 @@ class Connector(metaclass=ABCMeta):
     def __init__(self, id: str, project: Optional[Project] = None):
         self.project = project
         self.id = id
+        # keep the export class, and its parsed schema, between commands
+        # when the connector is run by a server
+        self.cache_export_class = False
+        self.export_class: Optional['LLRExport'] = None
+        # instrumentation of the commands
+        self.metrics = Metrics()
+        # whether the process is the background worker of an asynchronous export
+        self.background = False
 
     # llrs
     def get_llrs_file(self) -> Path:
@@ -111,23 +153,297 @@ class Connector(metaclass=ABCMeta):
         assert self.project is not None  # nosec B101  # addresses linter
         return self.project.get_bool_tool_prop_def('ALMGW', 'DIAGRAMS', False, None)
 
+    def get_llr_incremental(self) -> bool:
+        """
+        Return whether the surrogate model should be compared to the previous export.
+
+        By default, the information is expected to be persisted in the project as
+        a tool property ``@ALMGW:INCREMENTAL`` (default: ``false``).
+        """
+        assert self.project is not None  # nosec B101  # addresses linter
+        return self.project.get_bool_tool_prop_def('ALMGW', 'INCREMENTAL', False, None)
+
+    def get_metrics_enabled(self) -> bool:
+        """
+        Return whether the metrics of the commands should be logged.
+
+        By default, the information is expected to be persisted in the project as
+        a tool property ``@ALMGW:METRICS`` (default: ``false``).
+        """
+        assert self.project is not None  # nosec B101  # addresses linter
+        return self.project.get_bool_tool_prop_def('ALMGW', 'METRICS', False, None)
+
+    def get_metrics_file(self) -> Path:
+        """Return the path of the JSON-lines file to log the metrics of the commands."""
+        assert self.project is not None  # nosec B101  # addresses linter
+        return Path(self.project.pathname).with_suffix('.' + self.id + '.metrics.jsonl')
+
+    def get_llr_async(self) -> bool:
+        """
+        Return whether the surrogate model should be generated by a background process.
+
+        By default, the information is expected to be persisted in the project as
+        a tool property ``@ALMGW:ASYNC`` (default: ``false``).
+        """
+        assert self.project is not None  # nosec B101  # addresses linter
+        return self.project.get_bool_tool_prop_def('ALMGW', 'ASYNC', False, None)
+
+    def get_llrs_status_file(self) -> Path:
+        """Return the path of the file to contain the status of an asynchronous export."""
+        pathname = self.get_llrs_file()
+        return pathname.with_suffix(pathname.suffix + '.status')
+
+    def read_llrs_status(self) -> Optional[Dict[str, Any]]:
+        """Return the status of the last asynchronous export, if any."""
+        try:
+            return json.loads(self.get_llrs_status_file().read_text())
+        except (OSError, ValueError):
+            # no status or being written
+            return None
+
+    def write_llrs_status(self, state: str, **info: Any):
+        r"""
+        Save the status of an asynchronous export.
+
+        Parameters
+        ----------
+        state : str
+            One of ``pending``, ``running``, ``done`` or ``failed``.
+        \*\*info : Any
+            Additional information, for example the current phase or an error message.
+        """
+        status = {'state': state, 'updated': time.time()}
+        status.update(info)
+        utils.write_json(status, self.get_llrs_status_file())
+
+    def start_llrs_export(self) -> Path:
+        """
+        Start the generation of the surrogate model in a background process.
+
+        The process executes the command ``-llrs <project>`` with the connector's
+        script and reports its progress in :meth:`get_llrs_status_file`.
+        The status records the process ID, so that a terminated process is detected.
+
+        Returns
+        -------
+        Path
+            Path of the file to contain the exported LLRS.
+        """
+        import ansys.scade.pyalmgw.daemon as daemon
+
+        assert self.project is not None  # nosec B101  # addresses linter
+        self.write_llrs_status('pending')
+        pid = daemon.spawn(sys.argv[0], self.project.pathname, 'llrs')
+        status = self.read_llrs_status()
+        if status is not None and status.get('state') == 'pending':
+            # else the process has already reported its own status
+            self.write_llrs_status('pending', pid=pid)
+        return self.get_llrs_file()
+
+    def wait_llrs(self, timeout: float = WAIT_TIMEOUT) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the completion of an asynchronous export, if any.
+
+        The export is failed when its process is terminated, for example when it
+        has been killed. The function stops waiting after ``timeout`` seconds,
+        or when the status has not been updated for ``STALE_TIMEOUT`` seconds,
+        while the background process updates it every ``HEARTBEAT_INTERVAL`` seconds.
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum time, in seconds, to wait for the completion of the export.
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            Last status of the export, if any.
+        """
+        import ansys.scade.pyalmgw.daemon as daemon
+
+        deadline = time.monotonic() + timeout
+        status = self.read_llrs_status()
+        while status is None or status.get('state') in {'pending', 'running'}:
+            pid = status.get('pid') if status is not None else None
+            if pid is not None and not daemon.is_alive(pid):
+                _logger.warning('%s: asynchronous export terminated', self.get_llrs_file())
+                error = 'process %d terminated' % pid
+                self.write_llrs_status('failed', pid=pid, error=error)
+                status = self.read_llrs_status()
+                break
+            if status is not None and time.time() - status.get('updated', 0) > STALE_TIMEOUT:
+                _logger.warning('%s: asynchronous export not responding', self.get_llrs_file())
+                break
+            if time.monotonic() > deadline:
+                _logger.warning(
+                    '%s: timeout waiting for the asynchronous export', self.get_llrs_file()
+                )
+                break
+            if status is None and not self.get_llrs_status_file().exists():
+                # no export
+                break
+            time.sleep(POLL_INTERVAL)
+            status = self.read_llrs_status()
+        return status
+
+    def get_llrs_delta_file(self) -> Path:
+        """Return the path of the file to contain the differences with the previous export."""
+        pathname = self.get_llrs_file()
+        return pathname.with_suffix(pathname.suffix + '.delta')
+
+    def get_req_index_enabled(self) -> bool:
+        """
+        Return whether the index of the traceability links should be maintained.
+
+        By default, the information is expected to be persisted in the project as
+        a tool property ``@ALMGW:REQINDEX`` (default: ``false``).
+        """
+        assert self.project is not None  # nosec B101  # addresses linter
+        return self.project.get_bool_tool_prop_def('ALMGW', 'REQINDEX', False, None)
+
+    def get_req_index_file(self) -> Path:
+        """Return the path of the index of the traceability links."""
+        assert self.project is not None  # nosec B101  # addresses linter
+        return Path(self.project.pathname).with_suffix('.' + self.id + '.reqidx')
+
+    def locate_elements(self, req: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        Return the model elements linked to a requirement, for the ``locate`` command.
+
+        The elements are read from the index maintained by the ``import`` and ``export``
+        commands, when the tool property ``@ALMGW:REQINDEX`` is set.
+
+        Parameters
+        ----------
+        req : str
+            Identifier of the requirement.
+
+        Returns
+        -------
+        Optional[List[Tuple[str, str]]]
+            OIDs and pathnames of the model elements, or None if the index is not available.
+        """
+        from ansys.scade.pyalmgw.reqindex import ReqIndex
+
+        try:
+            with ReqIndex(self.get_req_index_file()) as index:
+                return index.locate(req)
+        except (OSError, ValueError) as e:
+            _logger.warning(str(e))
+            return None
+
+    def get_llrs_fingerprint_file(self) -> Path:
+        """Return the path of the file to contain the fingerprint of the exported model."""
+        pathname = self.get_llrs_file()
+        return pathname.with_suffix(pathname.suffix + '.fingerprint')
+
+    def get_model_files(self) -> List[Path]:
+        """
+        Return the files the surrogate model depends on.
+
+        These are the project, its files, the files of the library projects,
+        recursively, and the ALM Gateway configuration of the project, if any.
+        """
+        from ansys.scade.pyalmgw.fingerprint import get_project_files
+
+        assert self.project is not None  # nosec B101  # addresses linter
+        project = Path(self.project.pathname)
+        files = [project]
+        files.extend(Path(file_ref.pathname) for file_ref in self.project.file_refs)
+        visited = {project.resolve()}
+        for file in list(files[1:]):
+            if file.suffix.lower() == '.etp' and file.resolve() not in visited:
+                # library project: not loaded, parsed directly
+                files.extend(get_project_files(file, visited))
+        almgp = project.with_suffix('.almgp')
+        if almgp.exists():
+            files.append(almgp)
+        # remove the duplicates, keeping the order
+        return list(dict.fromkeys(files))
+
+    @timed()
     def export_llrs(self):
-        """Generate the surrogate models."""
+        """
+        Generate the surrogate models.
+
+        In incremental mode, the export is skipped when the fingerprint of the model,
+        its files, the schema and the options, matches the one of the previous export.
+        Otherwise, the surrogate model is compared to the previous export:
+        the file is not rewritten when there are no changes, otherwise the differences
+        are saved to the delta file, for connectors synchronizing only the modified elements.
+        The delta file is removed when there are no changes.
+
+        In asynchronous mode, the function starts the export in a background process
+        and returns immediately, cf. :meth:`start_llrs_export`.
+        """
+        if not self.background and self.get_llr_async():
+            return self.start_llrs_export()
         # apply the script to the project
         pathname = self.get_llrs_file()
         schema = self.get_llr_schema()
         diagrams = self.get_llr_diagrams()
-        cls = self.get_export_class()
+        incremental = self.get_llr_incremental()
+        if incremental:
+            from ansys.scade.pyalmgw.fingerprint import compute_fingerprint, same_fingerprint
+            from ansys.scade.pyalmgw.surrogate import diff_models, is_empty_delta
+
+            fingerprint_file = self.get_llrs_fingerprint_file()
+            previous = utils.read_json(fingerprint_file) if fingerprint_file.exists() else None
+            options = {
+                'diagrams': diagrams,
+                'schema': schema.as_posix(),
+                'tool': pyalmgw.__version__,
+            }
+            with self.metrics.phase('fingerprint'):
+                files = self.get_model_files() + [schema]
+                fingerprint = compute_fingerprint(files, options, previous)
+            if pathname.exists() and same_fingerprint(previous, fingerprint):
+                _logger.debug('%s: model unchanged', pathname)
+                # no changes since the previous export
+                delta_file = self.get_llrs_delta_file()
+                if delta_file.exists():
+                    delta_file.unlink()
+                return pathname
+        if self.cache_export_class and self.export_class is not None:
+            cls = self.export_class
+        else:
+            cls = self.get_export_class()
+            if self.cache_export_class:
+                self.export_class = cls
         if cls is None:
-            print('No export class available for this project')
+            _logger.error('No export class available for this project')
             return None
-        cls.read_schema(schema)
-        data = cls.dump_model(diagrams=diagrams)
-        cls.write(data, pathname)
+        with self.metrics.phase('schema'):
+            cls.read_schema(schema)
+        with self.metrics.phase('dump'):
+            data = cls.dump_model(diagrams=diagrams)
+        with self.metrics.phase('write'):
+            if incremental:
+                previous = utils.read_json(pathname) if pathname.exists() else None
+                delta = diff_models(previous if previous is not None else {}, data)
+                delta_file = self.get_llrs_delta_file()
+                if is_empty_delta(delta):
+                    _logger.debug('%s: surrogate model unchanged', pathname)
+                    if delta_file.exists():
+                        delta_file.unlink()
+                elif not utils.write_json(delta, delta_file):
+                    _logger.error('%s: delta not written', delta_file)
+                    return None
+                elif not cls.write(data, pathname):
+                    # the next export computes the delta again from the previous file
+                    _logger.error('%s: surrogate model not written', pathname)
+                    return None
+                # the fingerprint is saved only when the files are up-to-date
+                utils.write_json(fingerprint, fingerprint_file)
+            elif not cls.write(data, pathname):
+                _logger.error('%s: surrogate model not written', pathname)
+                return None
         return pathname
 
-    def get_export_class(self) -> Optional[LLRExport]:
+    def get_export_class(self) -> Optional['LLRExport']:
         """Return an instance of LLRExport."""
+        from ansys.scade.pyalmgw.llrs import get_export_class
+
         return get_export_class(self.project)
 
     # ---------------------------------------------
@@ -159,6 +475,24 @@ class Connector(metaclass=ABCMeta):
         """Process the ``locate`` command."""
         raise NotImplementedError('Abstract method call')
 
+    def resolve(self, result: Any) -> int:
+        """
+        Return the status code of a command, from the result of its ``on_*`` method.
+
+        This method allows derived classes to return other objects than status codes,
+        for example coroutines: refer to ``AsyncConnector``.
+
+        Parameters
+        ----------
+        result : Any
+            Value returned by an ``on_*`` method.
+
+        Returns
+        -------
+        int
+        """
+        return result
+
     # ---------------------------------------------
     # ALM Gateway commands
     # ---------------------------------------------
@@ -180,7 +514,7 @@ class Connector(metaclass=ABCMeta):
             * 0: set settings information shall be OK
             * 1: ALM Gateway project shall be removed, i.e., ALM connection shall be reset
         """
-        code = self.on_settings(pid)
+        code = self.resolve(self.on_settings(pid))
         return code
 
     def _cmd_import(self, req_file: Path, pid: int) -> int:
@@ -201,7 +535,12 @@ class Connector(metaclass=ABCMeta):
             * -1: if an error occurs, therefore previous export status and requirement tree shall be kept
             * 0: requirements and traceability links shall be correctly imported
         """
-        code = self.on_import(req_file, pid)
+        code = self.resolve(self.on_import(req_file, pid))
+        if code == 0 and self.project is not None and self.get_req_index_enabled():
+            from ansys.scade.pyalmgw.reqindex import build_index
+
+            with self.metrics.phase('index'):
+                build_index(self.get_req_index_file(), req_file, self.get_llrs_file())
 
         if code == 0 and utils.traceon:
             # save a copy for debug purposes
@@ -238,7 +577,14 @@ class Connector(metaclass=ABCMeta):
             except BaseException:
                 pass
         # virtual call
-        code = self.on_export(links, pid)
+        code = self.resolve(self.on_export(links, pid))
+        if code == 1 and self.project is not None and self.get_req_index_enabled():
+            from ansys.scade.pyalmgw.reqindex import update_index
+
+            # an asynchronous export updates the pathnames once complete
+            llrs = None if self.get_llr_async() else self.get_llrs_file()
+            with self.metrics.phase('index'):
+                update_index(self.get_req_index_file(), links, llrs)
 
         return code
 
@@ -259,7 +605,7 @@ class Connector(metaclass=ABCMeta):
             * 0: if ‘Management Requirements’ UI of ALM tool is successfully launched
             * 1: to clean requirement list on the SCADE IDE 'Requirements' window
         """
-        code = self.on_manage(pid)
+        code = self.resolve(self.on_manage(pid))
         return code
 
     def _cmd_locate(self, req: str, pid: int) -> int:
@@ -280,7 +626,7 @@ class Connector(metaclass=ABCMeta):
             * -1: if an error occurs while executing the command
             * 0: if the command is successfully executed
         """
-        code = self.on_locate(req, pid)
+        code = self.resolve(self.on_locate(req, pid))
         return code
 
     def execute(self, command: str, *args: str) -> int:
@@ -299,7 +645,97 @@ class Connector(metaclass=ABCMeta):
         int
             Return code of the executed command.
         """
-        if command == 'settings':
+        # the record is logged even if the command fails, without return code
+        record = {}
+        try:
+            with self.metrics.command(connector=self.id, command=command) as record:
+                if command not in {'llrs', 'status'} and self.project and self.get_llr_async():
+                    # the commands use the result of the asynchronous export, if any
+                    with self.metrics.phase('wait'):
+                        self.wait_llrs()
+                with span(command, _logger, logging.INFO):
+                    code = self._dispatch(command, *args)
+                record['code'] = code
+        finally:
+            if self.project is not None and self.get_metrics_enabled():
+                append_record(self.get_metrics_file(), record)
+        return code
+
+    def _cmd_llrs(self) -> int:
+        """
+        Execute the command ``llrs``: generate the surrogate model in the background.
+
+        Returns
+        -------
+        int
+
+            * -1: if an error occurs while generating the surrogate model
+            * 0: if the surrogate model is generated
+        """
+        pid = os.getpid()
+        self.background = True
+        info = {'pid': pid}
+        self.write_llrs_status('running', **info)
+
+        def on_phase(phase: str):
+            info['phase'] = phase
+            self.write_llrs_status('running', **info)
+
+        def heartbeat():
+            while not stop.wait(HEARTBEAT_INTERVAL):
+                self.write_llrs_status('running', **info)
+
+        stop = threading.Event()
+        thread = threading.Thread(target=heartbeat, daemon=True)
+        thread.start()
+        self.metrics.listener = on_phase
+        try:
+            pathname = self.export_llrs()
+            if pathname is not None and self.get_req_index_enabled():
+                from ansys.scade.pyalmgw.reqindex import update_index
+
+                # the pathnames of the linked elements are known once the export is complete
+                with self.metrics.phase('index'):
+                    update_index(self.get_req_index_file(), None, pathname)
+        except Exception as e:
+            error = str(e)
+        else:
+            error = 'no export class' if pathname is None else ''
+        finally:
+            self.metrics.listener = None
+            self.background = False
+            stop.set()
+            thread.join()
+        if error:
+            self.write_llrs_status('failed', pid=pid, error=error)
+            return -1
+        self.write_llrs_status('done', pid=pid)
+        return 0
+
+    def _cmd_status(self) -> int:
+        """
+        Execute the command ``status``: print the status of the asynchronous export.
+
+        Returns
+        -------
+        int
+
+            * -1: if the last export has failed
+            * 0: if there is no pending export
+            * 1: if the export is not completed
+        """
+        status = self.read_llrs_status()
+        print(json.dumps(status))
+        state = status.get('state') if status else 'done'
+        return -1 if state == 'failed' else 0 if state == 'done' else 1
+
+    def _dispatch(self, command: str, *args: str) -> int:
+        """Call the function corresponding to the command."""
+        if command == 'llrs':
+            code = self._cmd_llrs()
+        elif command == 'status':
+            code = self._cmd_status()
+        elif command == 'settings':
             # <Process ID>
             code = self._cmd_settings(int(args[0]))
         elif command == 'manage':
@@ -315,10 +751,44 @@ class Connector(metaclass=ABCMeta):
             # <Links Path> <Process ID>
             code = self._cmd_export(Path(args[0]), int(args[1]))
         else:
-            print('%s: Unknown command' % command)
+            _logger.error('%s: Unknown command', command)
             code = -1
         return code
 
+    def execute_batch(self, lines: Iterable[str]) -> List[Tuple[List[str], int]]:
+        """
+        Execute a sequence of ALM Gateway commands for the same project.
+
+        Each line has the same syntax as the command line, without the project:
+        ``-<command> <arg>*``, for example ``-locate REQ_1 1234``. The arguments
+        containing spaces must be quoted. Empty lines and lines starting with ``#``
+        are ignored.
+
+        Parameters
+        ----------
+        lines : Iterable[str]
+            Command lines.
+
+        Returns
+        -------
+        List[Tuple[List[str], int]]
+            Arguments and return code of each executed command.
+        """
+        results = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            args = _split_command_line(line)
+            command = args[0].lstrip('-')
+            try:
+                code = self.execute(command, *args[1:])
+            except Exception as e:
+                _logger.error('command %s failed with %s', command, e)
+                code = 3
+            results.append((args, code))
+        return results
+
     def main(self) -> int:
         """Package entry point."""
         # the possible command lines are referenced in SC-IRS-040
@@ -328,13 +798,88 @@ class Connector(metaclass=ABCMeta):
         path = sys.argv[2]
         args = sys.argv[3:]
 
-        assert declare_project  # nosec B101  # declare_project must be defined on Windows
-        declare_project(path)
-        self.project = get_projects()[0]
+        # diagnostics on the standard output or to $PYALMGW_LOG_FILE
+        configure(logging.DEBUG if utils.traceon else None)
+
+        if os.environ.get(pyalmgw.PROFILE_VARIABLE):
+            from ansys.scade.pyalmgw.profiling import get_profiler, profile
+
+            # <project>.<id>.<command>.prof, for example
+            stem = Path(path).with_suffix('.%s.%s' % (self.id, command))
+            with profile(get_profiler(), stem):
+                return self._main(command, path, args)
+        return self._main(command, path, args)
+
+    def _main(self, command: str, path: str, args: List[str]) -> int:
+        """Execute the command of the command line."""
+        serve = command == 'serve'
+        batch = command == 'batch'
+        if serve or os.environ.get(pyalmgw.DAEMON_VARIABLE):
+            import ansys.scade.pyalmgw.daemon as daemon
+
+            # no effect when the entry point has already called try_forward
+            code = daemon.try_forward(self.id, sys.argv[1:])
+            if code is not None:
+                return code
+
+        if serve:
+            # -serve <project>: a single server per project and connector
+            lock_file = daemon.get_lock_file(path, self.id)
+            if not daemon.acquire_lock(lock_file):
+                _logger.info('%s: a server is already running', path)
+                return 0
+            try:
+                self._load_project(path)
+                return daemon.serve(self)
+            finally:
+                daemon.release_lock(lock_file)
+        self._load_project(path)
+        if batch:
+            # -batch <project> <commands file or -> [<results file>]
+            return self.main_batch(*args)
 
         try:
             code = self.execute(command, *args)
         except BaseException as e:
-            print('command', command, 'failed with', str(e))
+            _logger.error('command %s failed with %s', command, e)
             code = 3
         return code
+
+    def _load_project(self, path: str):
+        """Load the project of the command line."""
+        assert declare_project  # nosec B101  # declare_project must be defined on Windows
+        with self.metrics.phase('load'):
+            declare_project(path)
+            self.project = get_projects()[0]
+
+    def main_batch(self, commands: str, results: str = '') -> int:
+        """
+        Execute the commands of a file and print their return codes.
+
+        Parameters
+        ----------
+        commands : str
+            Path of the file containing the commands, or ``-`` for the standard input.
+        results : str
+            Optional path of a JSON file to save the arguments and
+            return code of each command.
+
+        Returns
+        -------
+        int
+            0, or 3 when the commands can't be read.
+        """
+        try:
+            if commands == '-':
+                lines = sys.stdin.readlines()
+            else:
+                lines = Path(commands).read_text().splitlines()
+        except OSError as e:
+            _logger.error(str(e))
+            return 3
+        codes = self.execute_batch(lines)
+        for args, code in codes:
+            print('%d: %s' % (code, ' '.join(args)))
+        if results:
+            utils.write_json([{'args': args, 'code': code} for args, code in codes], Path(results))
+        return 0
@@ -0,0 +1,463 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides a server to keep a project loaded between ALM Gateway commands.
+
+ALM Gateway launches the connector in a new process for each command, which
+has to load the SCADE APIs and the project. When the environment variable
+``PYALMGW_DAEMON`` is set, ``Connector.main`` forwards the command to a server
+dedicated to the project and the connector, if any, or executes the command
+and starts the server for the next commands.
+
+The server listens on the local interface only, and requires a token stored
+in a file next to the project. It stops when the project's files are modified,
+so that the commands never apply to an outdated model, or after an idle period.
+A lock file ensures there is at most one server per project and connector.
+"""
+
+from contextlib import redirect_stdout
+import io
+import json
+import os
+from pathlib import Path
+import secrets
+import socket
+import socketserver
+import subprocess  # nosec B404  # used to start the server
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+import ansys.scade.pyalmgw as pyalmgw
+from ansys.scade.pyalmgw.log import get_logger
+from ansys.scade.pyalmgw.utils import write_json
+
+_logger = get_logger(__name__)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ansys.scade.pyalmgw.connector import Connector
+
+# default idle time, in seconds, before the server stops
+IDLE_TIMEOUT = 600
+# timeout, in seconds, for connecting to the server
+CONNECT_TIMEOUT = 2.0
+# age, in seconds, of an unreadable lock file before it is considered stale
+LOCK_TIMEOUT = 10.0
+
+# Windows API constants, for is_alive
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_ERROR_ACCESS_DENIED = 5
+_STILL_ACTIVE = 259
+
+# processes started by spawn, indexed by process ID
+_children: Dict[int, subprocess.Popen] = {}
+# command lines already submitted to try_forward
+_attempts: Set[Tuple[str, ...]] = set()
+# commands executed without a server
+_LOCAL_COMMANDS = {'-serve', '-batch'}
+
+
+def is_enabled() -> bool:
+    """Return whether the commands should be forwarded to a server."""
+    return os.environ.get(pyalmgw.DAEMON_VARIABLE, '') not in {'', '0'}
+
+
+def get_server_file(project: str, id: str) -> Path:
+    """Return the path of the file describing the server for a project and a connector."""
+    return Path(project).with_suffix('.' + id + '.server')
+
+
+def get_lock_file(project: str, id: str) -> Path:
+    """Return the path of the file preventing several servers for a project and a connector."""
+    return Path(project).with_suffix('.' + id + '.server.lock')
+
+
+def acquire_lock(path: Path) -> bool:
+    """
+    Create a lock file, containing the ID of the current process.
+
+    A lock file is stale when its process is terminated: it is replaced.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the lock file.
+
+    Returns
+    -------
+    bool
+        Whether the lock is acquired, else it is held by another running process.
+    """
+    for _ in range(2):
+        try:
+            fd = os.open(str(path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                pid = int(path.read_text())
+                stale = not is_alive(pid)
+            except (OSError, ValueError):
+                # being written, else corrupted, for example when the process has crashed
+                stale = _get_age(path) > LOCK_TIMEOUT
+            if not stale:
+                return False
+            # stale lock
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            continue
+        with os.fdopen(fd, 'w') as f:
+            f.write(str(os.getpid()))
+        return True
+    return False
+
+
+def _get_age(path: Path) -> float:
+    """Return the time, in seconds, since the last modification of a file."""
+    try:
+        return time.time() - path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def release_lock(path: Path):
+    """Remove a lock file if it is owned by the current process."""
+    try:
+        if int(path.read_text()) == os.getpid():
+            path.unlink()
+    except (OSError, ValueError):
+        pass
+
+
+def _send(sock: socket.socket, message: Dict[str, Any]):
+    """Send a message as a line of JSON."""
+    sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+
+def _receive(file: Any) -> Optional[Dict[str, Any]]:
+    """Read a message sent as a line of JSON, or None if the connection is closed."""
+    line = file.readline()
+    return json.loads(line.decode('utf-8')) if line else None
+
+
+# ---------------------------------------------------------------------------
+# client
+# ---------------------------------------------------------------------------
+
+
+def forward(id: str, args: List[str]) -> Optional[int]:
+    """
+    Forward a command to the server of a project, if any.
+
+    Parameters
+    ----------
+    id : str
+        Identifier of the connector.
+    args : List[str]
+        Command line arguments, without the name of the script:
+        ``-<command> <project> <arg>*``.
+
+    Returns
+    -------
+    Optional[int]
+        Return code of the command or None if the command could not be forwarded.
+    """
+    server_file = get_server_file(args[1], id)
+    try:
+        info = json.loads(server_file.read_text())
+        with socket.create_connection(('127.0.0.1', info['port']), CONNECT_TIMEOUT) as sock:
+            sock.settimeout(None)
+            _send(sock, {'token': info['token'], 'args': args})
+            with sock.makefile('rb') as f:
+                answer = _receive(f)
+    except (OSError, ValueError, KeyError):
+        return None
+    if not answer or answer.get('code') is None:
+        # the server has stopped, for example the model is outdated
+        return None
+    print(answer.get('output', ''), end='')
+    return answer['code']
+
+
+def try_forward(id: str, args: Optional[List[str]] = None) -> Optional[int]:
+    """
+    Forward a command to the server of its project when enabled, else start a server.
+
+    This function does not load the connector nor the SCADE APIs: a connector's
+    entry point can call it before importing its own modules, for example::
+
+        def main():
+            code = try_forward('my_connector_id')
+            if code is None:
+                from my_package.connector import MyConnectorClass
+
+                code = MyConnectorClass('my_connector_id').main()
+            return code
+
+    A command line is submitted once: :meth:`Connector.main` calls the function again
+    without effect.
+
+    Parameters
+    ----------
+    id : str
+        Identifier of the connector.
+    args : List[str]
+        Command line arguments, default ``sys.argv[1:]``.
+
+    Returns
+    -------
+    Optional[int]
+        Return code of the command or None if the command must be executed locally.
+    """
+    if args is None:
+        args = sys.argv[1:]
+    if not is_enabled() or len(args) < 2 or args[0] in _LOCAL_COMMANDS:
+        return None
+    key = tuple([id] + args)
+    if key in _attempts:
+        return None
+    _attempts.add(key)
+    code = forward(id, args)
+    if code is None:
+        # no server available: start one for the next commands
+        spawn(sys.argv[0], args[1])
+    return code
+
+
+def spawn(script: str, project: str, command: str = 'serve') -> int:
+    """
+    Start a server, or another command, for a project in a separate process.
+
+    Parameters
+    ----------
+    script : str
+        Path of the connector's script, that calls ``Connector.main``.
+    project : str
+        Path of the project.
+    command : str
+        Command to execute, without arguments.
+
+    Returns
+    -------
+    int
+        Process ID of the command.
+    """
+    kwargs: Dict[str, Any] = {}
+    if sys.platform == 'win32':
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    cmd = [sys.executable, script, '-' + command, project]
+    process = subprocess.Popen(  # nosec B603  # inputs are the current command line
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        **kwargs,
+    )
+    _children[process.pid] = process
+    return process.pid
+
+
+def is_alive(pid: int) -> bool:
+    """
+    Return whether a process is running.
+
+    Parameters
+    ----------
+    pid : int
+        Process ID.
+    """
+    process = _children.get(pid)
+    if process is not None:
+        # child process of the current one: poll it, so that it does not remain a zombie
+        return process.poll() is None
+    if sys.platform == 'win32':
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32  # type: ignore
+        handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            # the process exists when the access is denied
+            return kernel32.GetLastError() == _ERROR_ACCESS_DENIED
+        try:
+            code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+                return True
+            return code.value == _STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # process owned by another user
+        return True
+    return True
+
+
+# ---------------------------------------------------------------------------
+# server
+# ---------------------------------------------------------------------------
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Process one command."""
+
+    server: 'ConnectorServer'
+
+    def handle(self):
+        """Read a command and send its return code and its output."""
+        try:
+            request = _receive(self.rfile)
+        except ValueError:
+            return
+        if not request or not secrets.compare_digest(
+            str(request.get('token', '')), self.server.token
+        ):
+            return
+        code, output = self.server.execute(request.get('args', []))
+        _send(self.connection, {'code': code, 'output': output})
+
+
+class ConnectorServer(socketserver.TCPServer):
+    """
+    Server executing the commands of a connector for a loaded project.
+
+    The commands are executed sequentially, in the server's thread.
+
+    Parameters
+    ----------
+    connector : Connector
+        Connector with a loaded project.
+    server_file : Path
+        File to store the port and the token of the server.
+    files : List[Path]
+        Files of the model: the server stops when one of them is modified.
+    idle_timeout : float
+        Time, in seconds, without any command before the server stops.
+    """
+
+    allow_reuse_address = False
+
+    def __init__(
+        self,
+        connector: 'Connector',
+        server_file: Path,
+        files: List[Path],
+        idle_timeout: float = IDLE_TIMEOUT,
+    ):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.connector = connector
+        self.server_file = server_file
+        self.files = files
+        self.idle_timeout = idle_timeout
+        self.token = secrets.token_hex(16)
+        # fingerprint loads concurrent.futures, not needed for forwarding the commands
+        from ansys.scade.pyalmgw.fingerprint import compute_fingerprint
+
+        self.fingerprint = compute_fingerprint(files, {})
+        self.running = False
+        # the connector keeps its export class, with the parsed schema, between commands
+        connector.cache_export_class = True
+
+    def is_outdated(self) -> bool:
+        """Return whether the model's files have been modified since the project was loaded."""
+        from ansys.scade.pyalmgw.fingerprint import compute_fingerprint, same_fingerprint
+
+        fingerprint = compute_fingerprint(self.files, {}, self.fingerprint)
+        return not same_fingerprint(self.fingerprint, fingerprint)
+
+    def execute(self, args: List[str]) -> Any:
+        """Execute a command and return its code and output, or None if the model is outdated."""
+        if self.is_outdated():
+            self.running = False
+            return None, ''
+        command = args[0][1:]
+        output = io.StringIO()
+        with redirect_stdout(output):
+            try:
+                code = self.connector.execute(command, *args[2:])
+            except BaseException as e:
+                _logger.error('command %s failed with %s', command, e)
+                code = 3
+        return code, output.getvalue()
+
+    def run(self):
+        """Serve the commands until the server is idle or outdated."""
+        port = self.server_address[1]
+        info = {'port': port, 'token': self.token, 'pid': os.getpid()}
+        # the clients never read a partially written file
+        write_json(info, self.server_file)
+        self.running = True
+        self.timeout = 1.0
+        last = time.monotonic()
+        try:
+            while self.running:
+                self._handled = False
+                self.handle_request()
+                if self._handled:
+                    last = time.monotonic()
+                elif time.monotonic() - last > self.idle_timeout:
+                    break
+        finally:
+            self._remove_server_file()
+            self.server_close()
+
+    def _remove_server_file(self):
+        """Remove the server file, unless it has been replaced by another server."""
+        try:
+            info = json.loads(self.server_file.read_text())
+        except (OSError, ValueError):
+            return
+        if info.get('token') == self.token:
+            self.server_file.unlink()
+
+    def finish_request(self, request, client_address):
+        """Record the activity."""
+        self._handled = True
+        super().finish_request(request, client_address)
+
+
+def serve(connector: 'Connector', idle_timeout: float = IDLE_TIMEOUT) -> int:
+    """
+    Serve the commands for the connector's project.
+
+    Parameters
+    ----------
+    connector : Connector
+        Connector with a loaded project.
+    idle_timeout : float
+        Time, in seconds, without any command before the server stops.
+
+    Returns
+    -------
+    int
+        Return code of the server.
+    """
+    assert connector.project is not None  # nosec B101  # addresses linter
+    server_file = get_server_file(connector.project.pathname, connector.id)
+    server = ConnectorServer(connector, server_file, connector.get_model_files(), idle_timeout)
+    server.run()
+    return 0
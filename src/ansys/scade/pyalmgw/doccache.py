@@ -0,0 +1,317 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides a persistent cache of requirements documents, for the ``import`` command.
+
+The cache stores, for each document, the validators returned by the ALM tool,
+such as ``ETag``, ``Last-Modified`` or a revision, and a snapshot of the
+parsed ``ReqDocument``. An unchanged document is restored from its snapshot,
+without being downloaded and parsed again.
+
+The cache is a directory with a ``json`` snapshot per document, and an index.
+The least recently used snapshots are removed when the size of the cache
+exceeds its limit.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+import time
+from typing import Any, Dict, Optional
+
+from ansys.scade.pyalmgw.documents import (
+    Container,
+    HierarchyElement,
+    ReqDocument,
+    ReqProject,
+    Requirement,
+    Section,
+)
+from ansys.scade.pyalmgw.log import get_logger
+from ansys.scade.pyalmgw.utils import atomic_write, read_json, write_json
+
+_logger = get_logger(__name__)
+
+# default maximum size of a cache, in bytes
+MAX_BYTES = 64 * 1024 * 1024
+# name of the index of a cache
+INDEX = 'index.json'
+
+
+class CacheEntry:
+    """
+    Validators and snapshot of a cached document.
+
+    Parameters
+    ----------
+    key : str
+        Identifier of the document, for example its URL.
+    etag : str
+        Value of the ``ETag`` header, if any.
+    last_modified : str
+        Value of the ``Last-Modified`` header, if any.
+    revision : str
+        Revision of the document in the ALM tool, if any.
+    file : str
+        Name of the snapshot file in the cache directory.
+    size : int
+        Size of the snapshot, in bytes.
+    used : float
+        Time of the last access.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        etag: str = '',
+        last_modified: str = '',
+        revision: str = '',
+        file: str = '',
+        size: int = 0,
+        used: float = 0.0,
+    ):
+        self.key = key
+        self.etag = etag
+        self.last_modified = last_modified
+        self.revision = revision
+        self.file = file
+        self.size = size
+        self.used = used
+
+    def get_conditional_headers(self) -> Dict[str, str]:
+        """Return the headers of a conditional request for the document."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the entry as a ``json`` object."""
+        return dict(vars(self))
+
+
+class DocumentCache:
+    """
+    Persistent cache of requirements documents, with a LRU eviction.
+
+    Parameters
+    ----------
+    directory : Path
+        Directory of the cache, created when missing.
+    max_bytes : int
+        Maximum size of the snapshots, in bytes.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries: Dict[str, CacheEntry] = {}
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.modified = False
+        index = directory / INDEX
+        if index.exists():
+            content = read_json(index)
+            # the cache is discarded when the index is not readable
+            for item in content.get('entries', []) if isinstance(content, dict) else []:
+                entry = CacheEntry(**item)
+                if (directory / entry.file).exists():
+                    self.entries[entry.key] = entry
+
+    @property
+    def size(self) -> int:
+        """Return the size of the snapshots, in bytes."""
+        return sum(_.size for _ in self.entries.values())
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry of a document, if any."""
+        return self.entries.get(key)
+
+    def is_current(self, key: str, revision: str) -> bool:
+        """Return whether the cached document has the given revision."""
+        entry = self.entries.get(key)
+        return entry is not None and bool(revision) and entry.revision == revision
+
+    def set_revision(self, key: str, revision: str):
+        """Set the revision of a cached document, once validated by the ALM tool."""
+        entry = self.entries.get(key)
+        if entry and revision and entry.revision != revision:
+            entry.revision = revision
+            self.modified = True
+
+    def load(self, key: str, project: ReqProject) -> Optional[ReqDocument]:
+        """
+        Restore a document from its snapshot and add it to a project.
+
+        Parameters
+        ----------
+        key : str
+            Identifier of the document.
+        project : ReqProject
+            Owner of the document.
+
+        Returns
+        -------
+        Optional[ReqDocument]
+            The document, or None if it is not cached.
+        """
+        entry = self.entries.get(key)
+        snapshot = read_json(self.directory / entry.file) if entry else None
+        if not entry or not isinstance(snapshot, dict):
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry.used = time.time()
+        self.modified = True
+        return restore_document(project, snapshot)
+
+    def store(
+        self,
+        key: str,
+        document: ReqDocument,
+        etag: str = '',
+        last_modified: str = '',
+        revision: str = '',
+    ):
+        """
+        Save the snapshot and the validators of a document.
+
+        Parameters
+        ----------
+        key : str
+            Identifier of the document.
+        document : ReqDocument
+            Document to save.
+        etag : str
+            Value of the ``ETag`` header, if any.
+        last_modified : str
+            Value of the ``Last-Modified`` header, if any.
+        revision : str
+            Revision of the document in the ALM tool, if any.
+        """
+        if not etag and not last_modified and not revision:
+            # the document can't be validated
+            self.remove(key)
+            return
+        file = hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json'
+        content = json.dumps(snapshot_document(document), separators=(',', ':'))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self.directory / file, encoding='utf-8') as f:
+            f.write(content)
+        self.entries[key] = CacheEntry(
+            key, etag, last_modified, revision, file, len(content), time.time()
+        )
+        self.modified = True
+        self.evict()
+
+    def remove(self, key: str):
+        """Remove a document from the cache."""
+        entry = self.entries.pop(key, None)
+        if entry:
+            try:
+                (self.directory / entry.file).unlink()
+            except FileNotFoundError:
+                pass
+            self.modified = True
+
+    def evict(self):
+        """Remove the least recently used snapshots until the size is within the limit."""
+        size = self.size
+        for entry in sorted(self.entries.values(), key=lambda _: _.used):
+            if size <= self.max_bytes:
+                break
+            _logger.debug('evicting %s', entry.key)
+            size -= entry.size
+            self.remove(entry.key)
+
+    def save(self):
+        """Save the index of the cache, if modified."""
+        if self.modified:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entries = [_.to_json() for _ in self.entries.values()]
+            write_json({'entries': entries}, self.directory / INDEX)
+            self.modified = False
+        _logger.debug('document cache: %d hits, %d misses', self.hits, self.misses)
+
+
+def snapshot_document(document: ReqDocument) -> Dict[str, Any]:
+    """
+    Return a snapshot of a document, as a ``json`` object.
+
+    Parameters
+    ----------
+    document : ReqDocument
+        Document to save.
+
+    Returns
+    -------
+    Dict[str, Any]
+    """
+
+    def snapshot(container: Container) -> Dict[str, Any]:
+        item: Dict[str, Any] = {'identifier': container.identifier, 'text': container.text}
+        if isinstance(container, HierarchyElement) and container.description:
+            item['description'] = container.description
+        if container.requirements:
+            item['requirements'] = [snapshot(_) for _ in container.requirements]
+        if container.sections:
+            item['sections'] = [snapshot(_) for _ in container.sections]
+        return item
+
+    return snapshot(document)
+
+
+def restore_document(project: ReqProject, snapshot: Dict[str, Any]) -> ReqDocument:
+    """
+    Create a document from a snapshot and add it to a project.
+
+    Parameters
+    ----------
+    project : ReqProject
+        Owner of the document.
+    snapshot : Dict[str, Any]
+        Snapshot of the document, returned by ``snapshot_document``.
+
+    Returns
+    -------
+    ReqDocument
+    """
+
+    def restore(container: Container, item: Dict[str, Any]):
+        for child in item.get('requirements', []):
+            requirement = Requirement(
+                container, child['identifier'], child['text'], child.get('description', '')
+            )
+            restore(requirement, child)
+        for child in item.get('sections', []):
+            section = Section(
+                container, child['identifier'], child['text'], child.get('description', '')
+            )
+            restore(section, child)
+
+    document = ReqDocument(project, snapshot['identifier'], snapshot['text'])
+    restore(document, snapshot)
+    return document
@@ -32,6 +32,11 @@ from typing import Any, Dict, Generator, List, Optional, Sequence
 
 from lxml import etree
 
+from ansys.scade.pyalmgw.log import get_logger, timed
+from ansys.scade.pyalmgw.utils import atomic_write
+
+_logger = get_logger(__name__)
+
 
 class ReqObject:
     """
@@ -407,6 +412,7 @@ class ReqProject(Element):
                 link = TraceabilityLink(self)
                 link.parse(elem)
 
+    @timed()
     def write(self, path: Optional[Path] = None):
         """
         Serialize the project to a Requirements Document XML file.
@@ -424,12 +430,21 @@ class ReqProject(Element):
 
         # requirements file
         tree = etree.ElementTree(element=root)
-        tree.write(self.path, pretty_print=True, encoding='utf-8')
+        # make sure ALM Gateway never reads a truncated file
+        with atomic_write(Path(self.path), 'wb') as f:
+            tree.write(f, pretty_print=True, encoding='utf-8')
 
+    @timed()
     def read(self):
         """Build the project structure from a Requirements Document XML file."""
         tree = etree.parse(str(self.path), etree.XMLParser())
         self.parse(tree.getroot())
+        _logger.debug(
+            '%s: %d documents, %d traceability links',
+            self.path,
+            len(self.documents),
+            len(self.traceability_links),
+        )
 
     @property
     def depth(self) -> int:
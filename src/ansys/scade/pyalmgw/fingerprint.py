@@ -0,0 +1,240 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides means to detect whether the files of a model have changed.
+
+The fingerprint of a model is a dictionary containing the options of a
+process, for example the export of the surrogate model, and the size, the
+modification time and the hash of each file. The files for which the size
+and the modification time have not changed since the previous fingerprint
+are not hashed again.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+from pathlib import Path
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+import xml.etree.ElementTree as ET  # nosec B405  # parses the user's project files
+
+# size of the blocks read for hashing the files
+BLOCK_SIZE = 1024 * 1024
+
+# macro of a path in a project, for example $(SCADE)
+_re_macro = re.compile(r'\$\((\w+)\)')
+
+
+def expand_macros(text: str) -> Optional[str]:
+    """
+    Expand the macros of a path of a project file, such as ``$(SCADE)``.
+
+    The macros are the environment variables, and ``SCADE`` defaults to
+    the installation directory of SCADE, when available.
+
+    Parameters
+    ----------
+    text : str
+        Path to expand.
+
+    Returns
+    -------
+    Optional[str]
+        Expanded path, or None when a macro is not defined.
+    """
+    undefined = False
+
+    def expand(match: re.Match) -> str:
+        nonlocal undefined
+        name = match.group(1)
+        value = os.environ.get(name)
+        if value is None and name == 'SCADE':
+            try:
+                from ansys.scade.apitools.info import get_scade_home
+
+                value = str(get_scade_home())
+            except Exception:
+                value = None
+        if value is None:
+            undefined = True
+            return ''
+        return value
+
+    expanded = _re_macro.sub(expand, text)
+    return None if undefined else expanded
+
+
+def get_project_files(path: Path, visited: Optional[Set[Path]] = None) -> List[Path]:
+    """
+    Return the files referenced by a SCADE project, including the ones of its libraries.
+
+    The project file is parsed directly, so that the files of the library projects
+    are found without loading them. The referenced projects are followed recursively.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the project file, ``.etp``.
+    visited : Set[Path]
+        Projects already visited, to prevent infinite loops.
+
+    Returns
+    -------
+    List[Path]
+        Referenced files, including the referenced projects but not the input one.
+    """
+    if visited is None:
+        visited = set()
+    visited.add(path.resolve())
+    files = []
+    try:
+        tree = ET.parse(str(path))  # nosec B314  # parses the user's project files
+    except (OSError, ET.ParseError):
+        # the file is then considered through its own fingerprint only
+        return files
+    for elem in tree.iter():
+        # the tags may be qualified by a namespace
+        if elem.tag.rsplit('}', 1)[-1] != 'FileRef':
+            continue
+        persist_as = expand_macros(elem.get('persistAs', ''))
+        if not persist_as:
+            # the file can't be located
+            continue
+        file = path.parent / persist_as
+        files.append(file)
+        if file.suffix.lower() == '.etp' and file.resolve() not in visited:
+            files.extend(get_project_files(file, visited))
+    return files
+
+
+def hash_file(path: Path) -> str:
+    """
+    Return the SHA-256 digest of a file.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the input file.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest of the file, or an empty string if the file can't be read.
+    """
+    sha = hashlib.sha256()
+    try:
+        with path.open('rb') as f:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                sha.update(block)
+    except OSError:
+        return ''
+    return sha.hexdigest()
+
+
+def compute_fingerprint(
+    files: Iterable[Path],
+    options: Dict[str, Any],
+    previous: Optional[Dict[str, Any]] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Compute the fingerprint of a set of files.
+
+    Parameters
+    ----------
+    files : Iterable[Path]
+        Input files.
+    options : Dict[str, Any]
+        Options of the process, must be serializable to JSON.
+    previous : Dict[str, Any]
+        Previous fingerprint, if any, to reuse the hashes of the unchanged files.
+    max_workers : int
+        Maximum number of threads for hashing the files, default ``ThreadPoolExecutor``'s one.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Fingerprint.
+    """
+    old_files = previous.get('files', {}) if previous else {}
+    entries: Dict[str, Dict[str, Any]] = {}
+    modified = []
+    for path in files:
+        key = path.as_posix()
+        try:
+            stat = path.stat()
+        except OSError:
+            entries[key] = {'size': -1, 'mtime': 0, 'sha256': ''}
+            continue
+        entry = {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+        old_entry = old_files.get(key, {})
+        if old_entry.get('size') == entry['size'] and old_entry.get('mtime') == entry['mtime']:
+            entry['sha256'] = old_entry.get('sha256', '')
+        else:
+            modified.append((key, path))
+        entries[key] = entry
+
+    if modified:
+        # hashlib releases the GIL for large blocks
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            digests = executor.map(hash_file, [path for _, path in modified])
+            for (key, _), digest in zip(modified, digests):
+                entries[key]['sha256'] = digest
+
+    return {'options': options, 'files': entries}
+
+
+def same_fingerprint(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> bool:
+    """
+    Return whether two fingerprints correspond to the same files and options.
+
+    The modification times are not considered, only the contents of the files.
+    Missing files are equivalent when they are missing in both fingerprints.
+
+    Parameters
+    ----------
+    previous : Dict[str, Any]
+        Previous fingerprint, if any.
+    current : Dict[str, Any]
+        Current fingerprint.
+
+    Returns
+    -------
+    bool
+    """
+    if not previous or previous.get('options') != current.get('options'):
+        return False
+    old_files = previous.get('files', {})
+    new_files = current.get('files', {})
+    if old_files.keys() != new_files.keys():
+        return False
+    return all(_same_entry(old_files[key], entry) for key, entry in new_files.items())
+
+
+def _same_entry(previous: Dict[str, Any], current: Dict[str, Any]) -> bool:
+    """Return whether two entries of fingerprints correspond to the same file content."""
+    if current.get('size') == -1:
+        # missing file
+        return previous.get('size') == -1
+    # an unreadable file is never considered unchanged
+    return bool(current.get('sha256')) and current.get('sha256') == previous.get('sha256')
@@ -38,11 +38,13 @@ in the SCADE documentation for a complete reference of the json output file.
 from abc import ABCMeta, abstractmethod
 from argparse import ArgumentParser
 from base64 import b64encode
+from fnmatch import fnmatchcase
+import os
 from pathlib import Path
 from re import compile, sub
 import subprocess  # nosec  # used to call SCADE Display command line tools
 import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 # shall modify sys.path to access SCACE APIs
 from ansys.scade.apitools import declare_project
@@ -58,7 +60,18 @@ import scade.model.suite as suite
 import scade.model.suite.annotation as ann
 import scade.model.testenv as test
 
-from ansys.scade.pyalmgw.utils import read_json, traceln, write_json
+from ansys.scade.pyalmgw.log import LOG_VARIABLE, TRACE, configure, get_logger, timed
+from ansys.scade.pyalmgw.profiling import PROFILERS, get_profiler, profile
+from ansys.scade.pyalmgw.serializers import (
+    Serializer,
+    get_serializer,
+    register_serializer,
+    serializers,
+)
+import ansys.scade.pyalmgw.surrogate as surrogate
+from ansys.scade.pyalmgw.utils import read_json, write_json
+
+_logger = get_logger(__name__)
 
 # make script's implementation directory visible
 script_dir = Path(__file__).parent
@@ -75,6 +88,11 @@ if __name__ != '__main__':  # pragma: no cover
 # https://stackoverflow.com/questions/32763500/nameerror-using-eval-inside-dictionary-comprehension
 child = None
 
+# syntax of a role expression: <role> [ '{' <class> [ ',' <class> ]* '}' ]
+_re_role = compile(r'^(\w+)(?:{(.*)})?$')
+# wildcards of glob patterns
+_re_glob = compile(r'[*?[]')
+
 
 def read_project_id(project: std.Project) -> Optional[str]:
     """Return the ALM Gateway ID of a project."""
@@ -82,7 +100,7 @@ def read_project_id(project: std.Project) -> Optional[str]:
     try:
         f = open(pathname, 'r')
     except BaseException as e:
-        print(str(e))
+        _logger.error(str(e))
         return None
 
     re = compile(r'.*\s+id="([^"]*)"')
@@ -94,6 +112,55 @@ def read_project_id(project: std.Project) -> Optional[str]:
     return None
 
 
+class Scope:
+    """
+    Subset of the model elements to export.
+
+    An element is in the scope when it matches one of the criteria, and so are
+    all the elements it contains. The traversal of the model skips the elements
+    that can't contain elements in the scope, when this can be deduced from
+    their path: the pathnames of the SCADE Suite model elements, for example,
+    start with the pathname of their owner. The criteria by oids do not allow
+    such pruning.
+
+    Parameters
+    ----------
+    oids : Iterable[str]
+        Oids of the elements.
+    paths : Iterable[str]
+        Glob patterns, for example ``P::Op/*``, for the pathnames of the elements.
+    names : Iterable[str]
+        Names of the elements reached directly from the root of the model,
+        for example the top-level operators.
+    """
+
+    def __init__(
+        self, oids: Iterable[str] = (), paths: Iterable[str] = (), names: Iterable[str] = ()
+    ):
+        self.oids = set(oids)
+        self.paths = list(paths)
+        self.names = set(names)
+        # literal prefixes of the patterns
+        self.prefixes = [_re_glob.split(path, 1)[0] for path in self.paths]
+
+    def match(self, oid: str, pathname: str, name: str, top_level: bool) -> bool:
+        """Return whether an element is in the scope."""
+        return (
+            oid in self.oids
+            or (top_level and name in self.names)
+            or any(fnmatchcase(pathname, path) for path in self.paths)
+        )
+
+    def may_contain(self, pathname: str) -> bool:
+        """Return whether an element which is not in the scope may contain elements in the scope."""
+        if self.oids or not pathname:
+            # no hierarchical information
+            return True
+        return any(
+            prefix.startswith(pathname) or pathname.startswith(prefix) for prefix in self.prefixes
+        )
+
+
 class LLRExport:
     """Entry point for exporting the surrogate model."""
 
@@ -101,6 +168,13 @@ class LLRExport:
         self.schema = None
         self.project = project
         self.project_id = read_project_id(project)
+        # constant part of the URLs, computed once
+        self.url_prefix = 'http://localhost:8080/scade_provider/services/{0}/requirements/'.format(
+            self.project_id
+        )
+        # paths of the icons, indexed by (product, kind), for the current export
+        self.icons: Dict[Tuple[str, str], Optional[str]] = {}
+        self.almicondir: Optional[Path] = None
         self.export_classes = self.get_export_classes(project)
         self.roots = [export_class.root for export_class in self.export_classes]
         if self.export_classes:
@@ -115,22 +189,178 @@ class LLRExport:
         self.diagrams = False
         # index table on the schema
         self.classes = {}
+        # edges (class, role) of the schema that can't produce any element
+        self.pruned_edges: Set[Tuple[str, str]] = set()
+        # path and modification time of the last parsed schema
+        self.schema_stamp: Optional[Tuple[str, int]] = None
         self.version = LLRS.VCUSTOM
-
+        # elements already dumped, indexed by their identity, and elements being dumped
+        self.visited: Dict[int, Any] = {}
+        self.visiting: Set[int] = set()
+        # number of references to the elements already dumped, indexed by their oid
+        self.references: Dict[str, int] = {}
+        # statistics of the last export
+        self.stats: Dict[str, int] = {}
+        # whether the dumped elements are traced, cf. dump_model
+        self.trace = False
+        # partial export: scope and state of the traversal
+        self.scope: Optional[Scope] = None
+        self.in_scope = False
+        self.depth = 0
+
+    @timed()
     def read_schema(self, path: Path):
-        """Parse the input configuration schema."""
+        """
+        Parse the input configuration schema.
+
+        The schema is not parsed again when the file is not modified since the last call,
+        for instances reused for several exports.
+        """
+        try:
+            stamp = (str(Path(path).resolve()), Path(path).stat().st_mtime_ns)
+        except OSError:
+            stamp = None
+        if stamp is not None and stamp == self.schema_stamp:
+            return
+        self.schema_stamp = stamp
+        self.classes = {}
         self.schema = read_json(path)
         if self.schema is not None:
             for element in self.schema:
                 self.classes[element.get('class')] = element
+        self.pruned_edges = self.analyze_schema()
+        for cls, role in sorted(self.pruned_edges):
+            _logger.debug('pruned edge: %s.%s', cls, role)
+
+    def analyze_schema(self) -> Set[Tuple[str, str]]:
+        """
+        Return the edges of the schema that can't produce any element.
+
+        An edge ``(class, role)`` is productive when one of the classes it
+        can reach is an LLR or has productive edges, including the ones
+        inherited from its parent classes. The classes not mentioned in the
+        schema are LLRs: only the roles restricted to a list of classes,
+        with the syntax ``role{<class>, ...}`` or the deprecated ``class``
+        attribute, can be pruned.
+
+        Returns
+        -------
+        Set[Tuple[str, str]]
+            Non-productive edges, identified by the name of the class declaring
+            the structure and the role expression.
+        """
+        # edges declared by each class, with their target classes or None if unknown
+        edges: Dict[str, Dict[str, Optional[Set[str]]]] = {}
+        for name, schema in self.classes.items():
+            class_edges = edges.setdefault(name, {})
+            for entry in schema.get('structure', []):
+                for composition in entry.get('content', []):
+                    role = composition.get('role')
+                    if role is None:
+                        continue
+                    targets = self._get_role_targets(role, composition.get('class'))
+                    if role in class_edges:
+                        # same role in several entries: merge the targets
+                        previous = class_edges[role]
+                        targets = (
+                            None if previous is None or targets is None else previous | targets
+                        )
+                    class_edges[role] = targets
+
+        productive = {name for name, schema in self.classes.items() if schema.get('isllr', False)}
+        live: Set[Tuple[str, str]] = set()
+        # least fixed point: the schema may contain cycles
+        changed = True
+        while changed:
+            changed = False
+            for name, class_edges in edges.items():
+                for role, targets in class_edges.items():
+                    if (name, role) in live:
+                        continue
+                    if targets is None or any(
+                        _ not in self.classes or _ in productive for _ in targets
+                    ):
+                        live.add((name, role))
+                        changed = True
+            for name in self.classes:
+                if name in productive:
+                    continue
+                if any(
+                    (cls, role) in live
+                    for cls in self._get_ancestors(name)
+                    for role in edges.get(cls, {})
+                ):
+                    productive.add(name)
+                    changed = True
+
+        return {(name, role) for name, class_edges in edges.items() for role in class_edges} - live
+
+    def _get_ancestors(self, cls: str) -> List[str]:
+        """Return a class and its parent classes, robust to erroneous cycles."""
+        ancestors = []
+        while cls and cls not in ancestors:
+            ancestors.append(cls)
+            cls = self.classes.get(cls, {}).get('parent')
+        return ancestors
+
+    def _get_role_targets(self, role: str, class_: Optional[str]) -> Optional[Set[str]]:
+        """Return the classes reachable through a role expression, or None if unknown."""
+        m = _re_role.match(role.split('.')[-1])
+        if not m:
+            # let the visit raise the error
+            return None
+        _, classes = m.groups()
+        names = {name.strip() for name in classes.split(',')} if classes else None
+        if class_ is not None:
+            names = names & {class_} if names is not None else {class_}
+        return names
 
     def get_url(self, oid: str) -> str:
         """Return the URL corresponding to an oid."""
-        return 'http://localhost:8080/scade_provider/services/{0}/requirements/{1}'.format(
-            self.project_id, b64encode(oid.encode()).decode()
-        )
+        return self.url_prefix + b64encode(oid.encode()).decode()
+
+    def get_icon(self, product: str, kind: str) -> Optional[str]:
+        """
+        Return the path of the icon for a kind of element, or None if not found.
+
+        The icons are searched in the package's resources, then in the ALM Gateway
+        installation directory. The result is cached for the duration of the export.
 
-    def dump_model(self, diagrams: bool = False, version: int = 0, empty: str = '') -> dict:
+        Parameters
+        ----------
+        product : str
+            Kind of the export class, for example ``suite`` or ``display``.
+        kind : str
+            Kind of the model element.
+
+        Returns
+        -------
+        Optional[str]
+            Path of the icon or None.
+        """
+        key = (product, kind)
+        if key in self.icons:
+            return self.icons[key]
+        iconfile = script_dir / 'res' / product / (kind + '.png')
+        if not iconfile.exists():
+            # icon not available locally, try in the product
+            if self.almicondir is None:
+                self.almicondir = (
+                    get_scade_home() / 'SCADE LifeCycle' / 'ALM Gateway' / 'reqtifygw' / 'icons'
+                )
+            iconfile = self.almicondir / product / (kind + '.png')
+        icon = iconfile.as_posix() if iconfile.exists() else None
+        self.icons[key] = icon
+        return icon
+
+    @timed()
+    def dump_model(
+        self,
+        diagrams: bool = False,
+        version: int = 0,
+        empty: str = '',
+        scope: Optional[Scope] = None,
+    ) -> dict:
         """
         Generate the surrogate model as a dictionary.
 
@@ -146,6 +376,10 @@ class LLRExport:
         empty : str
             Value to use when the value of an attribute is empty. This is required for
             some target ALM tools such as DOORS for SCADE releases up to 2025 R1.
+        scope : Scope
+            Subset of the model elements to export, or None for the complete model.
+            The sections and the LLRs containing elements in the scope are kept,
+            the latter without attributes, so that the hierarchy remains valid.
 
         Returns
         -------
@@ -160,6 +394,24 @@ class LLRExport:
         self.empty = empty
         for export_class in self.export_classes:
             export_class.version = version
+            export_class.prepare_export()
+        self.icons = {}
+        self.visited = {}
+        self.visiting = set()
+        self.references = {}
+        self.scope = scope
+        self.in_scope = False
+        self.depth = 0
+        self.stats = {
+            'items': 0,
+            'duplicates': 0,
+            'skipped': 0,
+            'references': 0,
+            'cycles': 0,
+            'out_of_scope': 0,
+        }
+        # tracing the elements is costly: test the level once
+        self.trace = _logger.isEnabledFor(TRACE)
 
         elements = []
         section_oid = main.get_model_oid(main.root) + ':_'
@@ -178,12 +430,85 @@ class LLRExport:
             'path': Path(self.project.pathname).as_posix(),
             'elements': [section],
         }
+        _logger.debug(
+            'export stats: {items} items, {duplicates} duplicates '
+            '({skipped} skipped, {references} references), {cycles} cycles'.format(**self.stats)
+        )
 
         return model
 
-    def write(self, llrs: dict, path: Path):
-        """Write the dictionary to a file."""
-        write_json(llrs, path)
+    @timed()
+    def write(self, llrs: dict, path: Path, format: str = 'json') -> bool:
+        """
+        Write the dictionary to a file.
+
+        Parameters
+        ----------
+        llrs : dict
+            Surrogate model.
+        path : Path
+            Path of the output file.
+        format : str
+            Name of a registered serializer, default ``json``, the format expected by
+            ALM Gateway. Refer to :mod:`ansys.scade.pyalmgw.serializers`.
+
+        Returns
+        -------
+        bool
+            Whether the file is written.
+        """
+        if format == 'json':
+            return write_json(llrs, path)
+        return get_serializer(format).write(llrs, path)
+
+    @staticmethod
+    def read(path: Path, format: str = 'json') -> Optional[dict]:
+        """
+        Read a surrogate model from a file.
+
+        Parameters
+        ----------
+        path : Path
+            Path of the input file.
+        format : str
+            Name of the serializer used to write the file.
+
+        Returns
+        -------
+        Optional[dict]
+            Surrogate model or None if an error occurs.
+        """
+        return get_serializer(format).read(path)
+
+    @staticmethod
+    def register_serializer(name: str, serializer: Serializer):
+        """Register a new format for ``write`` and ``read``."""
+        register_serializer(name, serializer)
+
+    def write_shards(self, llrs: dict, path: Path, update: bool = False) -> List[Path]:
+        """
+        Write the dictionary to a manifest file and one file per top-level element.
+
+        Only the modified shards are written. Use ``update`` after a partial export,
+        for example restricted to a few operators, to merge the exported elements
+        into the corresponding shards.
+
+        Parameters
+        ----------
+        llrs : dict
+            Surrogate model.
+        path : Path
+            Path of the manifest file.
+        update : bool
+            Whether ``llrs`` is a partial export, merged into the previous one,
+            cf. :func:`ansys.scade.pyalmgw.surrogate.write_shards`.
+
+        Returns
+        -------
+        List[Path]
+            Written shards.
+        """
+        return surrogate.write_shards(llrs, path, update=update)
 
     def get_export_classes(self, project: std.Project) -> List['LLRS']:
         """Return the export classes applicable to a project."""
@@ -215,7 +540,11 @@ class LLRS(metaclass=ABCMeta):
         self.root = root
         self.version = LLRS.VCUSTOM
         # regular expression for paths
-        self.re_path = compile(r'^(\w+)(?:{(.*)})?$')
+        self.re_path = _re_role
+        # sorted links indexed by (id(item), role), with the item to prevent id reuse
+        self.sorted_links: Dict[Tuple[int, str], Tuple[Any, List[Any]]] = {}
+        # sort keys indexed by id(item)
+        self.sort_keys: Dict[int, str] = {}
 
     def get_url(self, oid):
         """
@@ -313,6 +642,49 @@ class LLRS(metaclass=ABCMeta):
         """Generate the image of a model element and return its path when applicable or None."""
         return None
 
+    def prepare_export(self):
+        """Initialize the caches for a new export."""
+        self.sorted_links = {}
+        self.sort_keys = {}
+
+    def sort_links(self, item: Any, role: str, items: List[Any]) -> List[Any]:
+        """
+        Return the links of a model element sorted by name.
+
+        The sort keys and the sorted lists are cached for the duration of the export.
+
+        Parameters
+        ----------
+        item : Any
+            Input model element.
+        role : str
+            Name of the association end.
+        items : List[Any]
+            Elements linked to the model element for the role.
+
+        Returns
+        -------
+        List[Any]
+            Copy of the list, sorted alphabetically, regardless of the case.
+        """
+        key = (id(item), role)
+        cached = self.sorted_links.get(key)
+        if cached is not None and cached[0] is item:
+            return cached[1].copy()
+        decorated = []
+        for index, elem in enumerate(items):
+            sort_key = self.sort_keys.get(id(elem))
+            if sort_key is None:
+                sort_key = self.get_item_name(elem).lower()
+                self.sort_keys[id(elem)] = sort_key
+            # the index makes the sort stable without comparing the elements
+            decorated.append((sort_key, index, elem))
+        decorated.sort()
+        links = [elem for _, _, elem in decorated]
+        # the cached list keeps the elements alive: their ids can't be reused
+        self.sorted_links[key] = (item, links)
+        return links.copy()
+
     # -----------------------------------------------------------------------------
     # schema based visit
     # -----------------------------------------------------------------------------
@@ -392,7 +764,7 @@ class LLRS(metaclass=ABCMeta):
 
             for composition in content:
                 role = composition.get('role')
-                if role is None:
+                if role is None or (cls, role) in self.llr_export.pruned_edges:
                     continue
                 kind = composition.get('kind')
                 class_ = composition.get('class')
@@ -541,6 +913,71 @@ class LLRS(metaclass=ABCMeta):
         cls = self.get_item_class(item)
         schema = self.llr_export.classes.get(cls) if cls is not None else None
 
+        stats = self.llr_export.stats
+        stats['items'] += 1
+        if self.llr_export.trace:
+            _logger.log(TRACE, 'dump %s %s', cls, self.get_item_name(item))
+
+        # partial export
+        scope = self.llr_export.scope
+        in_scope = self.llr_export.in_scope
+        depth = self.llr_export.depth + 1
+        if scope is not None and not in_scope:
+            pathname = self.get_item_pathname(item)
+            oid = self.get_item_oid(item)
+            if scope.match(oid, pathname, self.get_item_name(item), depth == 1):
+                in_scope = True
+            elif not scope.may_contain(pathname):
+                stats['out_of_scope'] += 1
+                return
+        outside = scope is not None and not in_scope
+
+        # duplicates: the same element can be reached through several paths
+        key = id(item)
+        if key in self.llr_export.visiting:
+            # cycle: the element is already being dumped
+            stats['cycles'] += 1
+            return
+        reference = False
+        if key in self.llr_export.visited:
+            stats['duplicates'] += 1
+            policy = schema.get('duplicates', 'allow') if schema is not None else 'allow'
+            if policy == 'skip':
+                stats['skipped'] += 1
+                return
+            reference = policy == 'reference'
+        else:
+            # keep a reference to the element so that its id can't be reused
+            self.llr_export.visited[key] = item
+
+        self.llr_export.visiting.add(key)
+        saved_in_scope = self.llr_export.in_scope
+        self.llr_export.in_scope = in_scope
+        self.llr_export.depth = depth
+        try:
+            self._dump_item(container, item, cls, schema, kind, parent_oid, reference, outside)
+        finally:
+            self.llr_export.visiting.discard(key)
+            self.llr_export.in_scope = saved_in_scope
+            self.llr_export.depth = depth - 1
+
+    def _dump_item(
+        self,
+        container: List[Any],
+        item: Any,
+        cls: str,
+        schema: Optional[dict],
+        kind: str,
+        parent_oid: str,
+        reference: bool,
+        outside: bool,
+    ):
+        """
+        Add an entry for a model element, or a reference to an element already dumped.
+
+        When the element is outside the scope of a partial export, the entry is
+        kept only if it is required for the hierarchy of the elements in the scope.
+        """
         if schema is None:
             isllr = True
             folder = None
@@ -558,6 +995,27 @@ class LLRS(metaclass=ABCMeta):
         if kind is None:
             kind = self.get_item_class(item)
 
+        if reference:
+            # the content of the element is not traversed again
+            self.llr_export.stats['references'] += 1
+            if isllr:
+                # the oids must be unique: the reference has its own one,
+                # stable as long as the order of the traversal is
+                oid = self.get_item_oid(item)
+                count = self.llr_export.references.get(oid, 0) + 1
+                self.llr_export.references[oid] = count
+                container.append(
+                    {
+                        'oid': '{0}#ref{1}'.format(oid, count),
+                        'ref': oid,
+                        'pathname': self.get_item_pathname(item),
+                        'name': self.get_item_name(item),
+                        'scadetype': kind,
+                        'almtype': 'req',
+                    }
+                )
+            return
+
         if not isllr and folder is None:
             # when the item is neither a requirement or a section, traverse only
             # the composition without any additional node in the hierarchy
@@ -589,26 +1047,23 @@ class LLRS(metaclass=ABCMeta):
                 'scadetype': kind,
                 'almtype': 'req',
             }
-            if self.version == LLRS.VCUSTOM:
+            if outside:
+                # placeholder: no enrichment, no attributes
+                properties = []
+            elif self.version == LLRS.VCUSTOM:
                 # for custom connectors
                 element['url'] = self.get_url(oid)
-                iconfile = script_dir / 'res' / self.kind / (kind + '.png')
-                if not iconfile.exists():
-                    # icon not available locally, try in the product
-                    almicondir = (
-                        get_scade_home() / 'SCADE LifeCycle' / 'ALM Gateway' / 'reqtifygw' / 'icons'
-                    )
-                    iconfile = almicondir / self.kind / (kind + '.png')
-                if iconfile.exists():
-                    element['icon'] = iconfile.as_posix()
+                icon = self.llr_export.get_icon(self.kind, kind)
+                if icon is not None:
+                    element['icon'] = icon
 
-            if self.llr_export.diagrams:
+            if self.llr_export.diagrams and not outside:
                 path = self.get_item_image(item)
                 if path is not None:
                     element['image'] = path
 
             # attributes
-            attributes = self.get_item_attributes(item)
+            attributes = [] if outside else self.get_item_attributes(item)
             for property in properties:
                 name = property.get('name')
                 if not name:
@@ -631,6 +1086,7 @@ class LLRS(metaclass=ABCMeta):
 
             if len(attributes) != 0:
                 element['attributes'] = attributes
+            index = len(subelements)
             subelements.append(element)
             if section is not None:
                 # add content as sibling of item's llr
@@ -646,12 +1102,17 @@ class LLRS(metaclass=ABCMeta):
         self.dump_siblings(subelements, item, cls, parent_oid)
 
         if section is not None:
+            if isllr and outside:
+                # the section is enough to keep the hierarchy
+                del subelements[index]
             if len(subelements) != 0:
                 container.append(section)
         else:
             # assert isllr
             if len(children) != 0:
                 element['elements'] = children
+            elif outside:
+                del subelements[index]
 
 
 # -----------------------------------------------------------------------------
@@ -678,8 +1139,7 @@ class StdLLRS(LLRS):
             items = [items]
         if sort:
             # new 2019 R1
-            items = items.copy()
-            items.sort(key=lambda elem: self.get_item_name(elem).lower())
+            items = self.sort_links(item, role, items)
         return items
 
     def get_item_attribute(self, item: Any, name: str) -> Any:
@@ -699,6 +1159,8 @@ class AnnotatedLLRS(StdLLRS):
         self.note_types = note_types
         self.llr_fields = {}
         self.gather_llr_fields()
+        # LLR attributes indexed by element's oid, None when not available
+        self.annotations: Optional[Dict[str, List[Dict[str, str]]]] = None
 
     # helper for suite/system
     def gather_llr_fields(self):
@@ -717,25 +1179,83 @@ class AnnotatedLLRS(StdLLRS):
                 # register the note type and its attributes
                 self.llr_fields[type] = attributes
 
+    def prepare_export(self):
+        """Initialize the caches and build the index of the LLR attributes."""
+        super().prepare_export()
+        self.annotations = self.index_annotations()
+
+    def index_annotations(self) -> Optional[Dict[str, List[Dict[str, str]]]]:
+        """
+        Gather the values of the annotation attributes tagged as ``LLR_PROP``.
+
+        The notes are accessed from their types, so that the values are read
+        once for all, before the traversal of the model. The attributes of the
+        elements having several notes are read from the elements, to keep
+        the order of their notes.
+
+        Returns
+        -------
+        Optional[Dict[str, List[Dict[str, str]]]]
+            LLR attributes indexed by the oid of the annotated elements, or None
+            when the notes can't be accessed from their types.
+        """
+        index: Dict[str, List[Dict[str, str]]] = {}
+        # elements with several notes
+        owners: Dict[str, Any] = {}
+        try:
+            for type, pairs in self.llr_fields.items():
+                notes = _scade_api.get(type, 'annNote')
+                if notes is None:
+                    return None
+                for note in notes:
+                    owner = note.owner
+                    oid = self.get_item_oid(owner)
+                    if not oid:
+                        return None
+                    if oid in index:
+                        owners[oid] = owner
+                    else:
+                        index[oid] = self.get_note_attributes(note, pairs)
+            for oid, owner in owners.items():
+                index[oid] = self.get_notes_attributes(owner)
+        except Exception:
+            # the API does not support this access: keep the per-element access
+            return None
+        return index
+
     def get_item_attributes(self, item: Any) -> list:
         """Implement ``get_item_attributes``."""
+        if self.annotations is not None:
+            oid = self.get_item_oid(item)
+            if oid:
+                # the caller may add new attributes to the list
+                return [attribute.copy() for attribute in self.annotations.get(oid, [])]
+        return self.get_notes_attributes(item)
+
+    def get_notes_attributes(self, item: Any) -> List[Dict[str, str]]:
+        """Return the LLR attributes of the notes of a model element, in the order of the notes."""
         attributes = []
         try:
             notes = item.ann_notes
         except BaseException:
             notes = []
         for note in notes:
-            type = note.ann_note_type
-            pairs = self.llr_fields.get(type)
-            if pairs is None:
-                continue
-            for kind, attribute in pairs:
-                value = self.get_note_value(note, attribute)
-                if not value:
-                    # some ALM tools raise exceptions with empty values
-                    value = self.llr_export.empty
-                attributes.append({'name': kind, 'value': value})
+            pairs = self.llr_fields.get(note.ann_note_type)
+            if pairs is not None:
+                attributes.extend(self.get_note_attributes(note, pairs))
+        return attributes
 
+    def get_note_attributes(
+        self, note: ann.AnnNote, pairs: List[List[str]]
+    ) -> List[Dict[str, str]]:
+        """Return the LLR attributes of a note, given the pairs (kind, attribute) of its type."""
+        attributes = []
+        for kind, attribute in pairs:
+            value = self.get_note_value(note, attribute)
+            if not value:
+                # some ALM tools raise exceptions with empty values
+                value = self.llr_export.empty
+            attributes.append({'name': kind, 'value': value})
         return attributes
 
     @abstractmethod
@@ -1066,7 +1586,7 @@ class DisplayLLRS(LLRS):
         if not isinstance(items, list):
             items = [items]
         if sort:
-            items = sorted(items, key=lambda elem: self.get_item_name(elem).lower())
+            items = self.sort_links(item, role, items)
         return items
 
     def get_item_oid(self, item: Any) -> str:
@@ -1122,14 +1642,14 @@ class DisplayLLRS(LLRS):
             str(self.img_dir),
         ]
         try:
-            traceln(' '.join(cmd))
+            _logger.debug(' '.join(cmd))
             out = subprocess.check_output(cmd, stderr=subprocess.STDOUT)  # nosec  # inputs checked
             out = out.decode('utf-8')
-            traceln(out)
+            _logger.debug(out)
         except subprocess.CalledProcessError as e:
             out = e.output.decode('utf-8')
             code = e.returncode
-            traceln('exec error {0}: {1}'.format(code, out))
+            _logger.error('exec error %d: %s', code, out)
 
 
 # -----------------------------------------------------------------------------
@@ -1182,6 +1702,9 @@ def main(file, *cmd_line, version=LLRS.V194) -> int:
     project = std.get_roots()[0]
     project_path = Path(project.pathname)
 
+    # diagnostics on the standard output or to $PYALMGW_LOG_FILE
+    configure()
+
     parser = ArgumentParser()
     parser.add_argument(
         '-s', '--schema', metavar='<schema>', help='json export schema', required=True
@@ -1192,29 +1715,61 @@ def main(file, *cmd_line, version=LLRS.V194) -> int:
     )
     # for now, applies only to V194
     parser.add_argument('-v', '--version', choices=['V194'], help='version', required=False)
+    parser.add_argument(
+        '-f', '--format', metavar='<format>', help='format of the output file', default='json'
+    )
+    # partial export
+    parser.add_argument(
+        '-o', '--oid', metavar='<oid>', action='append', default=[], help='oid of an element'
+    )
+    parser.add_argument(
+        '-p', '--path', metavar='<glob>', action='append', default=[], help='pathname pattern'
+    )
+    parser.add_argument(
+        '-t', '--top', metavar='<name>', action='append', default=[], help='top-level element'
+    )
+    # diagnostics
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='cprofile',
+        choices=PROFILERS,
+        help='profile the export, default $PYALMGW_PROFILE',
+    )
 
     try:
         args = parser.parse_args(cmd_line)
     except BaseException as e:
-        print(e)
+        _logger.error(str(e))
         return 1
     if args.version == 'V194':
         version = LLRS.V194
+    if args.format not in serializers:
+        _logger.error('%s: Unknown format', args.format)
+        return 1
     # make the path relative to the project , when not absolute
     schema = project_path.parent.joinpath(args.schema)
+    if args.oid or args.path or args.top:
+        scope = Scope(oids=args.oid, paths=args.path, names=args.top)
+    else:
+        scope = None
 
-    cls = get_export_class(project)
-    if cls:
-        cls.read_schema(schema)
-        try:
-            d = cls.dump_model(diagrams=args.images, version=version, empty=args.empty)
-            cls.write(d, Path(file))
-        except PathError as e:
-            print(str(e))
+    # <project>.llrs.prof, for example
+    with profile(get_profiler(args.profile), project_path.with_suffix('.llrs')):
+        cls = get_export_class(project)
+        if cls:
+            cls.read_schema(schema)
+            try:
+                d = cls.dump_model(
+                    diagrams=args.images, version=version, empty=args.empty, scope=scope
+                )
+                cls.write(d, Path(file), format=args.format)
+            except PathError as e:
+                _logger.error(str(e))
+                return 1
+        else:
+            _logger.error('%s: This kind of project is not supported', project.pathname)
             return 1
-    else:
-        print('%s: This kind of project is not supported' % project.pathname)
-        return 1
 
     return 0
 
@@ -1230,7 +1785,9 @@ if __name__ == '__main__':  # pragma: no cover
     # scade.model.architect is a CPython module defined dynamically
     import scade.model.architect as system  # type: ignore
 
+    # the messages of the debug session, including the result, are displayed by default
+    os.environ.setdefault(LOG_VARIABLE, 'INFO')
     code = main(sys.argv[2], '-s', *sys.argv[3:])
     if code == 0:
-        print('export successful')
+        _logger.info('export successful')
     sys.exit(code)
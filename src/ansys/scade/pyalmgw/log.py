@@ -0,0 +1,252 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides the logging of the package, with leveled messages and timing spans.
+
+The modules log their diagnostics with the standard ``logging`` package,
+to children of the ``ansys.scade.pyalmgw`` logger. The entry points call
+``configure`` to print the messages, or to save them as JSON lines to a file,
+according to the environment variables ``PYALMGW_LOG``, the level, for example
+``DEBUG``, and ``PYALMGW_LOG_FILE``.
+
+A span measures the duration of a block of code, or a function, and logs it
+when it completes. When the level of the span is disabled, its cost is
+limited to a test of the logger's level.
+"""
+
+import functools
+import json
+import logging
+import os
+import sys
+import time
+from typing import IO, Any, Callable, Optional, TypeVar, Union
+
+# level for the high-volume traces, for example one message per model element
+TRACE = 5
+logging.addLevelName(TRACE, 'TRACE')
+
+# environment variables for the default configuration
+LOG_VARIABLE = 'PYALMGW_LOG'
+LOG_FILE_VARIABLE = 'PYALMGW_LOG_FILE'
+
+# logger of the package
+root = logging.getLogger('ansys.scade.pyalmgw')
+# handler added by configure
+_handler: Optional[logging.Handler] = None
+
+_F = TypeVar('_F', bound=Callable[..., Any])
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return the logger of a module of the package, for example ``get_logger(__name__)``."""
+    return logging.getLogger(name)
+
+
+class _NullSpan:
+    """Span used when the level is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """
+    Context manager logging the duration of a block of code.
+
+    Parameters
+    ----------
+    name : str
+        Name of the span.
+    logger : logging.Logger
+        Logger of the span.
+    level : int
+        Level of the message.
+    """
+
+    __slots__ = ('name', 'logger', 'level', 'start', 'duration')
+
+    def __init__(self, name: str, logger: logging.Logger, level: int):
+        self.name = name
+        self.logger = logger
+        self.level = level
+        self.start = 0.0
+        self.duration = 0.0
+
+    def __enter__(self) -> 'Span':
+        """Start the measure."""
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Log the duration."""
+        self.duration = time.perf_counter() - self.start
+        status = ' (failed)' if exc_type is not None else ''
+        self.logger.log(
+            self.level,
+            '%s: %.3f ms%s',
+            self.name,
+            self.duration * 1000,
+            status,
+            extra={'span': self.name, 'duration': self.duration},
+        )
+        return None
+
+
+def span(
+    name: str, logger: logging.Logger = root, level: int = logging.DEBUG
+) -> Union[Span, _NullSpan]:
+    """
+    Return a context manager logging the duration of a block of code.
+
+    Parameters
+    ----------
+    name : str
+        Name of the span.
+    logger : logging.Logger
+        Logger of the span, default the package's logger.
+    level : int
+        Level of the message, default ``DEBUG``.
+    """
+    if not logger.isEnabledFor(level):
+        return _NULL_SPAN
+    return Span(name, logger, level)
+
+
+def timed(
+    name: Optional[str] = None, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG
+) -> Callable[[_F], _F]:
+    """
+    Decorate a function to log the duration of its calls.
+
+    Parameters
+    ----------
+    name : str
+        Name of the span, default the qualified name of the function.
+    logger : logging.Logger
+        Logger of the span, default the logger of the function's module.
+    level : int
+        Level of the message, default ``DEBUG``.
+    """
+
+    def decorate(function: _F) -> _F:
+        label = name or function.__qualname__
+        log = logger or logging.getLogger(function.__module__)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not log.isEnabledFor(level):
+                return function(*args, **kwargs)
+            with Span(label, log, level):
+                return function(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorate
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Handler writing to the current standard output, that may be redirected."""
+
+    @property
+    def stream(self):  # type: ignore
+        """Return the standard output."""
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        # the stream is always the current standard output
+        pass
+
+
+class JsonFormatter(logging.Formatter):
+    """Format the records as JSON lines, including the durations of the spans."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Return the record as a line of JSON."""
+        entry = {
+            'time': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for attribute in ('span', 'duration'):
+            if hasattr(record, attribute):
+                entry[attribute] = getattr(record, attribute)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+def configure(
+    level: Union[int, str, None] = None,
+    file: Optional[str] = None,
+    stream: Optional[IO[str]] = None,
+):
+    """
+    Configure the output of the package's logger.
+
+    The messages are printed to ``stream``, default the standard output, as
+    the diagnostics were before, or saved to ``file`` as JSON lines. A new call
+    replaces the previous configuration.
+
+    Parameters
+    ----------
+    level : Union[int, str]
+        Minimum level of the messages, default ``$PYALMGW_LOG`` or ``WARNING``.
+    file : str
+        Path of the log file, default ``$PYALMGW_LOG_FILE``.
+    stream : IO[str]
+        Output stream when there is no file, default the standard output.
+    """
+    global _handler
+
+    if level is None:
+        level = os.environ.get(LOG_VARIABLE) or logging.WARNING
+    if isinstance(level, str):
+        level = level.upper()
+        level = int(level) if level.isdigit() else logging.getLevelName(level)
+    if not isinstance(level, int):
+        # unknown level name
+        level = logging.WARNING
+    file = file or os.environ.get(LOG_FILE_VARIABLE)
+
+    if _handler is not None:
+        root.removeHandler(_handler)
+        _handler.close()
+    if file:
+        _handler = logging.FileHandler(file, encoding='utf-8')
+        _handler.setFormatter(JsonFormatter())
+    else:
+        _handler = logging.StreamHandler(stream) if stream is not None else _StdoutHandler()
+        _handler.setFormatter(logging.Formatter('%(message)s'))
+    root.addHandler(_handler)
+    root.setLevel(level)
+    # the package's messages are not duplicated by the application's handlers
+    root.propagate = False
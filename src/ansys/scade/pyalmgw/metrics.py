@@ -0,0 +1,188 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides the instrumentation of the connectors' commands.
+
+A command's record contains its wall and CPU times, the peak resident set size
+of the process, and the duration of its phases, for example loading the project
+or exporting the surrogate model. The records are appended to a JSON-lines log file,
+rotated when it exceeds a given size.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import sys
+import time
+from typing import Any, Callable, Dict, Generator, Optional
+
+from ansys.scade.pyalmgw.log import get_logger
+
+_logger = get_logger(__name__)
+
+# default maximum size of a log file, in bytes, and number of rotated files
+MAX_BYTES = 1024 * 1024
+BACKUP_COUNT = 3
+
+
+def get_peak_rss() -> Optional[int]:
+    """Return the peak resident set size of the process, in bytes, or None if not available."""
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):  # noqa: N801
+            _fields_ = [
+                ('cb', wintypes.DWORD),
+                ('PageFaultCount', wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        try:
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if not ctypes.windll.psapi.GetProcessMemoryInfo(
+                process, ctypes.byref(counters), counters.cb
+            ):
+                return None
+            return counters.PeakWorkingSetSize
+        except (AttributeError, OSError):
+            return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Metrics:
+    """
+    Records the duration of the phases of the commands.
+
+    The phases executed before a command, for example loading the project,
+    are included in the command's record.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        # optional function called at the beginning of each phase, for progress reports
+        self.listener: Optional[Callable[[str], None]] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """
+        Measure the duration of a phase.
+
+        The durations of the phases with the same name are cumulated.
+        """
+        if self.listener is not None:
+            self.listener(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    @contextmanager
+    def command(self, **info: Any) -> Generator[Dict[str, Any], None, None]:
+        """
+        Measure a command and provide its record.
+
+        The record, initialized with ``info``, is completed when the context exits.
+        The peak resident set size is a high-water mark of the process: the record
+        contains its value, ``process_peak_rss``, and its increase during
+        the command, ``peak_rss_delta``, null when it is not available.
+        """
+        record: Dict[str, Any] = {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'pid': os.getpid(),
+        }
+        record.update(info)
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        peak_rss = get_peak_rss()
+        try:
+            yield record
+        finally:
+            record['wall'] = round(time.perf_counter() - wall, 6)
+            record['cpu'] = round(time.process_time() - cpu, 6)
+            process_peak_rss = get_peak_rss()
+            record['process_peak_rss'] = process_peak_rss
+            record['peak_rss_delta'] = (
+                process_peak_rss - peak_rss
+                if process_peak_rss is not None and peak_rss is not None
+                else None
+            )
+            record['phases'] = {name: round(value, 6) for name, value in self.phases.items()}
+            self.phases = {}
+
+
+def append_record(
+    path: Path,
+    record: Dict[str, Any],
+    max_bytes: int = MAX_BYTES,
+    backup_count: int = BACKUP_COUNT,
+):
+    """
+    Append a record to a JSON-lines log file.
+
+    When the file exceeds ``max_bytes``, it is renamed with the suffix ``.1``,
+    the existing ``.1`` to ``.2``, and so on up to ``backup_count``.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the log file.
+    record : Dict[str, Any]
+        Record to append.
+    max_bytes : int
+        Maximum size of the log file before rotation.
+    backup_count : int
+        Number of rotated files to keep.
+    """
+    line = json.dumps(record, sort_keys=True) + '\n'
+    try:
+        if path.exists() and path.stat().st_size + len(line) > max_bytes:
+            for index in range(backup_count, 0, -1):
+                source = path if index == 1 else path.with_name('%s.%d' % (path.name, index - 1))
+                if source.exists():
+                    source.replace(path.with_name('%s.%d' % (path.name, index)))
+            if path.exists():
+                # no backup
+                path.unlink()
+        with path.open('a', encoding='utf-8') as f:
+            f.write(line)
+    except OSError as e:
+        _logger.error('%s: %s', path, e)
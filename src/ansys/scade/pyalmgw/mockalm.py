@@ -0,0 +1,542 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides a local mock of an ALM tool, for load testing connectors.
+
+The server exposes a minimal REST API with synthetic requirements documents:
+
+* ``GET /documents``: Paginated list of the documents,
+  ``{"items": [{"id": "DOC_1", "url": "documents/DOC_1", "revision": "1"}, ...], "next": ...}``.
+* ``GET /documents/<id>``: Content of a document, with nested sections and requirements.
+  The response has an ``ETag`` header, and the status 304 for a request
+  with the current tag in ``If-None-Match``.
+* ``POST /links``: Traceability deltas, in the format of the ALMGT files.
+* ``GET /stats``: Statistics of the server.
+
+The size of the documents, the latency, the throughput and the rate of
+errors are configurable. The benchmark executes import/export cycles against
+the server, similar to the ones of ``StubConnector``, and reports the
+number of requests per second and the percentiles of the latency.
+
+Usage::
+
+    python -m ansys.scade.pyalmgw.mockalm serve --port 8080 --documents 20 --latency 0.02
+    python -m ansys.scade.pyalmgw.mockalm bench --cycles 10 --error-rate 0.01
+"""
+
+from argparse import ArgumentParser
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from ansys.scade.pyalmgw.client import HttpClient, fetch_documents
+from ansys.scade.pyalmgw.documents import ReqDocument, ReqProject, Requirement, Section
+
+# size of the pages of the list of documents
+PAGE_SIZE = 10
+
+
+class MockAlmServer(ThreadingHTTPServer):
+    """
+    Local HTTP server with synthetic requirements documents.
+
+    The content of the documents is generated on the first request
+    and cached, so that the server does not limit the throughput.
+
+    Parameters
+    ----------
+    address : tuple
+        Host and port, for example ``('127.0.0.1', 0)`` for any free port.
+    documents : int
+        Number of documents.
+    depth : int
+        Depth of the sections of a document.
+    sections : int
+        Number of subsections of a document or a section.
+    requirements : int
+        Number of requirements in a section.
+    text_size : int
+        Size of the descriptions of the requirements, in characters.
+    latency : float
+        Minimum duration of a request, in seconds.
+    jitter : float
+        Maximum random duration added to the latency, in seconds.
+    error_rate : float
+        Ratio of requests that fail with the status 503, between 0 and 1.
+    max_rate : float
+        Maximum number of requests per second, 0 for unlimited.
+        The server answers with the status 429 when the rate is exceeded.
+    seed : int
+        Seed of the random generator, for reproducible runs.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address=('127.0.0.1', 0),
+        documents: int = 10,
+        depth: int = 2,
+        sections: int = 3,
+        requirements: int = 5,
+        text_size: int = 200,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        max_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        super().__init__(address, _MockAlmHandler)
+        self.documents = documents
+        self.depth = depth
+        self.sections = sections
+        self.requirements = requirements
+        self.text_size = text_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_rate = max_rate
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)  # nosec B311  # not a security purpose
+        # cache of the documents, serialized
+        self._contents: Dict[str, bytes] = {}
+        # revisions of the modified documents, 1 by default
+        self.revisions: Dict[str, int] = {}
+        # token bucket for the throughput
+        self._tokens = max_rate
+        self._refill = time.perf_counter()
+        # traceability links, indexed by oid and requirement
+        self.links: Dict[str, Dict[str, str]] = {}
+        self.stats = {'requests': 0, 'errors': 0, 'throttled': 0, 'deltas': 0}
+
+    @property
+    def url(self) -> str:
+        """Return the base URL of the server."""
+        host, port = self.server_address[:2]
+        return 'http://%s:%d/' % (host, port)
+
+    def start(self) -> threading.Thread:
+        """Serve the requests in a background thread."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """Stop serving the requests and close the server."""
+        self.shutdown()
+        self.server_close()
+
+    def get_document_ids(self) -> List[str]:
+        """Return the identifiers of the documents."""
+        return ['DOC_%d' % (i + 1) for i in range(self.documents)]
+
+    def get_document(self, id: str) -> Optional[bytes]:
+        """Return the serialized content of a document, or None if it does not exist."""
+        content = self._contents.get(id)
+        if content is None and id in self.get_document_ids():
+            content = json.dumps(self.generate_document(id)).encode('utf-8')
+            self._contents[id] = content
+        return content
+
+    def get_etag(self, id: str) -> str:
+        """Return the entity tag of a document."""
+        return '"%s-%d"' % (id, self.revisions.get(id, 1))
+
+    def modify_document(self, id: str):
+        """Create a new revision of a document."""
+        with self.lock:
+            self.revisions[id] = self.revisions.get(id, 1) + 1
+            self._contents.pop(id, None)
+
+    def generate_document(self, id: str) -> Dict[str, Any]:
+        """Return the synthetic content of a document."""
+        index = int(id.split('_')[1])
+        # same content for the same document, regardless of the order of the requests
+        text = ''.join('lorem ipsum '[_ % 12] for _ in range(self.text_size))
+        count = 0
+
+        def generate_sections(prefix: str, level: int) -> List[Dict[str, Any]]:
+            nonlocal count
+            sections = []
+            for i in range(self.sections):
+                number = '%s%d' % (prefix, i + 1)
+                requirements = []
+                for _ in range(self.requirements):
+                    count += 1
+                    id = 'REQ_%d_%d' % (index, count)
+                    requirements.append(
+                        {'id': id, 'text': 'Requirement %d' % count, 'description': text}
+                    )
+                sections.append(
+                    {
+                        'number': number,
+                        'title': 'Section %s' % number,
+                        'requirements': requirements,
+                        'sections': generate_sections(number + '.', level + 1)
+                        if level < self.depth
+                        else [],
+                    }
+                )
+            return sections
+
+        revision = self.revisions.get(id, 1)
+        name = 'Document %d' % index if revision == 1 else 'Document %d (%d)' % (index, revision)
+        return {'id': id, 'name': name, 'sections': generate_sections('', 1)}
+
+    def admit(self) -> int:
+        """Return the status of a new request: 0 when accepted, else the error to inject."""
+        with self.lock:
+            self.stats['requests'] += 1
+            if self.max_rate > 0:
+                now = time.perf_counter()
+                self._tokens = min(
+                    self.max_rate, self._tokens + (now - self._refill) * self.max_rate
+                )
+                self._refill = now
+                if self._tokens < 1:
+                    self.stats['throttled'] += 1
+                    return 429
+                self._tokens -= 1
+            if self.error_rate > 0 and self.random.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return 503
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+        return 0
+
+    def add_deltas(self, deltas: List[Dict[str, Any]]) -> int:
+        """Apply traceability deltas and return the number of links."""
+        with self.lock:
+            for delta in deltas:
+                oid = delta['source']['oid']
+                req = delta['target']['req_id']
+                if delta['action'] == 'ADD':
+                    self.links.setdefault(oid, {})[req] = delta['source'].get('path', '')
+                else:
+                    self.links.get(oid, {}).pop(req, None)
+            self.stats['deltas'] += len(deltas)
+            return sum(len(_) for _ in self.links.values())
+
+
+class _MockAlmHandler(BaseHTTPRequestHandler):
+    """Handles the requests of a ``MockAlmServer``."""
+
+    # keep-alive
+    protocol_version = 'HTTP/1.1'
+    server: MockAlmServer
+
+    def log_message(self, format, *args):
+        """Do not log the requests."""
+        pass
+
+    def do_GET(self):
+        """Serve the documents."""
+        status = self.server.admit()
+        if status:
+            self._send(status, b'{}', retry_after=status == 429)
+            return
+        parts = urlsplit(self.path)
+        path = parts.path.strip('/')
+        if path == 'documents':
+            ids = self.server.get_document_ids()
+            page = int(parse_qs(parts.query).get('page', ['1'])[0])
+            start = (page - 1) * PAGE_SIZE
+            items = [
+                {
+                    'id': _,
+                    'url': 'documents/%s' % _,
+                    'revision': str(self.server.revisions.get(_, 1)),
+                }
+                for _ in ids[start : start + PAGE_SIZE]
+            ]
+            next = 'documents?page=%d' % (page + 1) if start + PAGE_SIZE < len(ids) else None
+            self._send(200, json.dumps({'items': items, 'next': next}).encode('utf-8'))
+        elif path.startswith('documents/'):
+            id = path.split('/', 1)[1]
+            content = self.server.get_document(id)
+            etag = self.server.get_etag(id)
+            if content is not None and self.headers.get('If-None-Match') == etag:
+                self._send(304, b'', etag=etag)
+            elif content is not None:
+                self._send(200, content, etag=etag)
+            else:
+                self._send(404, b'{}')
+        elif path == 'stats':
+            self._send(200, json.dumps(self.server.stats).encode('utf-8'))
+        else:
+            self._send(404, b'{}')
+
+    def do_POST(self):
+        """Apply the traceability deltas."""
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        status = self.server.admit()
+        if status:
+            self._send(status, b'{}', retry_after=status == 429)
+        elif urlsplit(self.path).path.strip('/') == 'links':
+            links = self.server.add_deltas(json.loads(body))
+            self._send(200, json.dumps({'links': links}).encode('utf-8'))
+        else:
+            self._send(404, b'{}')
+
+    def _send(self, status: int, body: bytes, retry_after: bool = False, etag: str = ''):
+        """Send a ``json`` response."""
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        if retry_after:
+            self.send_header('Retry-After', '%g' % (1 / self.server.max_rate))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def build_document(document: ReqDocument, content: Dict[str, Any]):
+    """
+    Complete a document from its content on the mock server.
+
+    Parameters
+    ----------
+    document : ReqDocument
+        New document.
+    content : Dict[str, Any]
+        Content returned by ``GET /documents/<id>``.
+    """
+
+    def build_sections(owner, sections: List[Dict[str, Any]]):
+        for item in sections:
+            section = Section(owner, item['number'], item['title'])
+            for req in item['requirements']:
+                Requirement(section, req['id'], req['text'], req.get('description', ''))
+            build_sections(section, item['sections'])
+
+    document.identifier = content['id']
+    document.text = content['name']
+    build_sections(document, content['sections'])
+
+
+class _TimedClient(HttpClient):
+    """HTTP client that records the latency of the requests."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies: List[float] = []
+        self.failures = 0
+
+    async def request(self, *args, **kwargs):
+        """Send a request and record its latency, retries included."""
+        start = time.perf_counter()
+        try:
+            return await super().request(*args, **kwargs)
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    """Return the percentile of sorted values, using the nearest rank method."""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, int(ratio * len(values) + 0.5) - 1))
+    return values[rank]
+
+
+async def run_cycle(client: HttpClient, file: Path, links: int) -> int:
+    """
+    Execute an import/export cycle.
+
+    The import fetches all the documents and saves the requirements file.
+    The export sends traceability deltas for the first requirements.
+
+    Parameters
+    ----------
+    client : HttpClient
+        HTTP client for the mock server.
+    file : Path
+        Path of the requirements file.
+    links : int
+        Number of traceability deltas to export.
+
+    Returns
+    -------
+    int
+        Number of imported requirements.
+    """
+    # import
+    project = ReqProject(file)
+    urls = [_['url'] async for _ in client.paginate('documents')]
+    await fetch_documents(client, project, urls, build_document)
+    project.write()
+    # export
+    requirements = [req for doc in project.documents for req in doc.iter_requirements()]
+    deltas = [
+        {
+            'source': {'oid': '!ed/%x' % i, 'path': 'P::N%d/' % i},
+            'target': {'req_id': req.id},
+            'action': 'ADD' if i % 4 else 'REMOVE',
+        }
+        for i, req in enumerate(requirements[:links])
+    ]
+    await client.post('links', deltas)
+    return len(requirements)
+
+
+async def benchmark(
+    url: str, directory: Path, cycles: int = 10, concurrency: int = 8, links: int = 100
+) -> Dict[str, Any]:
+    """
+    Execute import/export cycles against a mock server and return the statistics.
+
+    Parameters
+    ----------
+    url : str
+        Base URL of the server.
+    directory : Path
+        Directory for the requirements files.
+    cycles : int
+        Number of cycles.
+    concurrency : int
+        Maximum number of concurrent requests.
+    links : int
+        Number of traceability deltas per cycle.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Number of requests, failures and requirements, duration,
+        requests per second and latencies in milliseconds.
+    """
+    client = _TimedClient(url, max_connections=concurrency)
+    requirements = 0
+    start = time.perf_counter()
+    try:
+        for cycle in range(cycles):
+            requirements += await run_cycle(client, directory / ('cycle%d.xml' % cycle), links)
+    finally:
+        duration = time.perf_counter() - start
+        client.close()
+    latencies = sorted(client.latencies)
+    return {
+        'requests': len(latencies),
+        'failures': client.failures,
+        'attempts': client.requests,
+        'requirements': requirements,
+        'duration': duration,
+        'rps': len(latencies) / duration if duration else 0.0,
+        'latency': {
+            name: percentile(latencies, ratio) * 1000
+            for name, ratio in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))
+        },
+    }
+
+
+def print_report(stats: Dict[str, Any]):
+    """Print the statistics of a benchmark."""
+    print(
+        '%d requests (%d attempts, %d failures), %d requirements in %.2f s: %.1f requests/s'
+        % (
+            stats['requests'],
+            stats['attempts'],
+            stats['failures'],
+            stats['requirements'],
+            stats['duration'],
+            stats['rps'],
+        )
+    )
+    print('latency (ms):', ', '.join('%s %.2f' % _ for _ in stats['latency'].items()))
+
+
+def main(args=None) -> int:
+    """Serve the mock ALM tool, or run a benchmark against a local instance."""
+    parser = ArgumentParser(description='Mock ALM tool for load testing')
+    parser.add_argument('command', choices=['serve', 'bench'], help='command')
+    parser.add_argument('--port', type=int, default=0, help='port of the server')
+    parser.add_argument('--documents', type=int, default=10, help='number of documents')
+    parser.add_argument('--depth', type=int, default=2, help='depth of the sections')
+    parser.add_argument('--sections', type=int, default=3, help='subsections per section')
+    parser.add_argument('--requirements', type=int, default=5, help='requirements per section')
+    parser.add_argument('--text-size', type=int, default=200, help='size of the descriptions')
+    parser.add_argument('--latency', type=float, default=0.0, help='latency, in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='latency jitter, in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='ratio of failures')
+    parser.add_argument('--max-rate', type=float, default=0.0, help='maximum requests/s')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random generator')
+    parser.add_argument('--cycles', type=int, default=10, help='benchmark cycles')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent requests')
+    parser.add_argument('--links', type=int, default=100, help='deltas per cycle')
+    parser.add_argument('--output', help='file for the statistics of the benchmark, json')
+    options = parser.parse_args(args)
+
+    server = MockAlmServer(
+        ('127.0.0.1', options.port),
+        documents=options.documents,
+        depth=options.depth,
+        sections=options.sections,
+        requirements=options.requirements,
+        text_size=options.text_size,
+        latency=options.latency,
+        jitter=options.jitter,
+        error_rate=options.error_rate,
+        max_rate=options.max_rate,
+        seed=options.seed,
+    )
+    if options.command == 'serve':
+        print('serving', server.url)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        server.server_close()
+        return 0
+
+    server.start()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            stats = asyncio.run(
+                benchmark(
+                    server.url, Path(directory), options.cycles, options.concurrency, options.links
+                )
+            )
+    finally:
+        server.stop()
+    stats['server'] = server.stats
+    print_report(stats)
+    if options.output:
+        Path(options.output).write_text(json.dumps(stats, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
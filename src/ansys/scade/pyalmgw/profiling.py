@@ -0,0 +1,224 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides the profiling of the exports and of the connectors' commands.
+
+Two profilers are available:
+
+* ``cprofile``: deterministic profiler of the standard library. The statistics
+  are saved to a ``.prof`` file, that tools such as ``snakeviz`` can display,
+  and the top functions to a ``.prof.txt`` file.
+* ``sampling``: lightweight profiler that records the call stack of the
+  profiled thread at regular intervals. The stacks are saved to a ``.folded``
+  file, the input format of flame graph tools, and the top functions to
+  a ``.samples.txt`` file.
+
+The entry points enable the profiling with a command line option or the
+environment variable ``PYALMGW_PROFILE``, set to the name of a profiler.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+import io
+import os
+from pathlib import Path
+import sys
+import threading
+from typing import Dict, Generator, List, Optional, Tuple
+
+import ansys.scade.pyalmgw as pyalmgw
+from ansys.scade.pyalmgw.log import get_logger
+
+_logger = get_logger(__name__)
+
+# available profilers
+PROFILERS = ['cprofile', 'sampling']
+# default number of functions in the summaries
+TOP = 30
+# default interval between two samples, in seconds
+INTERVAL = 0.005
+
+# function: file, first line, name
+_Function = Tuple[str, int, str]
+
+
+def get_profiler(option: Optional[str] = None) -> Optional[str]:
+    """
+    Return the name of the profiler to use, if any.
+
+    Parameters
+    ----------
+    option : str
+        Value of the command line option, if any, otherwise the environment
+        variable ``PYALMGW_PROFILE`` applies. ``1`` or ``true`` selects ``cprofile``.
+
+    Returns
+    -------
+    Optional[str]
+        Name of the profiler or None if the profiling is disabled or the name is unknown.
+    """
+    name = (option or os.environ.get(pyalmgw.PROFILE_VARIABLE, '')).lower()
+    if name in {'1', 'true', 'on'}:
+        name = 'cprofile'
+    return name if name in PROFILERS else None
+
+
+class SamplingProfiler:
+    """
+    Record the call stack of a thread at regular intervals.
+
+    Parameters
+    ----------
+    interval : float
+        Interval between two samples, in seconds.
+    """
+
+    def __init__(self, interval: float = INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._thread_id = 0
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start sampling the current thread."""
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """Stop sampling."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                # outermost first
+                stack.reverse()
+                self.samples[tuple(stack)] += 1
+
+    def get_counts(self) -> Tuple[Dict[_Function, int], Dict[_Function, int]]:
+        """Return the number of samples per function, in the function itself and cumulated."""
+        own: Dict[_Function, int] = Counter()
+        cumulated: Dict[_Function, int] = Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for function in set(stack):
+                cumulated[function] += count
+        return own, cumulated
+
+    def write_folded(self, path: Path):
+        """Save the stacks with the format ``caller;...;callee <count>``."""
+        with path.open('w', encoding='utf-8') as f:
+            for stack, count in sorted(self.samples.items()):
+                names = ';'.join(_format_function(function) for function in stack)
+                f.write('%s %d\n' % (names, count))
+
+    def get_summary(self, top: int = TOP) -> str:
+        """Return the functions with the most samples, cumulated then own."""
+        own, cumulated = self.get_counts()
+        total = sum(self.samples.values())
+        lines = ['%d samples, interval %g s' % (total, self.interval)]
+        for title, counts in (('cumulated', cumulated), ('own', own)):
+            lines.append('')
+            lines.append('%8s %7s  function (%s)' % ('samples', '%', title))
+            for function, count in Counter(counts).most_common(top):
+                ratio = 100.0 * count / total if total else 0.0
+                lines.append('%8d %6.2f%%  %s' % (count, ratio, _format_function(function)))
+        return '\n'.join(lines) + '\n'
+
+
+def _format_function(function: _Function) -> str:
+    file, line, name = function
+    return '%s (%s:%d)' % (name, Path(file).name, line)
+
+
+@contextmanager
+def profile(
+    profiler: Optional[str], stem: Path, top: int = TOP
+) -> Generator[Optional[List[Path]], None, None]:
+    """
+    Profile a block of code and save the results next to ``stem``.
+
+    Parameters
+    ----------
+    profiler : str
+        Name of the profiler, or None to disable the profiling.
+    stem : Path
+        Path of the output files, without extension. For example
+        ``<project>.<connector>.<command>``.
+    top : int
+        Number of functions in the summary.
+
+    Yields
+    ------
+    Optional[List[Path]]
+        List of the files, completed at the end of the block, or None when
+        the profiling is disabled.
+    """
+    if profiler is None:
+        yield None
+        return
+    files: List[Path] = []
+    if profiler == 'cprofile':
+        import cProfile
+        import pstats
+
+        deterministic = cProfile.Profile()
+        deterministic.enable()
+        try:
+            yield files
+        finally:
+            deterministic.disable()
+            dump = stem.with_name(stem.name + '.prof')
+            deterministic.dump_stats(str(dump))
+            text = io.StringIO()
+            stats = pstats.Stats(deterministic, stream=text)
+            stats.sort_stats('cumulative').print_stats(top)
+            summary = stem.with_name(stem.name + '.prof.txt')
+            summary.write_text(text.getvalue(), encoding='utf-8')
+            files.extend([dump, summary])
+    else:
+        sampling = SamplingProfiler()
+        sampling.start()
+        try:
+            yield files
+        finally:
+            sampling.stop()
+            folded = stem.with_name(stem.name + '.folded')
+            sampling.write_folded(folded)
+            summary = stem.with_name(stem.name + '.samples.txt')
+            summary.write_text(sampling.get_summary(top), encoding='utf-8')
+            files.extend([folded, summary])
+    # the profile is requested explicitly: the message is displayed with the default level
+    _logger.warning('profile saved to %s', ', '.join(str(file) for file in files))
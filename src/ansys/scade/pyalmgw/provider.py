@@ -0,0 +1,364 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides a lightweight ``scade_provider`` HTTP service for the URLs of the surrogate model.
+
+The elements of a surrogate model exported for custom connectors have a URL,
+``http://localhost:8080/scade_provider/services/<project>/requirements/<oid>``,
+where ``<oid>`` is encoded in base 64. The service resolves these URLs against
+the last exported surrogate model:
+
+* ``.../requirements/<oid>``: HTML page with the details of the element.
+* ``.../requirements/<oid>?format=json``: Details of the element, in ``json``.
+* ``.../requirements/<oid>/image``: Image of the element, if any.
+
+The surrogate model is loaded on the first request, and reloaded when the file changes.
+The responses are cached, with a LRU policy.
+
+The service runs either in the current process, with ``ScadeProvider.start``,
+or as a separate process::
+
+    python -m ansys.scade.pyalmgw.provider <project>.llrs [--port 8080]
+"""
+
+from argparse import ArgumentParser
+from base64 import b64decode
+import binascii
+from collections import OrderedDict
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from ansys.scade.pyalmgw.log import get_logger
+from ansys.scade.pyalmgw.serializers import get_serializer
+from ansys.scade.pyalmgw.surrogate import index_elements, read_shards
+
+_logger = get_logger(__name__)
+
+# default port, referenced by the URLs of the surrogate model
+PORT = 8080
+# default maximum number of cached responses
+CACHE_SIZE = 1024
+# prefix of the URLs
+PREFIX = 'scade_provider/services/'
+# content types of the images
+IMAGE_TYPES = {
+    '.bmp': 'image/bmp',
+    '.gif': 'image/gif',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.svg': 'image/svg+xml',
+}
+
+
+class SurrogateIndex:
+    """
+    Index of the elements of a surrogate model file, loaded on demand.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the surrogate model, either a ``.llrs`` file or a manifest of shards.
+    format : str
+        Format of the file, refer to ``ansys.scade.pyalmgw.serializers``.
+    """
+
+    def __init__(self, path: Path, format: str = 'json'):
+        self.path = path
+        self.format = format
+        # elements indexed by oid, without their child elements
+        self.elements: Dict[str, Dict[str, Any]] = {}
+        self.project_id = ''
+        self.name = ''
+        # modification time of the indexed file
+        self.stamp: Optional[int] = None
+        self.lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """Load the surrogate model if not loaded or modified, and return whether it was."""
+        try:
+            stamp = self.path.stat().st_mtime_ns
+        except OSError:
+            stamp = None
+        with self.lock:
+            if stamp == self.stamp:
+                return False
+            elements: Dict[str, Dict[str, Any]] = {}
+            name = ''
+            if stamp is None:
+                _logger.warning('%s: file not found', self.path)
+            else:
+                model = get_serializer(self.format).read(self.path) or {}
+                if any('shards' in _ for _ in model.get('elements', [])):
+                    model = read_shards(self.path)
+                name = model.get('name', '')
+                elements = index_elements(model)
+                _logger.debug('%s: %d elements indexed', self.path, len(elements))
+            # the concurrent requests use either the previous or the new index
+            self.elements, self.name, self.stamp = elements, name, stamp
+            self.project_id = get_project_id(elements.values())
+            return True
+
+    def get_element(self, oid: str) -> Optional[Dict[str, Any]]:
+        """Return the element of an oid, if any."""
+        return self.elements.get(oid)
+
+    def get_ancestors(self, element: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Return the ancestors of an element, from the root."""
+        ancestors = []
+        parent = self.elements.get(element.get('parent') or '')
+        while parent is not None and len(ancestors) < len(self.elements):
+            ancestors.append(parent)
+            parent = self.elements.get(parent.get('parent') or '')
+        return list(reversed(ancestors))
+
+
+def get_project_id(elements) -> str:
+    """Return the ALM Gateway ID of the project, from the URL of the first element having one."""
+    for element in elements:
+        url = element.get('url', '')
+        if PREFIX in url:
+            return url.split(PREFIX, 1)[1].split('/', 1)[0]
+    return ''
+
+
+def decode_oid(text: str) -> Optional[str]:
+    """Return the oid encoded in a URL, or None if not valid."""
+    text = unquote(text)
+    try:
+        # accept the standard and the URL-safe alphabets, with or without padding
+        data = text.replace('-', '+').replace('_', '/') + '=' * (-len(text) % 4)
+        return b64decode(data, validate=True).decode('utf-8')
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+
+
+class ScadeProvider(ThreadingHTTPServer):
+    """
+    HTTP service for the URLs of the surrogate models.
+
+    Parameters
+    ----------
+    paths : List[Path]
+        Surrogate models to serve. The project of a URL selects the model
+        whose elements have the same project ID, or the first model if none.
+    address : tuple
+        Host and port, default ``('127.0.0.1', 8080)``.
+    cache_size : int
+        Maximum number of cached responses.
+    format : str
+        Format of the surrogate models, refer to ``ansys.scade.pyalmgw.serializers``.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        paths: List[Path],
+        address=('127.0.0.1', PORT),
+        cache_size: int = CACHE_SIZE,
+        format: str = 'json',
+    ):
+        super().__init__(address, _ProviderHandler)
+        self.indexes = [SurrogateIndex(path, format) for path in paths]
+        self.cache_size = cache_size
+        # responses, indexed by project, oid, format and version of the model
+        self.cache: 'OrderedDict[Tuple[Any, ...], Tuple[str, bytes]]' = OrderedDict()
+        self.lock = threading.Lock()
+        # statistics
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def url(self) -> str:
+        """Return the base URL of the service."""
+        host, port = self.server_address[:2]
+        return 'http://%s:%d/' % (host, port)
+
+    def start(self) -> threading.Thread:
+        """Serve the requests in a background thread."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """Stop serving the requests and close the server."""
+        self.shutdown()
+        self.server_close()
+
+    def get_index(self, project_id: str) -> Optional[SurrogateIndex]:
+        """Return the index of a project, loaded or refreshed if needed."""
+        modified = False
+        for index in self.indexes:
+            modified |= index.refresh()
+        if modified:
+            # the responses may be obsolete
+            with self.lock:
+                self.cache.clear()
+        for index in self.indexes:
+            if index.project_id == project_id:
+                return index
+        return self.indexes[0] if self.indexes else None
+
+    def get_response(self, project_id: str, oid: str, format: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Return the content type and the content of the response for an element.
+
+        Parameters
+        ----------
+        project_id : str
+            ALM Gateway ID of the project.
+        oid : str
+            Oid of the element.
+        format : str
+            Format of the response, ``html``, ``json`` or ``image``.
+
+        Returns
+        -------
+        Optional[Tuple[str, bytes]]
+            Content type and content, or None if the element or its image does not exist.
+        """
+        index = self.get_index(project_id)
+        key = (project_id, oid, format, index.stamp if index else None)
+        with self.lock:
+            response = self.cache.get(key)
+            if response is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return response
+            self.misses += 1
+        element = index.get_element(oid) if index else None
+        if element is None:
+            return None
+        assert index is not None  # nosec B101  # addresses linter
+        if format == 'json':
+            details = dict(element, ancestors=[_.get('name') for _ in index.get_ancestors(element)])
+            response = ('application/json', json.dumps(details).encode('utf-8'))
+        elif format == 'image':
+            image = element.get('image')
+            path = Path(image) if image else None
+            if not path or not path.is_file():
+                return None
+            content_type = IMAGE_TYPES.get(path.suffix.lower(), 'application/octet-stream')
+            response = (content_type, path.read_bytes())
+        else:
+            response = ('text/html; charset=utf-8', render_element(index, element).encode('utf-8'))
+        with self.lock:
+            self.cache[key] = response
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return response
+
+
+def render_element(index: SurrogateIndex, element: Dict[str, Any]) -> str:
+    """Return an HTML page with the details of an element."""
+    name = escape(str(element.get('name', '')))
+    rows = [
+        ('Model', index.name),
+        ('Path', ' / '.join(str(_.get('name', '')) for _ in index.get_ancestors(element))),
+        ('Pathname', element.get('pathname', '')),
+        ('Type', element.get('scadetype', '')),
+        ('Oid', element.get('oid', '')),
+    ]
+    rows.extend((_['name'], _['value']) for _ in element.get('attributes', []))
+    lines = [
+        '<!DOCTYPE html>',
+        '<html><head><meta charset="utf-8"><title>%s</title></head><body>' % name,
+        '<h1>%s</h1>' % name,
+        '<table>',
+    ]
+    lines.extend(
+        '<tr><th>%s</th><td>%s</td></tr>' % (escape(str(key)), escape(str(value)))
+        for key, value in rows
+    )
+    lines.append('</table>')
+    if element.get('image') and element.get('url'):
+        lines.append('<p><img src="%s/image" alt="%s"></p>' % (escape(element['url']), name))
+    lines.append('</body></html>')
+    return '\n'.join(lines)
+
+
+class _ProviderHandler(BaseHTTPRequestHandler):
+    """Handles the requests of a ``ScadeProvider``."""
+
+    protocol_version = 'HTTP/1.1'
+    server: ScadeProvider
+
+    def log_message(self, format, *args):
+        """Log the requests with the package's logger."""
+        _logger.debug(format, *args)
+
+    def do_GET(self):
+        """Serve the elements."""
+        parts = urlsplit(self.path)
+        # <project>/requirements/<oid>[/image], where the encoded oid may contain '/'
+        segments = parts.path.strip('/').split(PREFIX, 1)[-1].split('/', 2)
+        response = None
+        if len(segments) == 3 and segments[1] == 'requirements':
+            encoded = segments[2]
+            if encoded.endswith('/image'):
+                encoded, format = encoded[: -len('/image')], 'image'
+            else:
+                format = parse_qs(parts.query).get('format', ['html'])[0]
+            oid = decode_oid(encoded)
+            if oid is not None and format in {'html', 'json', 'image'}:
+                response = self.server.get_response(segments[0], oid, format)
+        if response is None:
+            content_type, body, status = 'text/plain', b'not found', 404
+        else:
+            (content_type, body), status = response, 200
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main(args=None) -> int:
+    """Serve the URLs of surrogate models."""
+    parser = ArgumentParser(description='SCADE provider for the URLs of the surrogate models')
+    parser.add_argument('llrs', nargs='+', help='surrogate models')
+    parser.add_argument('--port', type=int, default=PORT, help='port of the service')
+    parser.add_argument('--cache', type=int, default=CACHE_SIZE, help='cached responses')
+    parser.add_argument('--format', default='json', help='format of the surrogate models')
+    options = parser.parse_args(args)
+
+    paths = [Path(_) for _ in options.llrs]
+    server = ScadeProvider(paths, ('127.0.0.1', options.port), options.cache, options.format)
+    print('serving', server.url + PREFIX)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
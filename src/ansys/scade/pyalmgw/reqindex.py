@@ -0,0 +1,389 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides a persistent index of the traceability links, for the ``locate`` command.
+
+The index associates the requirement IDs to the OIDs of the linked model elements,
+and the OIDs to their pathnames and requirement IDs. It is built from the
+requirements file and the surrogate model, and updated with the traceability
+deltas of the ``export`` command.
+
+The file contains two open addressing hash tables followed by the records.
+It is memory-mapped at lookup time, so that a query reads only a few pages
+of the file, regardless of its size, without loading the project.
+
+* Header: magic, number of slots of the requirements and OIDs tables.
+* Tables: slots of ``(hash, offset)``, where a null offset marks an empty slot.
+* Records: a count of strings followed by the strings, each one prefixed by its size.
+  The records of the requirements are ``[id, oid*]``, the ones of the OIDs
+  are ``[oid, pathname, id*]``.
+"""
+
+import mmap
+from pathlib import Path
+import struct
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import weakref
+import zlib
+
+from ansys.scade.pyalmgw.log import get_logger, timed
+from ansys.scade.pyalmgw.utils import atomic_write, iter_json_array, read_json
+
+_logger = get_logger(__name__)
+
+MAGIC = b'PYALMIX1'
+_HEADER = struct.Struct('<8sII')
+_SLOT = struct.Struct('<II')
+_COUNT = struct.Struct('<I')
+
+# number of attempts to replace an index file mapped by another process, on Windows
+REPLACE_ATTEMPTS = 10
+# delay between two attempts, in seconds
+REPLACE_DELAY = 0.1
+
+# indexes opened by the current process, to release their mapping before replacing a file
+_open_indexes: 'weakref.WeakSet[ReqIndex]' = weakref.WeakSet()
+
+
+def _hash(key: str) -> int:
+    """Return a hash of a key, stable across processes."""
+    return zlib.crc32(key.encode('utf-8'))
+
+
+def _is_power_of_two(value: int) -> bool:
+    """Return whether a number is a power of two."""
+    return value > 0 and value & (value - 1) == 0
+
+
+def _get_slots(count: int) -> int:
+    """Return the number of slots of a table, a power of two at most half full."""
+    slots = 8
+    while slots < 2 * count:
+        slots *= 2
+    return slots
+
+
+def _pack_record(strings: List[str]) -> bytes:
+    """Return the serialization of a record."""
+    parts = [_COUNT.pack(len(strings))]
+    for string in strings:
+        data = string.encode('utf-8')
+        parts.append(_COUNT.pack(len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def _build_table(records: List[List[str]], slots: int, offset: int) -> Tuple[bytearray, bytes]:
+    """Return the table and the records, starting at ``offset`` in the file."""
+    table = bytearray(slots * _SLOT.size)
+    data = []
+    mask = slots - 1
+    for record in records:
+        hash = _hash(record[0])
+        slot = hash & mask
+        while _SLOT.unpack_from(table, slot * _SLOT.size)[1]:
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(table, slot * _SLOT.size, hash, offset)
+        packed = _pack_record(record)
+        data.append(packed)
+        offset += len(packed)
+    return table, b''.join(data)
+
+
+@timed()
+def write_index(path: Path, links: Dict[str, Iterable[str]], pathnames: Dict[str, str]):
+    """
+    Write an index file.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the index file.
+    links : Dict[str, Iterable[str]]
+        OIDs of the linked model elements, indexed by requirement ID.
+    pathnames : Dict[str, str]
+        Pathnames of the model elements, indexed by OID.
+    """
+    requirements: Dict[str, List[str]] = {}
+    for req, oids in sorted(links.items()):
+        for oid in set(oids):
+            requirements.setdefault(oid, []).append(req)
+    req_records = [[req] + sorted(set(oids)) for req, oids in sorted(links.items()) if oids]
+    oid_records = [
+        [oid, pathnames.get(oid, '')] + reqs for oid, reqs in sorted(requirements.items())
+    ]
+    req_slots = _get_slots(len(req_records))
+    oid_slots = _get_slots(len(oid_records))
+    offset = _HEADER.size + (req_slots + oid_slots) * _SLOT.size
+    req_table, req_data = _build_table(req_records, req_slots, offset)
+    oid_table, oid_data = _build_table(oid_records, oid_slots, offset + len(req_data))
+    # a mapped file can't be replaced on Windows
+    for index in list(_open_indexes):
+        if index.path.resolve() == path.resolve():
+            index.close()
+    for attempt in range(REPLACE_ATTEMPTS):
+        try:
+            with atomic_write(path, 'wb') as f:
+                f.write(_HEADER.pack(MAGIC, req_slots, oid_slots))
+                f.write(req_table)
+                f.write(oid_table)
+                f.write(req_data)
+                f.write(oid_data)
+            break
+        except PermissionError:
+            # the file is mapped by another process, for example during a lookup
+            if sys.platform != 'win32' or attempt == REPLACE_ATTEMPTS - 1:
+                raise
+            time.sleep(REPLACE_DELAY)
+    _logger.debug('%s: %d requirements, %d elements', path, len(req_records), len(oid_records))
+
+
+class ReqIndex:
+    """
+    Read-only access to an index file.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the index file.
+
+    Raises
+    ------
+    ValueError
+        The file is not a valid index file. The queries raise the same exception
+        when the file is corrupted.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open('rb') as f:
+            size = path.stat().st_size
+            if size < _HEADER.size:
+                raise ValueError('%s: invalid index file' % path)
+            # the mapping remains valid after the file is closed
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._req_slots, self._oid_slots = _HEADER.unpack_from(self._map, 0)
+        self._req_table = _HEADER.size
+        self._oid_table = self._req_table + self._req_slots * _SLOT.size
+        self._data = self._oid_table + self._oid_slots * _SLOT.size
+        if (
+            magic != MAGIC
+            or not _is_power_of_two(self._req_slots)
+            or not _is_power_of_two(self._oid_slots)
+            or self._data > size
+        ):
+            self.close()
+            raise ValueError('%s: invalid index file' % path)
+        _open_indexes.add(self)
+
+    def __enter__(self) -> 'ReqIndex':
+        """Return the index."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the index."""
+        self.close()
+
+    def close(self):
+        """Release the mapping of the file."""
+        self._map.close()
+        _open_indexes.discard(self)
+
+    def _read_count(self, offset: int) -> int:
+        """Return the count at an offset."""
+        try:
+            return _COUNT.unpack_from(self._map, offset)[0]
+        except struct.error:
+            raise ValueError('%s: corrupted index file' % self.path) from None
+
+    def _read_slot(self, offset: int) -> Tuple[int, int]:
+        """Return the hash and the offset of the record of a slot."""
+        hash, record = _SLOT.unpack_from(self._map, offset)
+        if record and not self._data <= record < len(self._map):
+            raise ValueError('%s: corrupted index file' % self.path)
+        return hash, record
+
+    def _read_string(self, offset: int) -> Tuple[str, int]:
+        """Return the string at an offset and the offset of the next one."""
+        size = self._read_count(offset)
+        offset += _COUNT.size
+        if offset + size > len(self._map):
+            raise ValueError('%s: corrupted index file' % self.path)
+        return self._map[offset : offset + size].decode('utf-8'), offset + size
+
+    def _read_record(self, offset: int) -> List[str]:
+        """Return the strings of the record at an offset."""
+        count = self._read_count(offset)
+        offset += _COUNT.size
+        strings = []
+        for _ in range(count):
+            string, offset = self._read_string(offset)
+            strings.append(string)
+        return strings
+
+    def _find(self, table: int, slots: int, key: str) -> Optional[List[str]]:
+        """Return the record of a key, without the key, or None if not found."""
+        hash = _hash(key)
+        mask = slots - 1
+        slot = hash & mask
+        for _ in range(slots):
+            slot_hash, offset = self._read_slot(table + slot * _SLOT.size)
+            if not offset:
+                return None
+            if slot_hash == hash:
+                # compare the key before reading the full record
+                string, _ = self._read_string(offset + _COUNT.size)
+                if string == key:
+                    return self._read_record(offset)[1:]
+            slot = (slot + 1) & mask
+        return None
+
+    def _iter_table(self, table: int, slots: int):
+        """Iterate through the records of a table."""
+        for slot in range(slots):
+            _, offset = self._read_slot(table + slot * _SLOT.size)
+            if offset:
+                yield self._read_record(offset)
+
+    def get_oids(self, req: str) -> List[str]:
+        """Return the OIDs of the model elements linked to a requirement."""
+        return self._find(self._req_table, self._req_slots, req) or []
+
+    def get_requirements(self, oid: str) -> List[str]:
+        """Return the IDs of the requirements linked to a model element."""
+        record = self._find(self._oid_table, self._oid_slots, oid)
+        return record[1:] if record else []
+
+    def get_pathname(self, oid: str) -> str:
+        """Return the pathname of a linked model element, or an empty string if unknown."""
+        record = self._find(self._oid_table, self._oid_slots, oid)
+        return record[0] if record else ''
+
+    def locate(self, req: str) -> List[Tuple[str, str]]:
+        """
+        Return the model elements linked to a requirement.
+
+        Parameters
+        ----------
+        req : str
+            Identifier of the requirement.
+
+        Returns
+        -------
+        List[Tuple[str, str]]
+            OIDs and pathnames of the model elements.
+        """
+        return [(oid, self.get_pathname(oid)) for oid in self.get_oids(req)]
+
+    def get_links(self) -> Tuple[Dict[str, Set[str]], Dict[str, str]]:
+        """Return the content of the index, as expected by ``write_index``."""
+        links = {
+            record[0]: set(record[1:])
+            for record in self._iter_table(self._req_table, self._req_slots)
+        }
+        pathnames = {
+            record[0]: record[1] for record in self._iter_table(self._oid_table, self._oid_slots)
+        }
+        return links, pathnames
+
+
+def read_pathnames(llrs: Optional[Path]) -> Dict[str, str]:
+    """Return the pathnames of the elements of a surrogate model, indexed by OID."""
+    if not llrs or not llrs.exists():
+        return {}
+    from ansys.scade.pyalmgw.surrogate import iter_elements
+
+    model = read_json(llrs)
+    if not isinstance(model, dict):
+        return {}
+    return {
+        element['oid']: element.get('pathname', '')
+        for _, element in iter_elements(model)
+        if element.get('oid') and element.get('almtype') != 'section'
+    }
+
+
+def build_index(path: Path, req_file: Path, llrs: Optional[Path] = None):
+    """
+    Build an index file from a requirements file and a surrogate model.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the index file.
+    req_file : Path
+        Requirements file, produced by the ``import`` command.
+    llrs : Path
+        Surrogate model, produced by the last export, optional.
+    """
+    from ansys.scade.pyalmgw.documents import ReqProject
+
+    project = ReqProject(req_file)
+    project.read()
+    links: Dict[str, Set[str]] = {}
+    for link in project.traceability_links:
+        req = link.requirement.id if link.requirement else link.target
+        links.setdefault(req, set()).add(link.source)
+    write_index(path, links, read_pathnames(llrs))
+
+
+def update_index(path: Path, deltas: Optional[Path], llrs: Optional[Path] = None):
+    """
+    Update an index file with the traceability deltas of the ``export`` command.
+
+    The index is created when it does not exist.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the index file.
+    deltas : Path
+        Traceability deltas, in the format of the ALMGT files, optional.
+    llrs : Path
+        Surrogate model, produced by the last export, optional.
+    """
+    # read the surrogate model first, to minimize the time between reading and writing
+    # the index, that the ``export`` command and an asynchronous export may both update
+    llrs_pathnames = read_pathnames(llrs)
+    links: Dict[str, Set[str]] = {}
+    pathnames: Dict[str, str] = {}
+    if path.exists():
+        try:
+            with ReqIndex(path) as index:
+                links, pathnames = index.get_links()
+        except ValueError as e:
+            _logger.warning(str(e))
+    for delta in iter_json_array(deltas) if deltas else []:
+        oid = delta['source']['oid']
+        req = delta['target']['req_id']
+        if delta['action'] == 'ADD':
+            links.setdefault(req, set()).add(oid)
+            pathname = delta['source'].get('path')
+            if pathname:
+                pathnames[oid] = pathname
+        else:
+            links.get(req, set()).discard(oid)
+    pathnames.update(llrs_pathnames)
+    write_index(path, links, pathnames)
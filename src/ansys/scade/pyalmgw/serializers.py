@@ -0,0 +1,360 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides serializers for the surrogate model.
+
+The default serializer, ``json``, produces the indented and sorted JSON files
+expected by ALM Gateway. The other ones are intended for custom connectors:
+
+* ``compact``: JSON without indentation nor sorting.
+* ``msgpack``: Binary encoding compatible with MessagePack, restricted to the
+  JSON data types.
+"""
+
+from abc import ABCMeta, abstractmethod
+import json
+from pathlib import Path
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+from ansys.scade.pyalmgw.log import get_logger
+from ansys.scade.pyalmgw.utils import atomic_write
+
+_logger = get_logger(__name__)
+
+
+class Serializer(metaclass=ABCMeta):
+    """Top-level class for serializers."""
+
+    # default extension of the files
+    extension = ''
+
+    @abstractmethod
+    def dumps(self, object_: Any) -> bytes:
+        r"""
+        Serialize an object.
+
+        Parameters
+        ----------
+        object\_ : Any
+            Object to serialize, made of JSON compatible data types.
+
+        Returns
+        -------
+        bytes
+            Serialized object.
+        """
+        raise NotImplementedError('Abstract method call')
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """
+        Deserialize an object.
+
+        Parameters
+        ----------
+        data : bytes
+            Serialized object.
+
+        Returns
+        -------
+        Any
+            Deserialized object.
+        """
+        raise NotImplementedError('Abstract method call')
+
+    def write(self, object_: Any, path: Path) -> bool:
+        r"""
+        Serialize an object to a file.
+
+        Parameters
+        ----------
+        object\_ : Any
+            Object to serialize.
+        path : Path
+            Path of the output file.
+
+        Returns
+        -------
+        bool
+            Whether the file is written.
+        """
+        try:
+            data = self.dumps(object_)
+            with atomic_write(path, 'wb') as f:
+                f.write(data)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            _logger.error('%s: %s', path, e)
+            return False
+
+    def read(self, path: Path) -> Any:
+        """
+        Deserialize an object from a file.
+
+        Parameters
+        ----------
+        path : Path
+            Path of the input file.
+
+        Returns
+        -------
+        Any
+            Deserialized object, or None if an error occurs.
+        """
+        try:
+            return self.loads(path.read_bytes())
+        except (OSError, ValueError) as e:
+            _logger.error('%s: %s', path, e)
+            return None
+
+
+class JsonSerializer(Serializer):
+    """Serializer for JSON."""
+
+    extension = '.json'
+
+    def __init__(
+        self,
+        indent: Optional[int] = None,
+        sort_keys: bool = False,
+        separators: Optional[Tuple[str, str]] = None,
+    ):
+        self.indent = indent
+        self.sort_keys = sort_keys
+        self.separators = separators
+
+    def dumps(self, object_: Any) -> bytes:
+        """Implement ``dumps``."""
+        text = json.dumps(
+            object_, indent=self.indent, sort_keys=self.sort_keys, separators=self.separators
+        )
+        return text.encode('utf-8')
+
+    def loads(self, data: bytes) -> Any:
+        """Implement ``loads``."""
+        return json.loads(data.decode('utf-8'))
+
+
+class MsgPackSerializer(Serializer):
+    """
+    Serializer for a subset of MessagePack.
+
+    The supported types are the ones of JSON: ``None``, ``bool``, ``int``, ``float``,
+    ``str``, ``list``, ``tuple`` and ``dict``. Tuples are read as lists.
+    """
+
+    extension = '.msgpack'
+
+    def dumps(self, object_: Any) -> bytes:
+        """Implement ``dumps``."""
+        buffer = bytearray()
+        self._encode(object_, buffer)
+        return bytes(buffer)
+
+    def loads(self, data: bytes) -> Any:
+        """Implement ``loads``."""
+        try:
+            object_, index = self._decode(data, 0)
+        except (IndexError, struct.error) as e:
+            raise ValueError('Truncated MessagePack data') from e
+        if index != len(data):
+            raise ValueError('Extra data at offset %d' % index)
+        return object_
+
+    def _encode(self, object_: Any, buffer: bytearray):
+        """Append the encoding of an object to a buffer."""
+        if object_ is None:
+            buffer.append(0xC0)
+        elif object_ is True:
+            buffer.append(0xC3)
+        elif object_ is False:
+            buffer.append(0xC2)
+        elif isinstance(object_, int):
+            if 0 <= object_ < 0x80 or -0x20 <= object_ < 0:
+                buffer += struct.pack('>b' if object_ < 0 else '>B', object_)
+            elif -0x80000000 <= object_ < 0x80000000:
+                buffer += struct.pack('>Bi', 0xD2, object_)
+            elif -0x8000000000000000 <= object_ < 0x8000000000000000:
+                buffer += struct.pack('>Bq', 0xD3, object_)
+            elif 0 <= object_ < 0x10000000000000000:
+                buffer += struct.pack('>BQ', 0xCF, object_)
+            else:
+                raise ValueError('Integer out of range: %d' % object_)
+        elif isinstance(object_, float):
+            buffer += struct.pack('>Bd', 0xCB, object_)
+        elif isinstance(object_, str):
+            data = object_.encode('utf-8')
+            size = len(data)
+            if size < 0x20:
+                buffer.append(0xA0 | size)
+            elif size < 0x100:
+                buffer += struct.pack('>BB', 0xD9, size)
+            elif size < 0x10000:
+                buffer += struct.pack('>BH', 0xDA, size)
+            else:
+                buffer += struct.pack('>BI', 0xDB, size)
+            buffer += data
+        elif isinstance(object_, (list, tuple)):
+            self._encode_header(len(object_), 0x90, 0xDC, buffer)
+            for item in object_:
+                self._encode(item, buffer)
+        elif isinstance(object_, dict):
+            self._encode_header(len(object_), 0x80, 0xDE, buffer)
+            for key, value in object_.items():
+                self._encode(key, buffer)
+                self._encode(value, buffer)
+        else:
+            raise TypeError('Object of type %s is not serializable' % type(object_).__name__)
+
+    def _encode_header(self, size: int, fix: int, code: int, buffer: bytearray):
+        """Append the header of an array or a map to a buffer."""
+        if size < 0x10:
+            buffer.append(fix | size)
+        elif size < 0x10000:
+            buffer += struct.pack('>BH', code, size)
+        else:
+            buffer += struct.pack('>BI', code + 1, size)
+
+    def _decode(self, data: bytes, index: int) -> Tuple[Any, int]:
+        """Decode an object and return it with the index of the next one."""
+        code = data[index]
+        index += 1
+        if code < 0x80:
+            return code, index
+        if code >= 0xE0:
+            return code - 0x100, index
+        if code & 0xF0 == 0x90:
+            return self._decode_array(data, index, code & 0x0F)
+        if code & 0xF0 == 0x80:
+            return self._decode_map(data, index, code & 0x0F)
+        if code & 0xE0 == 0xA0:
+            return self._decode_str(data, index, code & 0x1F)
+        if code == 0xC0:
+            return None, index
+        if code == 0xC2:
+            return False, index
+        if code == 0xC3:
+            return True, index
+        format_ = _FORMATS.get(code)
+        if format_ is None:
+            raise ValueError('Unsupported MessagePack type 0x%02x at offset %d' % (code, index - 1))
+        kind, fmt = format_
+        (value,) = struct.unpack_from(fmt, data, index)
+        index += struct.calcsize(fmt)
+        if kind == 'str':
+            return self._decode_str(data, index, value)
+        if kind == 'array':
+            return self._decode_array(data, index, value)
+        if kind == 'map':
+            return self._decode_map(data, index, value)
+        return value, index
+
+    def _decode_str(self, data: bytes, index: int, size: int) -> Tuple[str, int]:
+        """Decode a string of a given size."""
+        if index + size > len(data):
+            raise IndexError('string out of range')
+        return data[index : index + size].decode('utf-8'), index + size
+
+    def _decode_array(self, data: bytes, index: int, size: int) -> Tuple[list, int]:
+        """Decode an array of a given size."""
+        items = []
+        for _ in range(size):
+            item, index = self._decode(data, index)
+            items.append(item)
+        return items, index
+
+    def _decode_map(self, data: bytes, index: int, size: int) -> Tuple[dict, int]:
+        """Decode a map of a given size."""
+        items = {}
+        for _ in range(size):
+            key, index = self._decode(data, index)
+            value, index = self._decode(data, index)
+            items[key] = value
+        return items, index
+
+
+# MessagePack types with a fixed-size header or value: code -> (kind, struct format)
+_FORMATS = {
+    0xCA: ('value', '>f'),
+    0xCB: ('value', '>d'),
+    0xCC: ('value', '>B'),
+    0xCD: ('value', '>H'),
+    0xCE: ('value', '>I'),
+    0xCF: ('value', '>Q'),
+    0xD0: ('value', '>b'),
+    0xD1: ('value', '>h'),
+    0xD2: ('value', '>i'),
+    0xD3: ('value', '>q'),
+    0xD9: ('str', '>B'),
+    0xDA: ('str', '>H'),
+    0xDB: ('str', '>I'),
+    0xDC: ('array', '>H'),
+    0xDD: ('array', '>I'),
+    0xDE: ('map', '>H'),
+    0xDF: ('map', '>I'),
+}
+
+
+# registry of the serializers
+serializers: Dict[str, Serializer] = {
+    # format expected by ALM Gateway
+    'json': JsonSerializer(indent=4, sort_keys=True),
+    'compact': JsonSerializer(separators=(',', ':')),
+    'msgpack': MsgPackSerializer(),
+}
+
+
+def register_serializer(name: str, serializer: Serializer):
+    """
+    Register a new serializer or replace an existing one.
+
+    Parameters
+    ----------
+    name : str
+        Name of the format.
+    serializer : Serializer
+        Instance of the serializer.
+    """
+    serializers[name] = serializer
+
+
+def get_serializer(name: str) -> Serializer:
+    """
+    Return the serializer registered for a format.
+
+    Parameters
+    ----------
+    name : str
+        Name of the format.
+
+    Returns
+    -------
+    Serializer
+
+    Raises
+    ------
+    KeyError
+        If the format is unknown.
+    """
+    return serializers[name]
@@ -30,12 +30,11 @@ the commands and validate the format of the exchanged files.
 """
 
 from pathlib import Path
-import shutil
 import sys
 
 from ansys.scade.pyalmgw.connector import Connector
 from ansys.scade.pyalmgw.documents import ReqProject, TraceabilityLink
-from ansys.scade.pyalmgw.utils import read_json
+from ansys.scade.pyalmgw.utils import copy_file, iter_json_array
 
 
 class StubProject(ReqProject):
@@ -45,14 +44,20 @@ class StubProject(ReqProject):
         """
         Merge the traceability deltas from a cache file (ALMGT).
 
-        The links are either created or deleted.
+        The links are either created or deleted. The deltas are read
+        one at a time, so that the memory does not depend on their number.
 
         Parameters
         ----------
         file : Path
             Input ALMGT file.
+
+        Raises
+        ------
+        JsonStreamError
+            The file is not a valid ALMGT file.
         """
-        deltas = read_json(file)
+        deltas = iter_json_array(file)
 
         # cache existing requirements
         requirements = {req.id: req for doc in self.documents for req in doc.iter_requirements()}
@@ -109,7 +114,7 @@ class StubConnector(Connector):
         if not local_stub.exists():
             print('initializing stub file:', local_stub)
             ref_stub = Path(__file__).parent / 'res' / 'stub.xml'
-            shutil.copyfile(ref_stub, local_stub)
+            copy_file(ref_stub, local_stub)
         return local_stub
 
     def on_settings(self, pid: int) -> int:
@@ -132,7 +137,7 @@ class StubConnector(Connector):
         """
         stub = self.get_stub_file()
         print('import %s (%d): using stub file %s' % (file, pid, stub))
-        shutil.copyfile(stub, file)
+        copy_file(stub, file)
         return 0
 
     def on_export(self, links: Path, pid: int) -> int:
@@ -150,11 +155,12 @@ class StubConnector(Connector):
         stub = self.get_stub_file()
         print('export %s (%d): using stub file %s' % (links, pid, stub))
         copy = stub.with_name(links.with_suffix('.stub' + links.suffix).name)
-        shutil.copyfile(links, copy)
-        doc = StubProject(stub)
-        doc.read()
-        doc.merge_links(links)
-        doc.write()
+        copy_file(links, copy)
+        with self.metrics.phase('merge'):
+            doc = StubProject(stub)
+            doc.read()
+            doc.merge_links(links)
+            doc.write()
         # 2. export the LLRs using default schemas depending on the project's nature
         self.export_llrs()
         return 1
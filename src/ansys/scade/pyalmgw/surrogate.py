@@ -0,0 +1,334 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides means to process the surrogate model files.
+
+A surrogate model is a tree of elements: the sections and the Contributing Elements,
+identified by their ``oid``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+from pathlib import Path
+from re import sub
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+from ansys.scade.pyalmgw.utils import atomic_write
+
+
+def iter_elements(
+    model: Dict[str, Any], parent: Optional[str] = None
+) -> Generator[Tuple[Optional[str], Dict[str, Any]], Any, Any]:
+    """
+    Iterate through the elements of a surrogate model, depth first.
+
+    Parameters
+    ----------
+    model : Dict[str, Any]
+        Surrogate model or element.
+    parent : str
+        Oid of the parent of the element, if any.
+
+    Yields
+    ------
+    Tuple[Optional[str], Dict[str, Any]]
+        Oid of the parent element and element.
+    """
+    for element in model.get('elements', []):
+        yield parent, element
+        yield from iter_elements(element, element.get('oid'))
+
+
+def index_elements(model: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Index the elements of a surrogate model by oid.
+
+    The entries do not contain the child elements but the oid of their parent,
+    stored in the ``parent`` attribute. When several elements have the same oid,
+    the first one is considered.
+
+    Parameters
+    ----------
+    model : Dict[str, Any]
+        Surrogate model.
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        Elements indexed by oid.
+    """
+    index = {}
+    for parent, element in iter_elements(model):
+        oid = element.get('oid')
+        if oid in index:
+            continue
+        entry = {name: value for name, value in element.items() if name != 'elements'}
+        entry['parent'] = parent
+        index[oid] = entry
+    return index
+
+
+def diff_models(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """
+    Return the differences between two surrogate models.
+
+    An element is changed when one of its attributes or its parent differs.
+
+    Parameters
+    ----------
+    previous : Dict[str, Any]
+        Previous surrogate model.
+    current : Dict[str, Any]
+        New surrogate model.
+
+    Returns
+    -------
+    Dict[str, List[Any]]
+        Delta with the following entries:
+
+        * ``added``: New elements, without their child elements.
+        * ``changed``: Modified elements, without their child elements.
+        * ``removed``: Oids of the deleted elements.
+    """
+    old_index = index_elements(previous)
+    new_index = index_elements(current)
+    added = [element for oid, element in new_index.items() if oid not in old_index]
+    changed = [
+        element
+        for oid, element in new_index.items()
+        if oid in old_index and old_index[oid] != element
+    ]
+    removed = [oid for oid in old_index if oid not in new_index]
+    return {'added': added, 'changed': changed, 'removed': removed}
+
+
+def is_empty_delta(delta: Dict[str, List[Any]]) -> bool:
+    """Return whether a delta, computed by ``diff_models``, does not contain any change."""
+    return not any(delta.values())
+
+
+# ---------------------------------------------------------------------------
+# shards
+# ---------------------------------------------------------------------------
+
+
+def get_shards_dir(path: Path) -> Path:
+    """Return the directory of the shards for a manifest file."""
+    return path.with_name(path.stem + '.shards')
+
+
+def _get_shard_name(element: Dict[str, Any], occurrence: int = 0) -> str:
+    """Return a stable and unique file name for a shard."""
+    # name may contain illegal characters
+    name = sub(r'[^\w.-]', '_', element.get('name', ''))[:40]
+    digest = hashlib.sha256(str(element.get('oid')).encode()).hexdigest()
+    # the oids are not unique when the schema allows duplicates
+    suffix = '_%d' % occurrence if occurrence else ''
+    return '{0}_{1}{2}.json'.format(name, digest[:12], suffix)
+
+
+def _iter_keyed(elements: List[Any]) -> Generator[Tuple[Tuple[Any, int], Any], Any, Any]:
+    """Iterate through elements with a unique key: their oid and their occurrence."""
+    occurrences: Dict[Any, int] = {}
+    for element in elements:
+        oid = element.get('oid')
+        occurrence = occurrences.get(oid, 0)
+        occurrences[oid] = occurrence + 1
+        yield (oid, occurrence), element
+
+
+def merge_elements(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge an element of a partial export into the same element of a previous export.
+
+    The attributes are the new ones. The child elements are matched by oid:
+    the matching ones are merged recursively, the other previous ones are kept,
+    and the other new ones are appended.
+    Thus, the elements deleted from the model are removed by a complete export only.
+
+    Parameters
+    ----------
+    old : Dict[str, Any]
+        Element of the previous export.
+    new : Dict[str, Any]
+        Element of the partial export.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Merged element.
+    """
+    element = {name: value for name, value in new.items() if name != 'elements'}
+    if 'elements' not in old and 'elements' not in new:
+        return element
+    new_children = dict(_iter_keyed(new.get('elements', [])))
+    children = []
+    for key, child in _iter_keyed(old.get('elements', [])):
+        new_child = new_children.pop(key, None)
+        children.append(merge_elements(child, new_child) if new_child is not None else child)
+    children.extend(new_children.values())
+    element['elements'] = children
+    return element
+
+
+def _hash_element(element: Dict[str, Any]) -> str:
+    """Return the digest of an element and its sub-elements."""
+    # compact serialization, without indentation, uses the C encoder
+    text = json.dumps(element, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _write_shard(element: Dict[str, Any], path: Path):
+    """Write a shard."""
+    with atomic_write(path) as f:
+        json.dump(element, f, indent=4, sort_keys=True)
+
+
+def write_shards(
+    model: Dict[str, Any], path: Path, update: bool = False, max_workers: Optional[int] = None
+) -> List[Path]:
+    """
+    Write a surrogate model as a manifest file and one file per top-level element.
+
+    The top-level elements are the children of the top-level sections, for example
+    the sections of the operators for the SCADE Suite default schema.
+    The shards are stored in a directory next to the manifest. The manifest
+    records the digest of each top-level element and its sub-elements: only
+    the shards whose digest changes are serialized and written, concurrently.
+
+    Parameters
+    ----------
+    model : Dict[str, Any]
+        Surrogate model.
+    path : Path
+        Path of the manifest file.
+    update : bool
+        Whether the model is a partial export. The top-level elements are merged
+        into the ones of the previous export, cf. ``merge_elements``, and the shards
+        of the previous export not present in the model are kept. Otherwise,
+        the shards are replaced and the obsolete ones are deleted.
+    max_workers : Optional[int]
+        Maximum number of threads for writing the shards, default ``ThreadPoolExecutor``'s one.
+
+    Returns
+    -------
+    List[Path]
+        Written shards.
+    """
+    directory = get_shards_dir(path)
+    directory.mkdir(exist_ok=True)
+    previous = read_manifest(path) if path.exists() else {}
+    old_sections = dict(_iter_keyed(previous.get('elements', [])))
+
+    modified = []
+    sections = []
+    for key, element in _iter_keyed(model.get('elements', [])):
+        section = {name: value for name, value in element.items() if name != 'elements'}
+        old_shards = old_sections.get(key, {}).get('shards', [])
+        old_index = {(shard['oid'], shard.get('occurrence', 0)): shard for shard in old_shards}
+        new_shards = {}
+        for (oid, occurrence), child in _iter_keyed(element.get('elements', [])):
+            old_shard = old_index.get((oid, occurrence), {})
+            file = old_shard.get('file') or _get_shard_name(child, occurrence)
+            if update and old_shard and (directory / file).exists():
+                with (directory / file).open() as f:
+                    child = merge_elements(json.load(f), child)
+            digest = _hash_element(child)
+            if digest != old_shard.get('sha256') or not (directory / file).exists():
+                modified.append((child, directory / file))
+            shard = {'oid': oid, 'name': child.get('name'), 'file': file, 'sha256': digest}
+            if occurrence:
+                shard['occurrence'] = occurrence
+            new_shards[(oid, occurrence)] = shard
+        if update:
+            # keep the previous shards not present in the partial model, in the same order
+            shards = [
+                new_shards.pop((shard['oid'], shard.get('occurrence', 0)), shard)
+                for shard in old_shards
+            ]
+            shards.extend(new_shards.values())
+        else:
+            shards = list(new_shards.values())
+        section['shards'] = shards
+        sections.append(section)
+
+    if update:
+        # keep the previous top-level sections not present in the partial model
+        keys = {key for key, _ in _iter_keyed(model.get('elements', []))}
+        sections.extend(section for key, section in old_sections.items() if key not in keys)
+    else:
+        # delete the obsolete shards
+        files = {shard['file'] for section in sections for shard in section['shards']}
+        for section in previous.get('elements', []):
+            for shard in section.get('shards', []):
+                if shard['file'] not in files and (directory / shard['file']).exists():
+                    (directory / shard['file']).unlink()
+
+    if modified:
+        # each shard has its own file
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # consume the results to raise the errors
+            list(executor.map(lambda item: _write_shard(*item), modified))
+
+    manifest = {name: value for name, value in model.items() if name != 'elements'}
+    manifest['elements'] = sections
+    with atomic_write(path) as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    return [file for _, file in modified]
+
+
+def read_manifest(path: Path) -> Dict[str, Any]:
+    """Return the content of a manifest file."""
+    with path.open() as f:
+        return json.load(f)
+
+
+def read_shards(path: Path) -> Dict[str, Any]:
+    """
+    Read a surrogate model written as a manifest file and shards.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the manifest file.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Surrogate model.
+    """
+    manifest = read_manifest(path)
+    directory = get_shards_dir(path)
+    model = {name: value for name, value in manifest.items() if name != 'elements'}
+    elements = []
+    for section in manifest.get('elements', []):
+        element = {name: value for name, value in section.items() if name != 'shards'}
+        children = []
+        for shard in section.get('shards', []):
+            with (directory / shard['file']).open() as f:
+                children.append(json.load(f))
+        element['elements'] = children
+        elements.append(element)
+    model['elements'] = elements
+    return model
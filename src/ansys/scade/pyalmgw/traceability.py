@@ -0,0 +1,273 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Provides traceability coverage metrics between requirements and a surrogate model.
+
+The requirements and the elements of the surrogate model are indexed once,
+then each traceability link is joined with both indexes, so that the
+computation is linear in the size of the inputs:
+
+* Uncovered requirements: requirements not linked to any element of the surrogate model.
+* Untraced elements: elements of the surrogate model not linked to any requirement.
+* Dangling links: links to a missing element or to a missing requirement.
+
+The results are produced as a stream of records, for example to a JSON lines file,
+with the statistics of each document and section.
+
+Usage::
+
+    python -m ansys.scade.pyalmgw.traceability <project>.xml <project>.llrs [-o <coverage>.jsonl]
+"""
+
+from argparse import ArgumentParser
+import json
+from pathlib import Path
+import sys
+from typing import Any, Dict, Generator, Iterable, Optional, Set, Tuple
+
+from ansys.scade.pyalmgw.documents import Container, ReqDocument, ReqProject, Requirement
+from ansys.scade.pyalmgw.log import get_logger, timed
+from ansys.scade.pyalmgw.reqindex import read_pathnames
+from ansys.scade.pyalmgw.utils import atomic_write
+
+_logger = get_logger(__name__)
+
+Record = Dict[str, Any]
+
+
+class Coverage:
+    """
+    Joins the traceability links of a requirements project with a surrogate model.
+
+    Parameters
+    ----------
+    project : ReqProject
+        Requirements and traceability links.
+    elements : Dict[str, str]
+        Pathnames of the elements of the surrogate model, indexed by OID,
+        for example from ``ansys.scade.pyalmgw.reqindex.read_pathnames``.
+    """
+
+    def __init__(self, project: ReqProject, elements: Dict[str, str]):
+        self.project = project
+        self.elements = elements
+        # requirements indexed by id: several documents may define the same id
+        self.requirements: Dict[str, Requirement] = {}
+        # identifiers of the requirements linked to an element of the surrogate model
+        self.covered: Set[str] = set()
+        # oids of the elements linked to a requirement
+        self.traced: Set[str] = set()
+        # links to a missing element or requirement
+        self.dangling: Dict[Tuple[str, str], str] = {}
+        # number of requirements and covered requirements, indexed by container
+        self.counts: Dict[int, Tuple[int, int]] = {}
+        self.joined = False
+
+    @timed()
+    def join(self):
+        """Index the requirements and join the traceability links."""
+        for document in self.project.documents:
+            for requirement in document.iter_requirements():
+                self.requirements.setdefault(requirement.id, requirement)
+        for link in self.project.traceability_links:
+            source = link.source
+            target = link.requirement.id if link.requirement else link.target
+            element = source in self.elements
+            requirement = target in self.requirements
+            if element and requirement:
+                self.covered.add(target)
+                self.traced.add(source)
+            elif not element:
+                self.dangling[(source, target)] = 'missing element'
+            else:
+                self.dangling[(source, target)] = 'missing requirement'
+        for document in self.project.documents:
+            self._count(document)
+        self.joined = True
+
+    def _count(self, container: Container) -> Tuple[int, int]:
+        """Compute the number of requirements and covered requirements of a container."""
+        total = 0
+        covered = 0
+        for requirement in container.requirements:
+            total += 1
+            covered += requirement.id in self.covered
+            # requirements may contain requirements
+            sub_total, sub_covered = self._count(requirement)
+            total += sub_total
+            covered += sub_covered
+        for section in container.sections:
+            sub_total, sub_covered = self._count(section)
+            total += sub_total
+            covered += sub_covered
+        self.counts[id(container)] = (total, covered)
+        return total, covered
+
+    def iter_records(self) -> Generator[Record, None, None]:
+        """
+        Iterate through the results.
+
+        The records have a ``type`` entry, one of:
+
+        * ``document``, ``section``: Number of requirements, covered requirements and ratio.
+        * ``uncovered``: Requirement not linked to an element of the surrogate model.
+        * ``untraced``: Element of the surrogate model not linked to a requirement.
+        * ``dangling``: Link to a missing element or requirement.
+        * ``summary``: Totals, last record.
+
+        Yields
+        ------
+        Record
+        """
+        if not self.joined:
+            self.join()
+        for document in self.project.documents:
+            yield self._get_stats(document, 'document', document=document.text)
+            yield from self._iter_container(document, document)
+        for oid, pathname in self.elements.items():
+            if oid not in self.traced:
+                yield {'type': 'untraced', 'oid': oid, 'pathname': pathname}
+        for (source, target), reason in self.dangling.items():
+            yield {'type': 'dangling', 'source': source, 'target': target, 'reason': reason}
+        total = len(self.requirements)
+        yield {
+            'type': 'summary',
+            'requirements': total,
+            'covered': len(self.covered),
+            'ratio': _ratio(len(self.covered), total),
+            'elements': len(self.elements),
+            'traced': len(self.traced),
+            'links': len(self.project.traceability_links),
+            'dangling': len(self.dangling),
+        }
+
+    def _iter_container(
+        self, container: Container, document: ReqDocument
+    ) -> Generator[Record, None, None]:
+        """Iterate through the results of the content of a container, depth first."""
+        for requirement in container.requirements:
+            if requirement.id not in self.covered:
+                yield {
+                    'type': 'uncovered',
+                    'document': document.text,
+                    'id': requirement.id,
+                    'text': requirement.text,
+                }
+            yield from self._iter_container(requirement, document)
+        for section in container.sections:
+            yield self._get_stats(
+                section,
+                'section',
+                document=document.text,
+                number=section.number,
+                title=section.title,
+                level=section.level,
+            )
+            yield from self._iter_container(section, document)
+
+    def _get_stats(self, container: Container, type_: str, **attributes) -> Record:
+        """Return the statistics record of a container."""
+        total, covered = self.counts.get(id(container), (0, 0))
+        record = {'type': type_}
+        record.update(attributes)
+        record.update(requirements=total, covered=covered, ratio=_ratio(covered, total))
+        return record
+
+
+def _ratio(count: int, total: int) -> float:
+    """Return a ratio, 1 when total is 0."""
+    return count / total if total else 1.0
+
+
+def compute_coverage(req_file: Path, llrs: Path) -> Coverage:
+    """
+    Compute the coverage from a requirements file and a surrogate model.
+
+    Parameters
+    ----------
+    req_file : Path
+        Requirements file, produced by the ``import`` command.
+    llrs : Path
+        Surrogate model, produced by the ``export`` command.
+
+    Returns
+    -------
+    Coverage
+    """
+    project = ReqProject(req_file)
+    project.read()
+    coverage = Coverage(project, read_pathnames(llrs))
+    coverage.join()
+    return coverage
+
+
+@timed()
+def write_records(records: Iterable[Record], path: Path) -> Optional[Record]:
+    """
+    Write records to a JSON lines file, one at a time.
+
+    Parameters
+    ----------
+    records : Iterable[Record]
+        Records to write.
+    path : Path
+        Path of the output file.
+
+    Returns
+    -------
+    Optional[Record]
+        Last record, if any.
+    """
+    record = None
+    with atomic_write(path, encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record))
+            f.write('\n')
+    return record
+
+
+def main(args=None) -> int:
+    """Compute the traceability coverage of a requirements file and a surrogate model."""
+    parser = ArgumentParser(description='Traceability coverage')
+    parser.add_argument('requirements', help='requirements file')
+    parser.add_argument('llrs', help='surrogate model')
+    parser.add_argument('-o', '--output', help='output file, JSON lines')
+    options = parser.parse_args(args)
+
+    coverage = compute_coverage(Path(options.requirements), Path(options.llrs))
+    records = coverage.iter_records()
+    if options.output:
+        summary = write_records(records, Path(options.output))
+    else:
+        for summary in records:
+            if summary['type'] in {'document', 'uncovered', 'dangling'}:
+                print(json.dumps(summary))
+    print(
+        '%(covered)d/%(requirements)d requirements covered, '
+        '%(traced)d/%(elements)d elements traced, %(dangling)d dangling links' % summary
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -22,25 +22,47 @@
 
 """Adds logs."""
 
+from contextlib import contextmanager
 import json
+import os
 from pathlib import Path
-from typing import Any
+import shutil
+import stat
+from typing import IO, Any, Generator, Optional, Tuple
 
-# debug
+from ansys.scade.pyalmgw.log import get_logger
+
+_logger = get_logger(__name__)
+
+# default size of the chunks read by iter_json_array, in characters
+CHUNK_SIZE = 64 * 1024
+# characters that can continue a number
+_NUMBER_CHARS = frozenset('+-.0123456789eE')
+# maximum length of an incomplete token at the end of a buffer, for example \u00e
+_TOKEN_LENGTH = 6
+
+# debug: DEBUG level for the diagnostics, and copies of the exchanged files
 traceon = False
 
+# size of the buffers for writing files, in bytes: can be increased for network drives
+buffer_size = 1024 * 1024
+
 
 def traceln(text: str):
     """
-    Log test on the standard output.
+    Log a text with the ``DEBUG`` level.
+
+    This function is kept for compatibility: the package uses
+    the loggers of ``ansys.scade.pyalmgw.log``. Setting ``traceon``
+    sets the level of the connectors' diagnostics to ``DEBUG``,
+    cf. :meth:`Connector.main <ansys.scade.pyalmgw.connector.Connector.main>`.
 
     Parameters
     ----------
     text : string
         Text to log.
     """
-    if traceon:
-        print(text)
+    _logger.debug(text)
 
 
 def read_json(path: Path) -> Any:
@@ -62,12 +84,235 @@ def read_json(path: Path) -> Any:
         # shutil.copyfile(file, "c:/temp/json.txt")
         pass
     try:
-        return json.load(path.open())
+        with path.open() as f:
+            return json.load(f)
     except (OSError, json.JSONDecodeError) as e:
-        print(str(e))
+        _logger.error(str(e))
         return None
 
 
+@contextmanager
+def atomic_write(
+    path: Path, mode: str = 'w', encoding: Optional[str] = None, buffering: Optional[int] = None
+) -> Generator[IO, None, None]:
+    """
+    Open a file for writing so that it is either completely written or not modified.
+
+    The content is written to a temporary file in the same directory, which
+    replaces the target file once flushed to the disk. The temporary file is
+    removed if an exception occurs.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the output file.
+    mode : str
+        Either ``w`` or ``wb``.
+    encoding : str
+        Encoding of the file, for the text mode.
+    buffering : int
+        Size of the buffer, or ``utils.buffer_size`` when None.
+
+    Yields
+    ------
+    IO
+        File object opened on the temporary file.
+    """
+    size = buffering if buffering is not None else buffer_size
+    fd, tmp = _create_temporary(path)
+    try:
+        f = os.fdopen(fd, mode, buffering=size, encoding=encoding)
+    except BaseException:
+        os.close(fd)
+        tmp.unlink()
+        raise
+    try:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+        if path.exists():
+            # keep the permissions of the replaced file
+            tmp.chmod(stat.S_IMODE(path.stat().st_mode))
+        tmp.replace(path)
+    except BaseException:
+        f.close()
+        if tmp.exists():
+            tmp.unlink()
+        raise
+
+
+def _create_temporary(path: Path) -> Tuple[int, Path]:
+    """Create a temporary file next to a file, with the default permissions of a new file."""
+    # unlike mkstemp, the permissions are the ones of a new file, according to the umask
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        # unique name, so that concurrent writers of the same file do not share it
+        tmp = path.with_name('.%s%s.tmp' % (path.name, os.urandom(6).hex()))
+        try:
+            return os.open(str(tmp), flags, 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def copy_file(src: Path, dst: Path, buffering: Optional[int] = None):
+    """
+    Copy a file with ``atomic_write``.
+
+    Parameters
+    ----------
+    src : Path
+        Path of the input file.
+    dst : Path
+        Path of the output file.
+    buffering : int
+        Size of the buffer, or ``utils.buffer_size`` when None.
+    """
+    size = buffering if buffering is not None else buffer_size
+    with Path(src).open('rb') as fsrc, atomic_write(Path(dst), 'wb', buffering=size) as fdst:
+        shutil.copyfileobj(fsrc, fdst, size)
+
+
+class JsonStreamError(json.JSONDecodeError):
+    """
+    Error raised by ``iter_json_array``.
+
+    The position, line and column are relative to the beginning of the file.
+    """
+
+    def __init__(self, msg: str, path: Path, pos: int, lineno: int, colno: int):
+        # do not call JSONDecodeError.__init__, that requires the whole document
+        ValueError.__init__(
+            self, '%s: %s: line %d column %d (char %d)' % (path, msg, lineno, colno, pos)
+        )
+        self.msg = msg
+        self.doc = ''
+        self.path = path
+        self.pos = pos
+        self.lineno = lineno
+        self.colno = colno
+
+
+def iter_json_array(path: Path, chunk_size: int = CHUNK_SIZE) -> Generator[Any, None, None]:
+    """
+    Iterate over the elements of a ``json`` file containing an array.
+
+    The file is read by chunks so that the memory does not depend on the
+    number of elements, for example the traceability deltas (ALMGT) of
+    a large project. The file is closed when the iteration completes,
+    fails or is interrupted.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the input file.
+    chunk_size : int
+        Number of characters read at once.
+
+    Yields
+    ------
+    Any
+        Elements of the array.
+
+    Raises
+    ------
+    JsonStreamError
+        The file is not a valid ``json`` array.
+    OSError
+        The file can't be read.
+    """
+    decoder = json.JSONDecoder()
+    # buffer, starting at the absolute position offset in the file
+    buffer = ''
+    offset = 0
+    # number of lines and position of the last line in the discarded text
+    lines = 0
+    line_start = 0
+    eof = False
+
+    with path.open(encoding='utf-8') as f:
+
+        def error(msg: str, index: int) -> JsonStreamError:
+            pos = offset + index
+            lineno = lines + buffer.count('\n', 0, index) + 1
+            last = buffer.rfind('\n', 0, index)
+            colno = pos - (line_start if last == -1 else offset + last + 1) + 1
+            return JsonStreamError(msg, path, pos, lineno, colno)
+
+        def read(size: int = chunk_size) -> bool:
+            nonlocal buffer, eof
+            chunk = f.read(size)
+            if not chunk:
+                eof = True
+                return False
+            buffer += chunk
+            return True
+
+        def skip(index: int) -> int:
+            # index of the next non-whitespace character, or len(buffer) at the end of the file
+            while True:
+                while index < len(buffer) and buffer[index] in ' \t\n\r':
+                    index += 1
+                if index < len(buffer) or not read():
+                    return index
+
+        def discard(index: int):
+            # remove the parsed text from the buffer
+            nonlocal buffer, offset, lines, line_start
+            count = buffer.count('\n', 0, index)
+            if count:
+                lines += count
+                line_start = offset + buffer.rfind('\n', 0, index) + 1
+            buffer = buffer[index:]
+            offset += index
+
+        index = skip(0)
+        if index == len(buffer) or buffer[index] != '[':
+            raise error("Expecting '['", index)
+        index = skip(index + 1)
+        if index < len(buffer) and buffer[index] == ']':
+            # empty array
+            index += 1
+        else:
+            while True:
+                if index >= chunk_size:
+                    discard(index)
+                    index = 0
+                # decode the next element, with enough characters to make sure it is complete
+                while True:
+                    try:
+                        value, end = decoder.raw_decode(buffer, index)
+                    except json.JSONDecodeError as e:
+                        # read more text only when the element is truncated,
+                        # doubling the size for large elements to avoid quadratic copies
+                        truncated = e.msg.startswith('Unterminated string') or (
+                            e.pos >= len(buffer) - _TOKEN_LENGTH
+                        )
+                        if truncated and not eof and read(max(chunk_size, len(buffer) - index)):
+                            continue
+                        raise error(e.msg, e.pos) from None
+                    # a number may be truncated, for example 1.5 instead of 1.5e3
+                    last = end
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        while last < len(buffer) and buffer[last] in _NUMBER_CHARS:
+                            last += 1
+                    if last < len(buffer) or eof or not read():
+                        break
+                yield value
+                index = skip(end)
+                if index == len(buffer):
+                    raise error("Expecting ',' delimiter", index)
+                if buffer[index] == ']':
+                    index += 1
+                    break
+                if buffer[index] != ',':
+                    raise error("Expecting ',' delimiter", index)
+                index = skip(index + 1)
+        index = skip(index)
+        if index < len(buffer):
+            raise error('Extra data', index)
+
+
 def write_json(object_: object, path: Path) -> bool:
     r"""
     Write an object to a ``json`` file.
@@ -84,9 +329,9 @@ def write_json(object_: object, path: Path) -> bool:
         # shutil.copyfile(file, "c:/temp/json.txt")
         pass
     try:
-        with path.open('w') as f:
+        with atomic_write(path) as f:
             json.dump(object_, f, indent=4, sort_keys=True)
         return True
     except (OSError, json.JSONDecodeError) as e:
-        print(str(e))
+        _logger.error(str(e))
         return False
@@ -0,0 +1,260 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from ansys.scade.pyalmgw.async_connector import AsyncConnector, fetch_documents
+from ansys.scade.pyalmgw.client import HttpClient, HttpError
+from ansys.scade.pyalmgw.documents import ReqDocument, ReqProject, Requirement
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # keep-alive
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, content=None, headers=None):
+        body = json.dumps(content).encode('utf-8') if content is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        server = self.server
+        with server.lock:
+            server.hits[parts.path] = server.hits.get(parts.path, 0) + 1
+            hits = server.hits[parts.path]
+        if parts.path.startswith('/api/docs/'):
+            self._reply(200, {'name': parts.path.split('/')[-1]})
+        elif parts.path == '/api/items':
+            page = int(query.get('page', ['1'])[0])
+            next = 'items?page=%d' % (page + 1) if page < 3 else None
+            self._reply(200, {'items': [page * 10 + _ for _ in range(2)], 'next': next})
+        elif parts.path == '/api/flaky':
+            if hits <= 2:
+                self._reply(503, headers={'Retry-After': '0'})
+            else:
+                self._reply(200, {'hits': hits})
+        else:
+            self._reply(404)
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        content = json.loads(self.rfile.read(length))
+        server = self.server
+        with server.lock:
+            server.hits['POST'] = server.hits.get('POST', 0) + 1
+        self._reply(201, {'echo': content, 'token': self.headers.get('Authorization')})
+        if self.path.endswith('/close'):
+            # the connection is closed without notifying the client
+            self.close_connection = True
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server, **kwargs) -> HttpClient:
+    return HttpClient('http://127.0.0.1:%d/api' % server.server_address[1], **kwargs)
+
+
+def test_client_get_json(server):
+    async def run():
+        async with _client(server, max_connections=4) as client:
+            contents = await asyncio.gather(*(client.get_json('docs/%d' % i) for i in range(20)))
+            return contents, client
+
+    contents, client = asyncio.run(run())
+    assert [_['name'] for _ in contents] == [str(i) for i in range(20)]
+    assert client.requests == 20
+    # keep-alive: no more connections than concurrent requests
+    assert client.connections <= 4
+
+
+def test_client_post(server):
+    async def run():
+        async with _client(server, headers={'Authorization': 'Bearer x'}) as client:
+            response = await client.post('echo', {'id': 'REQ_1'})
+            return response
+
+    response = asyncio.run(run())
+    assert response.status == 201
+    assert response.json() == {'echo': {'id': 'REQ_1'}, 'token': 'Bearer x'}
+
+
+def test_client_stale_connection(server):
+    async def run():
+        async with _client(server, max_connections=1) as client:
+            await client.post('close', {'id': 'REQ_1'})
+            # the kept-alive connection has been closed by the server
+            response = await client.post('echo', {'id': 'REQ_2'})
+            return response, client
+
+    response, client = asyncio.run(run())
+    assert response.json()['echo'] == {'id': 'REQ_2'}
+    assert client.connections == 2
+    # the requests are received once
+    assert server.hits['POST'] == 2
+
+
+def test_client_paginate(server):
+    async def run():
+        async with _client(server) as client:
+            return [_ async for _ in client.paginate('items')]
+
+    assert asyncio.run(run()) == [10, 11, 20, 21, 30, 31]
+
+
+def test_client_retry(server):
+    async def run(retries: int):
+        async with _client(server, retries=retries, backoff=0.01) as client:
+            return await client.get_json('flaky')
+
+    assert asyncio.run(run(3)) == {'hits': 3}
+    server.hits.clear()
+    with pytest.raises(HttpError) as info:
+        asyncio.run(run(1))
+    assert info.value.status == 503
+
+
+def test_client_errors(server):
+    async def run():
+        async with _client(server) as client:
+            response = await client.get('unknown', check=False)
+            assert response.status == 404
+            await client.get('unknown')
+
+    with pytest.raises(HttpError) as info:
+        asyncio.run(run())
+    assert info.value.status == 404
+    assert server.hits['/api/unknown'] == 2
+
+
+def test_client_connection_refused(server):
+    port = server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+    async def run():
+        client = HttpClient('http://127.0.0.1:%d' % port, retries=1, backoff=0.01)
+        try:
+            await client.get('docs/1')
+        finally:
+            client.close()
+
+    with pytest.raises(OSError):
+        asyncio.run(run())
+
+
+def test_client_get_url():
+    client = HttpClient('https://alm.example.com/api')
+    assert client.get_url('docs/1') == 'https://alm.example.com/api/docs/1'
+    assert client.get_url('docs', {'page': 2}) == 'https://alm.example.com/api/docs?page=2'
+    assert client.get_url('/v2/docs?a=1', {'b': 2}) == 'https://alm.example.com/v2/docs?a=1&b=2'
+    client.close()
+
+
+class DocConnector(AsyncConnector):
+    __test__ = False
+
+    def __init__(self, server):
+        super().__init__('doc')
+        self.server = server
+        self.clients = []
+        self.documents = []
+
+    def create_client(self) -> HttpClient:
+        client = _client(self.server)
+        self.clients.append(client)
+        return client
+
+    def on_settings(self, pid: int) -> int:
+        return 0
+
+    async def on_import(self, file: Path, pid: int) -> int:
+        def build(document: ReqDocument, content):
+            document.text = content['name']
+            Requirement(document, 'REQ_' + content['name'], 'text')
+
+        project = ReqProject(file)
+        urls = ['docs/%d' % i for i in range(10)]
+        self.documents = await fetch_documents(self.client, project, urls, build)
+        return 0
+
+    def on_export(self, links: Path, pid: int) -> int:
+        return 0
+
+    async def on_manage(self, pid: int) -> int:
+        response = await self.client.get('unknown', check=False)
+        return 1 if response.status == 404 else 0
+
+    def on_locate(self, req: str, pid: int) -> int:
+        return 0
+
+
+def test_async_connector(server, local_tmpdir):
+    connector = DocConnector(server)
+    assert connector.execute('settings', '42') == 0
+    # synchronous command: no client
+    assert connector.clients == []
+    req_file = Path(local_tmpdir) / 'async_connector.xml'
+    assert connector.execute('import', str(req_file), '42') == 0
+    # order of the URLs
+    assert [_.text for _ in connector.documents] == [str(i) for i in range(10)]
+    assert connector.documents[0].requirements[0].id == 'REQ_0'
+    assert connector.execute('manage', '42') == 1
+    # one client per command
+    assert len(connector.clients) == 2
+
+
+def test_async_connector_batch(server, local_tmpdir):
+    connector = DocConnector(server)
+    req_file = Path(local_tmpdir) / 'async_connector_batch.xml'
+    lines = ['-import "%s" 42' % req_file, '-manage 42', '-locate REQ_1 42']
+    results = connector.execute_batch(lines)
+    assert [_[1] for _ in results] == [0, 1, 0]
+    # one client for the batch
+    assert len(connector.clients) == 1
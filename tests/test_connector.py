@@ -21,15 +21,19 @@
 # SOFTWARE.
 
 import filecmp
+import os
 from pathlib import Path
 import subprocess
 import sys
+import time
+from types import SimpleNamespace
 from typing import List, Optional
 
 import pytest
 
 import ansys.scade.pyalmgw as pyalmgw
 import ansys.scade.pyalmgw.connector as cnt
+import ansys.scade.pyalmgw.daemon as daemon
 import ansys.scade.pyalmgw.llrs as llrs
 import ansys.scade.pyalmgw.utils as utils
 from conftest import load_project, load_project_session, std, suite
@@ -172,6 +176,209 @@ def test_execute_robustness():
     assert return_code == -1
 
 
+def test_execute_batch():
+    connector = TestExecuteConnector(7, 'ut', None)
+    lines = [
+        '# comment',
+        '-settings 5',
+        '',
+        '-locate "REQ 1" 4',
+        r'-import "c:\my dir\req.xml" 1',
+        'manage 3',
+        '-unknown 9',
+        '-locate 4',
+    ]
+    results = connector.execute_batch(lines)
+    assert [code for _, code in results] == [7, 7, 7, 7, -1, 3]
+    assert results[1][0] == ['-locate', 'REQ 1', '4']
+    assert connector.file == Path(r'c:\my dir\req.xml')
+    assert connector.req == 'REQ 1'
+
+
+def test_main_batch(local_tmpdir, capsys):
+    connector = TestExecuteConnector(0, 'ut', None)
+    commands = Path(local_tmpdir) / 'commands.txt'
+    commands.write_text('-locate REQ_1 1\n-locate REQ_2 1\n')
+    results = Path(local_tmpdir) / 'results.json'
+    assert connector.main_batch(str(commands), str(results)) == 0
+    assert utils.read_json(results) == [
+        {'args': ['-locate', 'REQ_1', '1'], 'code': 0},
+        {'args': ['-locate', 'REQ_2', '1'], 'code': 0},
+    ]
+    assert '0: -locate REQ_2 1' in capsys.readouterr().out
+    assert connector.main_batch(str(Path(local_tmpdir) / 'unknown.txt')) == 3
+
+
+class TestAsyncConnector(TestExecuteConnector):
+    __test__ = False
+
+    def __init__(self, directory: Path, error: bool = False):
+        # minimal project, with default values for the tool properties
+        project = SimpleNamespace(
+            pathname=str(directory / 'model.etp'),
+            get_bool_tool_prop_def=lambda tool, name, default, configuration: default,
+        )
+        super().__init__(0, 'ut', project)
+        self.error = error
+        self.delay = 0.0
+        self.phase_status = None
+        self.heartbeat_status = None
+
+    def get_llr_async(self) -> bool:
+        return True
+
+    def export_llrs(self):
+        if not self.background:
+            return super().export_llrs()
+        with self.metrics.phase('dump'):
+            self.phase_status = self.read_llrs_status()
+            time.sleep(self.delay)
+            self.heartbeat_status = self.read_llrs_status()
+            if self.error:
+                raise Exception('dump')
+        return self.get_llrs_file()
+
+
+def test_async_export(local_tmpdir, monkeypatch):
+    spawned = []
+    monkeypatch.setattr(daemon, 'spawn', lambda *args: spawned.append(args) or os.getpid())
+    connector = TestAsyncConnector(Path(local_tmpdir))
+    # no status
+    assert connector.wait_llrs() is None
+    assert connector.execute('status') == 0
+    # the export is delegated to a background process
+    assert connector.export_llrs() == connector.get_llrs_file()
+    assert spawned[0][1:] == (connector.project.pathname, 'llrs')
+    assert connector.read_llrs_status()['state'] == 'pending'
+    assert connector.read_llrs_status()['pid'] == os.getpid()
+    assert connector.execute('status') == 1
+    # execution of the background process
+    assert connector.execute('llrs') == 0
+    assert connector.phase_status['state'] == 'running'
+    assert connector.phase_status['phase'] == 'dump'
+    assert connector.wait_llrs()['state'] == 'done'
+    assert connector.execute('status') == 0
+    assert not connector.background
+
+
+def test_async_export_failure(local_tmpdir, capsys):
+    connector = TestAsyncConnector(Path(local_tmpdir), error=True)
+    assert connector.execute('llrs') == -1
+    status = connector.wait_llrs()
+    assert status['state'] == 'failed'
+    assert status['error'] == 'dump'
+    capsys.readouterr()
+    assert connector.execute('status') == -1
+    assert '"failed"' in capsys.readouterr().out
+
+
+def test_async_export_not_responding(local_tmpdir, caplog):
+    connector = TestAsyncConnector(Path(local_tmpdir))
+    updated = time.time() - cnt.STALE_TIMEOUT - 1
+    connector.write_llrs_status('running', pid=os.getpid(), updated=updated)
+    assert connector.wait_llrs()['state'] == 'running'
+    assert 'not responding' in caplog.text
+    # the status is updated regularly: the other commands wait for the export
+    caplog.clear()
+    connector.write_llrs_status('running', pid=os.getpid())
+    start = time.monotonic()
+    assert connector.wait_llrs(timeout=0.1)['state'] == 'running'
+    assert time.monotonic() - start < 5
+    assert 'timeout' in caplog.text
+
+
+def test_async_export_terminated(local_tmpdir, caplog):
+    connector = TestAsyncConnector(Path(local_tmpdir))
+    # the process has been killed
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    connector.write_llrs_status('running', pid=process.pid)
+    start = time.monotonic()
+    status = connector.wait_llrs()
+    assert time.monotonic() - start < 5
+    assert status['state'] == 'failed'
+    assert 'terminated' in status['error']
+    assert connector.read_llrs_status()['state'] == 'failed'
+
+
+def test_async_export_heartbeat(local_tmpdir, monkeypatch):
+    monkeypatch.setattr(cnt, 'HEARTBEAT_INTERVAL', 0.05)
+    connector = TestAsyncConnector(Path(local_tmpdir))
+    connector.delay = 0.5
+    assert connector.execute('llrs') == 0
+    # the status has been updated during the export
+    assert connector.heartbeat_status['updated'] > connector.phase_status['updated']
+    assert connector.heartbeat_status['phase'] == 'dump'
+    assert connector.read_llrs_status()['state'] == 'done'
+
+
+class _FakeExport:
+    def __init__(self):
+        self.model = {'elements': [{'oid': 'A', 'name': 'A'}]}
+        self.fail = False
+        self.dumps = 0
+
+    def read_schema(self, schema: Path):
+        pass
+
+    def dump_model(self, diagrams: bool = False) -> dict:
+        self.dumps += 1
+        return self.model
+
+    def write(self, llrs: dict, path: Path) -> bool:
+        return False if self.fail else utils.write_json(llrs, path)
+
+
+class TestIncrementalConnector(TestExecuteConnector):
+    __test__ = False
+
+    def __init__(self, directory: Path):
+        project = SimpleNamespace(
+            pathname=str(directory / 'model.etp'),
+            file_refs=[],
+            get_bool_tool_prop_def=lambda tool, name, default, configuration: default,
+        )
+        Path(project.pathname).write_text('<Project/>')
+        super().__init__(0, 'ut', project)
+        self.export_class = _FakeExport()
+        self.cache_export_class = True
+
+    def get_llr_incremental(self) -> bool:
+        return True
+
+    def get_llr_schema(self) -> Path:
+        return Path(self.project.pathname)
+
+
+def test_export_llrs_incremental(local_tmpdir):
+    directory = Path(local_tmpdir) / 'incremental'
+    directory.mkdir()
+    connector = TestIncrementalConnector(directory)
+    delta_file = connector.get_llrs_delta_file()
+    fingerprint_file = connector.get_llrs_fingerprint_file()
+    assert connector.export_llrs() == connector.get_llrs_file()
+    assert utils.read_json(delta_file)['added'][0]['oid'] == 'A'
+    # unchanged model, without ALM Gateway configuration file: the previous delta is obsolete
+    assert not Path(connector.project.pathname).with_suffix('.almgp').exists()
+    assert connector.export_llrs() == connector.get_llrs_file()
+    assert not delta_file.exists()
+    # the export is skipped
+    assert connector.export_class.dumps == 1
+
+    # the surrogate model can't be written: the fingerprint is not updated
+    fingerprint = fingerprint_file.read_text()
+    connector.export_class.model = {'elements': [{'oid': 'B', 'name': 'B'}]}
+    connector.export_class.fail = True
+    Path(connector.project.pathname).write_text('<Project>modified</Project>')
+    assert connector.export_llrs() is None
+    assert fingerprint_file.read_text() == fingerprint
+    # next export
+    connector.export_class.fail = False
+    assert connector.export_llrs() == connector.get_llrs_file()
+    assert fingerprint_file.read_text() != fingerprint
+    assert utils.read_json(delta_file)['removed'] == ['A']
+
+
 class TestLLRExport(llrs.LLRExport):
     __test__ = False
 
@@ -0,0 +1,199 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Optional
+
+import ansys.scade.pyalmgw as pyalmgw
+import ansys.scade.pyalmgw.connector as cnt
+import ansys.scade.pyalmgw.daemon as daemon
+
+
+class EchoConnector(cnt.Connector):
+    __test__ = False
+
+    def on_settings(self, pid: int) -> int:
+        print('settings', pid)
+        return 0
+
+    def on_import(self, file: Path, pid: int) -> int:
+        return 0
+
+    def on_export(self, links: Path, pid: int) -> int:
+        raise Exception('export')
+
+    def on_manage(self, pid: int) -> int:
+        return 1
+
+    def on_locate(self, req: str, pid: int) -> int:
+        return 0
+
+
+def _start(tmpdir: Path, idle_timeout: float = 30, files: Optional[List[Path]] = None):
+    project = tmpdir / 'model.etp'
+    project.write_text('<Project/>')
+    server_file = daemon.get_server_file(str(project), 'echo')
+    files = [project] + (files or [])
+    server = daemon.ConnectorServer(EchoConnector('echo'), server_file, files, idle_timeout)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    # wait for the server file
+    for _ in range(100):
+        if server_file.exists():
+            break
+        time.sleep(0.05)
+    return project, server_file, server, thread
+
+
+def _stop(project: Path, thread: threading.Thread):
+    # the server stops when the project is modified
+    project.write_text('<Project>modified</Project>')
+    assert daemon.forward('echo', ['-manage', str(project), '42']) is None
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_daemon_forward(local_tmpdir):
+    project, server_file, server, thread = _start(Path(local_tmpdir))
+    assert server.connector.cache_export_class
+    assert daemon.forward('echo', ['-settings', str(project), '42']) == 0
+    assert daemon.forward('echo', ['-manage', str(project), '42']) == 1
+    # exception
+    assert daemon.forward('echo', ['-export', str(project), 'links.json', '42']) == 3
+    # no server for other connectors
+    assert daemon.forward('other', ['-manage', str(project), '42']) is None
+    _stop(project, thread)
+    assert not server_file.exists()
+
+
+def test_daemon_output(local_tmpdir, capsys):
+    project, server_file, server, thread = _start(Path(local_tmpdir))
+    assert daemon.forward('echo', ['-settings', str(project), '42']) == 0
+    assert capsys.readouterr().out == 'settings 42\n'
+    _stop(project, thread)
+
+
+def test_daemon_token(local_tmpdir):
+    project, server_file, server, thread = _start(Path(local_tmpdir))
+    info = json.loads(server_file.read_text())
+    info['token'] = 'wrong'
+    server_file.write_text(json.dumps(info))
+    assert daemon.forward('echo', ['-manage', str(project), '42']) is None
+    info['token'] = server.token
+    server_file.write_text(json.dumps(info))
+    assert daemon.forward('echo', ['-manage', str(project), '42']) == 1
+    _stop(project, thread)
+
+
+def test_daemon_idle(local_tmpdir):
+    project, server_file, server, thread = _start(Path(local_tmpdir), idle_timeout=0)
+    thread.join(10)
+    assert not thread.is_alive()
+    assert not server_file.exists()
+    assert daemon.forward('echo', ['-manage', str(project), '42']) is None
+
+
+def test_daemon_lock(local_tmpdir):
+    lock_file = daemon.get_lock_file(str(Path(local_tmpdir) / 'model.etp'), 'echo')
+    assert daemon.acquire_lock(lock_file)
+    # held by a running process
+    assert not daemon.acquire_lock(lock_file)
+    daemon.release_lock(lock_file)
+    assert not lock_file.exists()
+
+    # stale lock
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    lock_file.write_text(str(process.pid))
+    assert daemon.acquire_lock(lock_file)
+    assert lock_file.read_text() == str(os.getpid())
+    daemon.release_lock(lock_file)
+
+    # unreadable lock: being written, then stale
+    lock_file.write_text('')
+    assert not daemon.acquire_lock(lock_file)
+    os.utime(str(lock_file), (0, 0))
+    assert daemon.acquire_lock(lock_file)
+    daemon.release_lock(lock_file)
+
+    # lock of another process
+    lock_file.write_text(str(process.pid))
+    daemon.release_lock(lock_file)
+    assert lock_file.exists()
+
+
+def test_daemon_replaced(local_tmpdir):
+    project, server_file, server, thread = _start(Path(local_tmpdir), idle_timeout=0.5)
+    # another server has replaced the server file
+    info = json.loads(server_file.read_text())
+    info['token'] = 'other'
+    server_file.write_text(json.dumps(info))
+    thread.join(10)
+    assert not thread.is_alive()
+    assert json.loads(server_file.read_text())['token'] == 'other'
+
+
+def test_daemon_missing_file(local_tmpdir):
+    directory = Path(local_tmpdir) / 'missing'
+    directory.mkdir()
+    # for example the ALM Gateway configuration file
+    missing = directory / 'model.almgp'
+    project, server_file, server, thread = _start(directory, files=[missing])
+    assert daemon.forward('echo', ['-manage', str(project), '42']) == 1
+    assert daemon.forward('echo', ['-manage', str(project), '42']) == 1
+    # the file is created: the model is outdated
+    missing.write_text('<almgp/>')
+    assert daemon.forward('echo', ['-manage', str(project), '42']) is None
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_daemon_try_forward(local_tmpdir, monkeypatch):
+    spawned = []
+    monkeypatch.setattr(daemon, 'spawn', lambda *args: spawned.append(args))
+    monkeypatch.setattr(daemon, '_attempts', set())
+    directory = Path(local_tmpdir) / 'try_forward'
+    directory.mkdir()
+    project = directory / 'model.etp'
+    args = ['-manage', str(project), '42']
+    # not enabled
+    monkeypatch.delenv(pyalmgw.DAEMON_VARIABLE, raising=False)
+    assert daemon.try_forward('echo', args) is None
+    monkeypatch.setenv(pyalmgw.DAEMON_VARIABLE, '1')
+    # local commands
+    assert daemon.try_forward('echo', ['-batch', str(project), '-']) is None
+    assert not spawned
+    # no server: a server is started once
+    assert daemon.try_forward('echo', args) is None
+    assert daemon.try_forward('echo', args) is None
+    assert [_[1] for _ in spawned] == [str(project)]
+    # server
+    project, server_file, server, thread = _start(directory)
+    args = ['-settings', str(project), '42']
+    assert daemon.try_forward('echo', args) == 0
+    _stop(project, thread)
@@ -0,0 +1,136 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from ansys.scade.pyalmgw.client import HttpClient, fetch_documents
+import ansys.scade.pyalmgw.doccache as doccache
+from ansys.scade.pyalmgw.documents import ReqDocument, ReqProject, Requirement, Section
+from ansys.scade.pyalmgw.mockalm import MockAlmServer, build_document
+
+
+def _document(project: ReqProject, name: str) -> ReqDocument:
+    document = ReqDocument(project, name + '.docx', name)
+    section = Section(document, '1', 'Introduction', 'first section')
+    Requirement(section, name + '_1', 'text 1', 'description 1')
+    Requirement(Section(section, '1.1', 'Details'), name + '_2', 'text 2')
+    Requirement(document, name + '_3', 'text 3')
+    return document
+
+
+def test_snapshot_restore():
+    document = _document(ReqProject(), 'DOC')
+    snapshot = doccache.snapshot_document(document)
+    project = ReqProject()
+    copy = doccache.restore_document(project, snapshot)
+    assert project.documents == [copy]
+    assert doccache.snapshot_document(copy) == snapshot
+    assert copy.identifier == 'DOC.docx'
+    assert copy.sections[0].description == 'first section'
+    assert [_.id for _ in copy.iter_requirements()] == ['DOC_3', 'DOC_1', 'DOC_2']
+
+
+def test_cache_persistence(local_tmpdir):
+    directory = Path(local_tmpdir) / 'doccache_persistence'
+    cache = doccache.DocumentCache(directory)
+    cache.store('docs/a', _document(ReqProject(), 'A'), etag='"a1"')
+    # no validators: not cached
+    cache.store('docs/b', _document(ReqProject(), 'B'))
+    cache.save()
+
+    cache = doccache.DocumentCache(directory)
+    assert list(cache.entries) == ['docs/a']
+    assert cache.get_entry('docs/a').get_conditional_headers() == {'If-None-Match': '"a1"'}
+    project = ReqProject()
+    assert cache.load('docs/a', project).text == 'A'
+    assert cache.load('docs/b', project) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_eviction(local_tmpdir):
+    directory = Path(local_tmpdir) / 'doccache_eviction'
+    cache = doccache.DocumentCache(directory)
+    for name in 'ABC':
+        cache.store(name, _document(ReqProject(), name), revision='1')
+    size = cache.get_entry('A').size
+    # room for two documents
+    cache.max_bytes = 2 * size
+    # A is the most recently used
+    cache.load('A', ReqProject())
+    cache.store('D', _document(ReqProject(), 'D'), revision='1')
+    assert sorted(cache.entries) == ['A', 'D']
+    assert len(list(directory.glob('*.json'))) == 2
+    assert cache.is_current('A', '1')
+    assert not cache.is_current('A', '2')
+
+
+@pytest.fixture
+def server():
+    server = MockAlmServer(documents=4, depth=2, sections=2, requirements=2)
+    server.start()
+    yield server
+    server.stop()
+
+
+def _fetch(server: MockAlmServer, cache: doccache.DocumentCache, revisions: bool = False):
+    async def run():
+        async with HttpClient(server.url) as client:
+            items = [_ async for _ in client.paginate('documents')]
+            urls = [_['url'] for _ in items]
+            revisions_ = {_['url']: _['revision'] for _ in items} if revisions else None
+            project = ReqProject()
+            return await fetch_documents(client, project, urls, build_document, cache, revisions_)
+
+    documents = asyncio.run(run())
+    cache.save()
+    return documents
+
+
+def test_fetch_documents_cache(server, local_tmpdir):
+    directory = Path(local_tmpdir) / 'doccache_fetch'
+    cache = doccache.DocumentCache(directory)
+    documents = _fetch(server, cache)
+    assert [_.identifier for _ in documents] == ['DOC_1', 'DOC_2', 'DOC_3', 'DOC_4']
+    assert (cache.hits, cache.misses) == (0, 0)
+    reference = [doccache.snapshot_document(_) for _ in documents]
+
+    # conditional requests, all documents unchanged
+    cache = doccache.DocumentCache(directory)
+    server.modify_document('DOC_2')
+    documents = _fetch(server, cache)
+    assert cache.hits == 3
+    assert documents[1].text == 'Document 2 (2)'
+    assert [doccache.snapshot_document(_) for _ in documents[2:]] == reference[2:]
+    # 2 * (1 page + 4 documents)
+    assert server.stats['requests'] == 10
+
+    # known revisions: no requests for the documents
+    cache = doccache.DocumentCache(directory)
+    documents = _fetch(server, cache, revisions=True)
+    # the documents were cached without revision: conditional requests
+    assert server.stats['requests'] == 15
+    documents = _fetch(server, cache, revisions=True)
+    assert server.stats['requests'] == 16
+    assert documents[1].text == 'Document 2 (2)'
@@ -0,0 +1,126 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+
+import ansys.scade.pyalmgw.fingerprint as fp
+
+
+def _create_files(directory, *names):
+    directory.mkdir(exist_ok=True)
+    files = []
+    for name in names:
+        path = directory / name
+        path.write_text(name)
+        files.append(path)
+    return files
+
+
+def test_fingerprint_nominal(local_tmpdir):
+    files = _create_files(local_tmpdir / 'fingerprint_nominal', 'a.xscade', 'b.xscade')
+    options = {'diagrams': False}
+    first = fp.compute_fingerprint(files, options)
+    assert all(_['sha256'] for _ in first['files'].values())
+    second = fp.compute_fingerprint(files, options, first)
+    assert fp.same_fingerprint(first, second)
+    # different options
+    third = fp.compute_fingerprint(files, {'diagrams': True}, first)
+    assert not fp.same_fingerprint(first, third)
+    # different set of files
+    fourth = fp.compute_fingerprint(files[:1], options, first)
+    assert not fp.same_fingerprint(first, fourth)
+
+
+def test_fingerprint_modified(local_tmpdir):
+    files = _create_files(local_tmpdir / 'fingerprint_modified', 'a.xscade', 'b.xscade')
+    options = {}
+    first = fp.compute_fingerprint(files, options)
+    # touch: same content
+    stat = files[0].stat()
+    os.utime(files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    second = fp.compute_fingerprint(files, options, first)
+    assert fp.same_fingerprint(first, second)
+    # new content
+    files[1].write_text('modified')
+    third = fp.compute_fingerprint(files, options, second)
+    assert not fp.same_fingerprint(second, third)
+
+
+def test_fingerprint_robustness(local_tmpdir):
+    missing = local_tmpdir / 'fingerprint_missing.xscade'
+    fingerprint = fp.compute_fingerprint([missing], {})
+    assert fingerprint['files'][missing.as_posix()]['size'] == -1
+    assert not fp.same_fingerprint(None, fingerprint)
+
+
+def test_fingerprint_missing(local_tmpdir):
+    files = _create_files(local_tmpdir / 'fingerprint_missing', 'a.xscade')
+    files.append(local_tmpdir / 'fingerprint_missing' / 'model.almgp')
+    first = fp.compute_fingerprint(files, {})
+    # the file is still missing
+    second = fp.compute_fingerprint(files, {}, first)
+    assert fp.same_fingerprint(first, second)
+    # the file is created
+    files[1].write_text('almgp')
+    third = fp.compute_fingerprint(files, {}, second)
+    assert not fp.same_fingerprint(second, third)
+    # and removed
+    files[1].unlink()
+    assert not fp.same_fingerprint(third, fp.compute_fingerprint(files, {}, third))
+
+
+def test_get_project_files(local_tmpdir):
+    directory = local_tmpdir / 'fingerprint_projects'
+    (directory / 'lib').mkdir(parents=True, exist_ok=True)
+    main = directory / 'main.etp'
+    main.write_text(
+        '<Project><roots><FileRef persistAs="a.xscade"/>'
+        '<FileRef persistAs="lib/lib.etp"/></roots></Project>'
+    )
+    # the library references the main project: cycle
+    (directory / 'lib' / 'lib.etp').write_text(
+        '<Project xmlns="http://www.esterel-technologies.com/ns/scade/pxml/2">'
+        '<FileRef persistAs="b.xscade"/><FileRef persistAs="../main.etp"/></Project>'
+    )
+    files = fp.get_project_files(main)
+    assert files == [
+        directory / 'a.xscade',
+        directory / 'lib' / 'lib.etp',
+        directory / 'lib' / 'b.xscade',
+        directory / 'lib' / '..' / 'main.etp',
+    ]
+    # not a project file
+    assert fp.get_project_files(directory / 'unknown.etp') == []
+
+
+def test_get_project_files_macros(local_tmpdir, monkeypatch):
+    directory = local_tmpdir / 'fingerprint_macros'
+    directory.mkdir(parents=True, exist_ok=True)
+    main = directory / 'main.etp'
+    main.write_text(
+        '<Project><FileRef persistAs="$(PYALMGW_LIB)/lib.xscade"/>'
+        '<FileRef persistAs="$(PYALMGW_UNDEFINED)/lib.xscade"/></Project>'
+    )
+    monkeypatch.setenv('PYALMGW_LIB', str(directory / 'lib'))
+    monkeypatch.delenv('PYALMGW_UNDEFINED', raising=False)
+    # the files with undefined macros are ignored
+    assert fp.get_project_files(main) == [directory / 'lib' / 'lib.xscade']
@@ -0,0 +1,81 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import subprocess
+import sys
+from typing import Set
+
+# modules that the connectors must not load at startup
+_LAZY_MODULES = {
+    'ansys.scade.pyalmgw.daemon',
+    'ansys.scade.pyalmgw.fingerprint',
+    'ansys.scade.pyalmgw.llrs',
+    'ansys.scade.pyalmgw.reqindex',
+    'ansys.scade.pyalmgw.surrogate',
+    'importlib.metadata',
+    'scade.model.display',
+    'scade.model.suite',
+    'scade.model.testenv',
+}
+# heavy modules, not needed for most of the commands
+_HEAVY_MODULES = {
+    'concurrent.futures',
+    'http.client',
+    'lxml',
+    'mmap',
+    'urllib.request',
+}
+
+
+def _imported_modules(module: str) -> Set[str]:
+    """Return the modules loaded by a module, in a new interpreter."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(sys.path)
+    code = 'import sys\nimport {0}\nprint("\\n".join(sys.modules))'.format(module)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env)
+    assert result.returncode == 0, result.stderr
+    return set(result.stdout.split())
+
+
+def test_connector_imports():
+    modules = _imported_modules('ansys.scade.pyalmgw.connector')
+    assert 'ansys.scade.pyalmgw.connector' in modules
+    assert not _LAZY_MODULES & modules
+    assert not _HEAVY_MODULES & modules
+
+
+def test_mockalm_imports():
+    # the mock server and the HTTP client run without SCADE
+    modules = _imported_modules('ansys.scade.pyalmgw.mockalm')
+    assert 'ansys.scade.pyalmgw.mockalm' in modules
+    assert 'ansys.scade.pyalmgw.connector' not in modules
+    assert not any(name.split('.')[0] == 'scade' for name in modules)
+
+
+def test_daemon_imports():
+    # the entry points try the server before loading the connector
+    modules = _imported_modules('ansys.scade.pyalmgw.daemon')
+    assert 'ansys.scade.pyalmgw.daemon' in modules
+    assert 'ansys.scade.pyalmgw.connector' not in modules
+    assert 'ansys.scade.apitools' not in modules
+    assert not _HEAVY_MODULES & modules
@@ -25,7 +25,8 @@ from pathlib import Path
 import shutil
 import subprocess
 import sys
-from typing import Tuple
+from types import SimpleNamespace
+from typing import List, Tuple
 
 import pytest
 
@@ -38,7 +39,8 @@ import scade.model.suite as suite
 import scade.model.testenv as qte
 
 import ansys.scade.pyalmgw as pyalmgw
-from ansys.scade.pyalmgw.llrs import LLRS, LLRExport, PathError, QteLLRS, ScadeLLRS
+import ansys.scade.pyalmgw.llrs as llrs
+from ansys.scade.pyalmgw.llrs import LLRS, LLRExport, PathError, QteLLRS, ScadeLLRS, Scope
 from conftest import load_project, load_project_session, load_project_test
 
 _pyalmgw_dir = Path(pyalmgw.__file__).parent
@@ -212,6 +214,64 @@ def test_scade_llrs(local_tmpdir, scade_llrs: Tuple[std.Project, suite.Session])
     assert not failure
 
 
+def test_scade_llrs_annotations(scade_llrs: Tuple[std.Project, suite.Session], monkeypatch):
+    """Test the index of annotations against the per-element access."""
+    schema = _root_dir / 'tests' / 'ScadeLLRS' / 'scade_all.json'
+    cls = TestLLRExportSuite(*scade_llrs)
+    cls.read_schema(schema)
+    indexed = cls.dump_model(empty='<empty>')
+    export_class = cls.export_classes[0]
+    assert export_class.annotations is not None
+    monkeypatch.setattr(export_class, 'index_annotations', lambda: None)
+    direct = cls.dump_model(empty='<empty>')
+    assert indexed == direct
+
+
+class _Value:
+    def __init__(self, text: str):
+        self.text = text
+
+    def to_string(self) -> str:
+        return self.text
+
+
+class _Note:
+    def __init__(self, owner: SimpleNamespace, type: str, values: dict):
+        self.owner = owner
+        self.ann_note_type = type
+        self.values = values
+        owner.ann_notes.append(self)
+
+    def get_ann_att_value_by_name(self, name: str) -> _Value:
+        return _Value(self.values.get(name, ''))
+
+
+def test_index_annotations(monkeypatch):
+    """Test the order of the attributes of an element with several notes."""
+    one = SimpleNamespace(get_oid=lambda: '!ed/1', ann_notes=[])
+    two = SimpleNamespace(get_oid=lambda: '!ed/2', ann_notes=[])
+    # the notes of one are not in the order of the note types
+    notes = {
+        'T2': [_Note(one, 'T2', {'b': 'one.b'})],
+        'T1': [_Note(one, 'T1', {'a': 'one.a'}), _Note(two, 'T1', {})],
+    }
+    monkeypatch.setattr(llrs, '_scade_api', SimpleNamespace(get=lambda type, role: notes[type]))
+    export_class = ScadeLLRS.__new__(ScadeLLRS)
+    export_class.llr_export = SimpleNamespace(empty='<empty>')
+    export_class.llr_fields = {'T1': [['A', 'a']], 'T2': [['B', 'b']]}
+    index = export_class.index_annotations()
+    assert index == {
+        '!ed/1': [{'name': 'B', 'value': 'one.b'}, {'name': 'A', 'value': 'one.a'}],
+        '!ed/2': [{'name': 'A', 'value': '<empty>'}],
+    }
+    export_class.annotations = None
+    assert export_class.get_item_attributes(one) == index['!ed/1']
+
+    # unsupported access
+    notes['T2'] = [SimpleNamespace()]
+    assert export_class.index_annotations() is None
+
+
 def test_records(local_tmpdir):
     """Test esqets.json schema."""
     schema = _pyalmgw_dir / 'res' / 'schemas' / 'records.json'
@@ -290,6 +350,147 @@ def test_schema_nominal(local_tmpdir, schemas: Tuple[std.Project, suite.Session]
     assert not failure
 
 
+def test_schema_pruned_edges(schemas: Tuple[std.Project, suite.Session]):
+    """Test the static analysis of the schema."""
+    path = _root_dir / 'tests' / 'Schemas' / 'pruned.json'
+    cls = TestLLRExportSuite(*schemas)
+    cls.read_schema(path)
+    assert cls.pruned_edges == {
+        ('Operator', 'equation{Equation}'),
+        ('Equation', 'right{ExprId}'),
+        ('ExprId', 'reference{Equation}'),
+    }
+    pruned = cls.dump_model(version=LLRS.V194)
+    # the pruned edges must not change the result
+    cls.pruned_edges = set()
+    full = cls.dump_model(version=LLRS.V194)
+    assert pruned == full
+
+
+def test_get_icon(schemas: Tuple[std.Project, suite.Session]):
+    """Test the cache of icons."""
+    cls = TestLLRExportSuite(*schemas)
+    icon = cls.get_icon('suite', 'netDiagram')
+    assert icon == (_pyalmgw_dir / 'res' / 'suite' / 'netDiagram.png').as_posix()
+    assert cls.icons[('suite', 'netDiagram')] == icon
+    assert cls.get_icon('suite', 'unknown') is None
+    assert ('suite', 'unknown') in cls.icons
+    assert cls.get_url('oid').startswith(cls.url_prefix)
+
+
+def _get_oids(elements: List[dict]) -> List[str]:
+    oids = []
+    for element in elements:
+        if element['almtype'] == 'req':
+            oids.append(element['oid'])
+        oids.extend(_get_oids(element.get('elements', [])))
+    return oids
+
+
+def _get_refs(elements: List[dict]) -> List[str]:
+    refs = []
+    for element in elements:
+        if 'ref' in element:
+            refs.append(element['ref'])
+        refs.extend(_get_refs(element.get('elements', [])))
+    return refs
+
+
+@pytest.mark.parametrize('policy', ['allow', 'skip', 'reference'])
+def test_schema_duplicates(schemas: Tuple[std.Project, suite.Session], policy: str):
+    """Test the policies for duplicate elements."""
+    path = _root_dir / 'tests' / 'Schemas' / 'duplicates.json'
+    cls = TestLLRExportSuite(*schemas)
+    cls.read_schema(path)
+    cls.classes['Operator']['duplicates'] = policy
+    model = cls.dump_model(version=LLRS.V194)
+    oids = _get_oids(model['elements'])
+    # subOperator is a subset of allOperator
+    assert cls.stats['duplicates'] != 0
+    assert cls.stats['cycles'] == 0
+    if policy == 'skip':
+        assert cls.stats['skipped'] == cls.stats['duplicates']
+        assert len(oids) == len(set(oids))
+    elif policy == 'reference':
+        # the references have their own oids
+        assert cls.stats['references'] == cls.stats['duplicates']
+        assert len(oids) == len(set(oids))
+        refs = _get_refs(model['elements'])
+        assert len(refs) == cls.stats['references']
+        assert set(refs) <= set(oids)
+    else:
+        assert len(oids) == len(set(oids)) + cls.stats['duplicates']
+        assert cls.stats['references'] == 0
+
+
+@pytest.mark.parametrize(
+    'oid, pathname, name, top_level, expected',
+    [
+        ('!ed/1', 'P::Op/', 'Op', True, True),
+        ('!ed/2', 'P::Op/', 'Op', False, True),
+        ('!ed/3', 'P::Op/', 'Op', False, True),
+        ('!ed/3', 'P::Other/', 'Top', True, True),
+        ('!ed/3', 'P::Other/', 'Top', False, False),
+        ('!ed/3', 'P::Other/', 'Other', True, False),
+    ],
+)
+def test_scope_match(oid, pathname, name, top_level, expected):
+    scope = Scope(oids=['!ed/1'], paths=['P::Op/*'], names=['Top'])
+    assert scope.match(oid, pathname, name, top_level) == expected
+
+
+@pytest.mark.parametrize(
+    'oids, pathname, expected',
+    [
+        ([], 'P::', True),
+        ([], 'P::Op/', True),
+        ([], 'P::Op/SM1:', True),
+        ([], 'P::Other/', False),
+        ([], '', True),
+        (['!ed/1'], 'P::Other/', True),
+    ],
+)
+def test_scope_may_contain(oids, pathname, expected):
+    scope = Scope(oids=oids, paths=['P::Op/*'])
+    assert scope.may_contain(pathname) == expected
+
+
+def test_sort_links():
+    """Test the order of the sorted links: case insensitive, stable, unnamed elements first."""
+    export_class = ScadeLLRS.__new__(ScadeLLRS)
+    export_class.sorted_links = {}
+    export_class.sort_keys = {}
+    owner = SimpleNamespace(name='Owner')
+    b1, b2, a, unnamed = (SimpleNamespace(name=_) for _ in ['b', 'B', 'A', ''])
+    links = export_class.sort_links(owner, 'role', [b1, a, b2, unnamed])
+    # ties keep the order of the input list
+    assert links == [unnamed, a, b1, b2]
+    # the result is a copy of the cached list
+    links.clear()
+    assert export_class.sort_links(owner, 'role', [b1, a, b2, unnamed]) == [unnamed, a, b1, b2]
+    # same elements, other role
+    assert export_class.sort_links(owner, 'other', [b2, b1]) == [b2, b1]
+
+
+@pytest.mark.parametrize(
+    'scope',
+    [
+        Scope(names=['Role']),
+        Scope(paths=['P::Role/*']),
+    ],
+)
+def test_schema_scope(schemas: Tuple[std.Project, suite.Session], scope: Scope):
+    """Test partial exports."""
+    path = _root_dir / 'tests' / 'Schemas' / 'scope.json'
+    cls = TestLLRExportSuite(*schemas)
+    cls.read_schema(path)
+    full = _get_oids(cls.dump_model(version=LLRS.V194)['elements'])
+    partial = _get_oids(cls.dump_model(version=LLRS.V194, scope=scope)['elements'])
+    assert partial
+    assert set(partial) < set(full)
+    assert cls.stats['out_of_scope'] != 0
+
+
 @pytest.mark.parametrize(
     'schema',
     [
@@ -0,0 +1,117 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import json
+import logging
+from pathlib import Path
+import timeit
+
+import pytest
+
+import ansys.scade.pyalmgw.log as log
+
+
+@pytest.fixture
+def logger():
+    # restore the configuration of the package's logger
+    level = log.root.level
+    yield log.root
+    if log._handler is not None:
+        log.root.removeHandler(log._handler)
+        log._handler.close()
+        log._handler = None
+    log.root.setLevel(level)
+    log.root.propagate = True
+
+
+@log.timed(logger=log.root)
+def _square(value: int) -> int:
+    return value * value
+
+
+def test_span(logger):
+    stream = io.StringIO()
+    log.configure('DEBUG', stream=stream)
+    with log.span('step') as span:
+        pass
+    assert isinstance(span, log.Span)
+    assert span.duration >= 0
+    assert _square(3) == 9
+    with pytest.raises(ValueError):
+        with log.span('error'):
+            raise ValueError('error')
+    lines = stream.getvalue().splitlines()
+    assert lines[0].startswith('step: ')
+    assert lines[1].startswith('_square: ')
+    assert lines[2].endswith('(failed)')
+
+
+def test_span_disabled(logger):
+    stream = io.StringIO()
+    log.configure('INFO', stream=stream)
+    assert not isinstance(log.span('step'), log.Span)
+    with log.span('step'):
+        pass
+    assert _square(2) == 4
+    assert stream.getvalue() == ''
+
+
+def test_span_overhead(logger):
+    log.configure('WARNING', stream=io.StringIO())
+
+    def disabled():
+        with log.span('step'):
+            pass
+
+    # the cost of a disabled span is in the same range as a function call
+    count = 10000
+    reference = timeit.timeit(lambda: None, number=count)
+    assert timeit.timeit(disabled, number=count) < reference * 20 + 0.05
+
+
+def test_configure_file(logger, local_tmpdir):
+    path = Path(local_tmpdir) / 'log.jsonl'
+    log.configure(log.TRACE, file=str(path))
+    log.get_logger('ansys.scade.pyalmgw.test').log(log.TRACE, 'trace %d', 1)
+    with log.span('step', level=logging.INFO):
+        pass
+    log.configure('WARNING', stream=io.StringIO())
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert records[0]['message'] == 'trace 1'
+    assert records[0]['level'] == 'TRACE'
+    assert records[0]['logger'] == 'ansys.scade.pyalmgw.test'
+    assert records[1]['span'] == 'step'
+    assert records[1]['duration'] >= 0
+
+
+def test_configure_environment(logger, monkeypatch, capsys):
+    monkeypatch.setenv(log.LOG_VARIABLE, 'info')
+    monkeypatch.delenv(log.LOG_FILE_VARIABLE, raising=False)
+    log.configure()
+    assert log.root.level == logging.INFO
+    log.root.info('message')
+    # the handler writes to the current standard output
+    assert capsys.readouterr().out == 'message\n'
+    monkeypatch.setenv(log.LOG_VARIABLE, 'unknown')
+    log.configure()
+    assert log.root.level == logging.WARNING
@@ -0,0 +1,84 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ansys.scade.pyalmgw.metrics import Metrics, append_record, get_peak_rss
+
+
+def test_metrics_command():
+    metrics = Metrics()
+    with metrics.phase('load'):
+        pass
+    with metrics.command(connector='ut', command='export') as record:
+        for _ in range(2):
+            with metrics.phase('dump'):
+                sum(range(1000))
+        record['code'] = 1
+    assert record['connector'] == 'ut'
+    assert record['command'] == 'export'
+    assert record['code'] == 1
+    assert record['wall'] >= 0 and record['cpu'] >= 0
+    if record['process_peak_rss'] is not None:
+        # the memory allocated before the command is not accounted
+        assert 0 <= record['peak_rss_delta'] <= record['process_peak_rss']
+    assert set(record['phases']) == {'load', 'dump'}
+    assert record['phases']['dump'] <= record['wall']
+    # the phases are reset for the next command
+    assert metrics.phases == {}
+
+
+def test_metrics_command_exception():
+    metrics = Metrics()
+    with pytest.raises(ValueError):
+        with metrics.command(command='import') as record:
+            with metrics.phase('merge'):
+                raise ValueError('merge')
+    assert 'code' not in record
+    assert 'merge' in record['phases']
+
+
+def test_get_peak_rss():
+    peak = get_peak_rss()
+    assert peak is None or peak > 0
+
+
+def test_append_record(local_tmpdir):
+    path = Path(local_tmpdir) / 'metrics.jsonl'
+    for index in range(3):
+        append_record(path, {'index': index})
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)['index'] for line in lines] == [0, 1, 2]
+
+
+def test_append_record_rotation(local_tmpdir):
+    path = Path(local_tmpdir) / 'rotation.jsonl'
+    # one record per file
+    for index in range(5):
+        append_record(path, {'index': index}, max_bytes=20, backup_count=2)
+    assert json.loads(path.read_text())['index'] == 4
+    assert json.loads(path.with_name(path.name + '.1').read_text())['index'] == 3
+    assert json.loads(path.with_name(path.name + '.2').read_text())['index'] == 2
+    assert not path.with_name(path.name + '.3').exists()
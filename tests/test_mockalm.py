@@ -0,0 +1,135 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from ansys.scade.pyalmgw.client import HttpClient, HttpError
+from ansys.scade.pyalmgw.documents import ReqDocument, ReqProject
+import ansys.scade.pyalmgw.mockalm as mockalm
+
+
+@pytest.fixture
+def server():
+    server = mockalm.MockAlmServer(documents=12, depth=2, sections=2, requirements=3)
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_mockalm_documents(server):
+    async def run():
+        async with HttpClient(server.url) as client:
+            items = [_ async for _ in client.paginate('documents')]
+            content = await client.get_json(items[-1]['url'])
+            response = await client.get('documents/DOC_13', check=False)
+            return items, content, response.status
+
+    items, content, status = asyncio.run(run())
+    # two pages
+    assert [_['id'] for _ in items] == ['DOC_%d' % (i + 1) for i in range(12)]
+    assert status == 404
+    assert content['name'] == 'Document 12'
+    # 2 sections with 2 subsections each, 3 requirements per section
+    project = ReqProject()
+    document = ReqDocument(project)
+    mockalm.build_document(document, content)
+    assert document.identifier == 'DOC_12'
+    assert document.depth == 3
+    assert len(list(document.iter_requirements())) == 18
+    assert server.stats['requests'] == 4
+
+
+def test_mockalm_links(server):
+    deltas = [
+        {'source': {'oid': '!ed/1'}, 'target': {'req_id': 'REQ_1_1'}, 'action': 'ADD'},
+        {'source': {'oid': '!ed/1'}, 'target': {'req_id': 'REQ_1_2'}, 'action': 'ADD'},
+        {'source': {'oid': '!ed/1'}, 'target': {'req_id': 'REQ_1_1'}, 'action': 'REMOVE'},
+    ]
+
+    async def run():
+        async with HttpClient(server.url) as client:
+            response = await client.post('links', deltas)
+            return response.json()
+
+    assert asyncio.run(run()) == {'links': 1}
+    assert server.links == {'!ed/1': {'REQ_1_2': ''}}
+    assert server.stats['deltas'] == 3
+
+
+def test_mockalm_errors():
+    server = mockalm.MockAlmServer(error_rate=1.0)
+    server.start()
+
+    async def run():
+        async with HttpClient(server.url, retries=2, backoff=0.01) as client:
+            await client.get('documents')
+
+    try:
+        with pytest.raises(HttpError) as info:
+            asyncio.run(run())
+    finally:
+        server.stop()
+    assert info.value.status == 503
+    # initial request and retries
+    assert server.stats['errors'] == 3
+
+
+def test_mockalm_throttling():
+    server = mockalm.MockAlmServer(max_rate=20)
+    server.start()
+
+    async def run():
+        async with HttpClient(server.url, retries=10) as client:
+            await asyncio.gather(*(client.get('documents/DOC_1') for _ in range(30)))
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.stop()
+    # the client waits according to Retry-After
+    assert server.stats['throttled'] > 0
+    assert server.stats['requests'] == 30 + server.stats['throttled']
+
+
+def test_mockalm_benchmark(local_tmpdir):
+    output = Path(local_tmpdir) / 'mockalm.json'
+    args = ['bench', '--cycles', '2', '--documents', '5', '--error-rate', '0.05', '--seed', '1']
+    assert mockalm.main(args + ['--links', '10', '--output', str(output)]) == 0
+    stats = json.loads(output.read_text())
+    # 1 page + 5 documents + 1 post per cycle
+    assert stats['requests'] == 14
+    assert stats['failures'] == 0
+    assert stats['attempts'] == 14 + stats['server']['errors']
+    assert stats['requirements'] == 2 * 5 * (3 + 9) * 5
+    assert stats['latency']['p50'] <= stats['latency']['p99'] <= stats['latency']['max']
+
+
+def test_percentile():
+    values = [float(_) for _ in range(1, 101)]
+    assert mockalm.percentile(values, 0.5) == 50
+    assert mockalm.percentile(values, 0.99) == 99
+    assert mockalm.percentile(values, 1.0) == 100
+    assert mockalm.percentile([], 0.5) == 0
@@ -0,0 +1,96 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from pathlib import Path
+import pstats
+import time
+
+import pytest
+
+import ansys.scade.pyalmgw as pyalmgw
+from ansys.scade.pyalmgw.profiling import SamplingProfiler, get_profiler, profile
+
+
+def _busy(duration: float):
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+@pytest.mark.parametrize(
+    'option, variable, expected',
+    [
+        (None, '', None),
+        (None, '1', 'cprofile'),
+        (None, 'Sampling', 'sampling'),
+        (None, 'unknown', None),
+        ('sampling', 'cprofile', 'sampling'),
+    ],
+)
+def test_get_profiler(monkeypatch, option, variable, expected):
+    monkeypatch.setenv(pyalmgw.PROFILE_VARIABLE, variable)
+    assert get_profiler(option) == expected
+
+
+def test_profile_disabled(local_tmpdir):
+    with profile(None, Path(local_tmpdir) / 'none') as files:
+        pass
+    assert files is None
+    assert list(Path(local_tmpdir).glob('none.*')) == []
+
+
+def test_profile_cprofile(local_tmpdir, caplog):
+    stem = Path(local_tmpdir) / 'model.ut.export'
+    with profile('cprofile', stem) as files:
+        _busy(0.01)
+    assert 'profile saved to' in caplog.text
+    assert files == [
+        stem.with_name('model.ut.export.prof'),
+        stem.with_name('model.ut.export.prof.txt'),
+    ]
+    stats = pstats.Stats(str(files[0]))
+    assert any(name == '_busy' for _, _, name in stats.stats)
+    assert '_busy' in files[1].read_text()
+
+
+def test_profile_sampling(local_tmpdir):
+    stem = Path(local_tmpdir) / 'model.llrs'
+    with profile('sampling', stem) as files:
+        _busy(0.2)
+    assert files == [stem.with_name('model.llrs.folded'), stem.with_name('model.llrs.samples.txt')]
+    folded = files[0].read_text().splitlines()
+    assert folded and all(line.rsplit(' ', 1)[1].isdigit() for line in folded)
+    assert '_busy' in files[1].read_text()
+
+
+def test_sampling_profiler():
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    _busy(0.1)
+    profiler.stop()
+    own, cumulated = profiler.get_counts()
+    total = sum(profiler.samples.values())
+    assert total > 0
+    assert sum(own.values()) == total
+    busy = [count for (_, _, name), count in cumulated.items() if name == '_busy']
+    assert busy and busy[0] <= total
+    assert profiler.get_summary(top=5).startswith('%d samples' % total)
@@ -0,0 +1,126 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+import ansys.scade.pyalmgw.provider as provider
+
+PROJECT = '_o6tIUKJmEe'
+
+
+def _url(oid: str) -> str:
+    return 'http://localhost:8080/scade_provider/services/%s/requirements/%s' % (
+        PROJECT,
+        b64encode(oid.encode()).decode(),
+    )
+
+
+def _write_model(path: Path, name: str, image: str = ''):
+    operator = {'almtype': 'req', 'oid': '!ed/???', 'name': name, 'pathname': 'P::Op/'}
+    operator.update(url=_url('!ed/???'), scadetype='Operator')
+    operator['attributes'] = [{'name': 'comment', 'value': 'a <b> c'}]
+    if image:
+        operator['image'] = image
+    model = {
+        'name': 'Model',
+        'elements': [{'almtype': 'section', 'oid': 'P', 'name': 'P', 'elements': [operator]}],
+    }
+    path.write_text(json.dumps(model))
+
+
+@pytest.fixture
+def server(local_tmpdir):
+    directory = Path(local_tmpdir) / 'provider'
+    directory.mkdir(exist_ok=True)
+    image = directory / 'op.png'
+    image.write_bytes(b'\x89PNG data')
+    llrs = directory / 'model.llrs'
+    _write_model(llrs, 'Op', str(image))
+    server = provider.ScadeProvider([llrs], ('127.0.0.1', 0), cache_size=2)
+    server.start()
+    yield server
+    server.stop()
+
+
+def _get(server: provider.ScadeProvider, url: str):
+    url = url.replace('http://localhost:8080/', server.url)
+    with urlopen(url) as response:  # nosec B310  # local server
+        return response.headers['Content-Type'], response.read()
+
+
+def test_decode_oid():
+    assert provider.decode_oid(b64encode(b'!ed/???').decode()) == '!ed/???'
+    # URL-safe alphabet, no padding
+    assert provider.decode_oid('IWVkLz8_Pw') == '!ed/???'
+    assert provider.decode_oid('%%%') is None
+
+
+def test_provider_element(server):
+    content_type, body = _get(server, _url('!ed/???'))
+    assert content_type.startswith('text/html')
+    page = body.decode('utf-8')
+    assert '<h1>Op</h1>' in page
+    assert 'a &lt;b&gt; c' in page
+    assert '/image' in page
+    content_type, body = _get(server, _url('!ed/???') + '?format=json')
+    assert content_type == 'application/json'
+    details = json.loads(body)
+    assert details['pathname'] == 'P::Op/'
+    assert details['ancestors'] == ['P']
+    content_type, body = _get(server, _url('!ed/???') + '/image')
+    assert (content_type, body) == ('image/png', b'\x89PNG data')
+    assert server.indexes[0].project_id == PROJECT
+
+
+def test_provider_not_found(server):
+    for url in [_url('unknown'), _url('P') + '/image', _url('P') + '?format=xml', server.url]:
+        with pytest.raises(HTTPError) as info:
+            _get(server, url)
+        assert info.value.code == 404
+
+
+def test_provider_cache(server):
+    url = _url('!ed/???') + '?format=json'
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: _get(server, url), range(50)))
+    assert len({_[1] for _ in results}) == 1
+    assert server.misses >= 1
+    assert server.hits + server.misses == 50
+
+    # the model is reloaded when modified
+    llrs = server.indexes[0].path
+    _write_model(llrs, 'Renamed')
+    stat = llrs.stat()
+    os.utime(llrs, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert json.loads(_get(server, url)[1])['name'] == 'Renamed'
+    with pytest.raises(HTTPError):
+        _get(server, _url('!ed/???') + '/image')
+    # LRU
+    assert len(server.cache) <= 2
@@ -0,0 +1,150 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+from pathlib import Path
+
+import pytest
+
+import ansys.scade.pyalmgw.reqindex as reqindex
+
+_stub = Path(__file__).parent.parent / 'src' / 'ansys' / 'scade' / 'pyalmgw' / 'res' / 'stub.xml'
+_deltas = Path(__file__).parent / 'res' / 'stub.links.json'
+
+
+def _write_llrs(path: Path):
+    model = {
+        'elements': [
+            {
+                'almtype': 'section',
+                'oid': 'S',
+                'elements': [
+                    {'almtype': 'req', 'oid': '!ed/1', 'pathname': 'P::One/'},
+                    {'almtype': 'req', 'oid': '!ed/3', 'pathname': 'P::Three/'},
+                ],
+            }
+        ]
+    }
+    path.write_text(json.dumps(model))
+
+
+def test_index_lookup(local_tmpdir):
+    path = Path(local_tmpdir) / 'lookup.reqidx'
+    # enough entries to have collisions
+    links = {'REQ_%d' % i: ['!ed/%d' % (i % 50), '!ed/%d' % (i % 7 + 100)] for i in range(200)}
+    pathnames = {'!ed/%d' % i: 'P::N%d/' % i for i in range(200)}
+    reqindex.write_index(path, links, pathnames)
+    with reqindex.ReqIndex(path) as index:
+        for req, oids in links.items():
+            assert index.locate(req) == [(oid, pathnames[oid]) for oid in sorted(oids)]
+        assert index.get_oids('UNKNOWN') == []
+        assert index.get_requirements('!ed/100') == sorted(
+            'REQ_%d' % i for i in range(200) if i % 7 == 0
+        )
+        assert index.get_pathname('!ed/999') == ''
+        # only the linked elements are indexed
+        linked = {oid for oids in links.values() for oid in oids}
+        expected = {oid: pathname for oid, pathname in pathnames.items() if oid in linked}
+        assert index.get_links() == ({req: set(oids) for req, oids in links.items()}, expected)
+
+
+def test_index_invalid(local_tmpdir):
+    path = Path(local_tmpdir) / 'invalid.reqidx'
+    path.write_bytes(b'not an index file')
+    with pytest.raises(ValueError):
+        reqindex.ReqIndex(path)
+    path.write_bytes(b'')
+    with pytest.raises(ValueError):
+        reqindex.ReqIndex(path)
+
+
+def test_index_corrupted(local_tmpdir):
+    path = Path(local_tmpdir) / 'corrupted.reqidx'
+    links = {'REQ_%d' % i: ['!ed/%d' % i] for i in range(20)}
+    pathnames = {'!ed/%d' % i: 'P::N%d/' % i for i in range(20)}
+    reqindex.write_index(path, links, pathnames)
+    data = path.read_bytes()
+    # truncated tables
+    path.write_bytes(data[: reqindex._HEADER.size + 10])
+    with pytest.raises(ValueError):
+        reqindex.ReqIndex(path)
+    # truncated records
+    path.write_bytes(data[: len(data) - 10])
+    with pytest.raises(ValueError):
+        with reqindex.ReqIndex(path) as index:
+            index.get_links()
+
+
+def test_index_replace_opened(local_tmpdir):
+    path = Path(local_tmpdir) / 'opened.reqidx'
+    reqindex.write_index(path, {'REQ_1': ['!ed/1']}, {'!ed/1': 'P::One/'})
+    index = reqindex.ReqIndex(path)
+    assert index.get_oids('REQ_1') == ['!ed/1']
+    # the mapping is released before the file is replaced
+    reqindex.write_index(path, {'REQ_2': ['!ed/2']}, {'!ed/2': 'P::Two/'})
+    assert index not in reqindex._open_indexes
+    with reqindex.ReqIndex(path) as index:
+        assert index.get_oids('REQ_2') == ['!ed/2']
+
+
+def test_index_build_update(local_tmpdir):
+    path = Path(local_tmpdir) / 'stub.reqidx'
+    llrs = Path(local_tmpdir) / 'stub.llrs'
+    _write_llrs(llrs)
+    reqindex.build_index(path, _stub, llrs)
+    with reqindex.ReqIndex(path) as index:
+        assert index.locate('REQ_1') == [('!ed/1', 'P::One/')]
+        assert index.locate('REQ_2') == [('!ed/2', '')]
+        assert index.get_requirements('!ed/3') == ['REQ_2.1']
+
+    reqindex.update_index(path, _deltas, llrs)
+    with reqindex.ReqIndex(path) as index:
+        links, _ = index.get_links()
+    # same links as the merge of the deltas by StubProject
+    assert links == {
+        'REQ_1': {'!ed/3'},
+        'REQ_2': {'!ed/2'},
+        'REQ_2.1': {'!ed/3'},
+        'UNKNOWN': {'!ed/3'},
+    }
+
+
+def test_index_update_new(local_tmpdir):
+    path = Path(local_tmpdir) / 'new.reqidx'
+    reqindex.update_index(path, _deltas)
+    with reqindex.ReqIndex(path) as index:
+        assert index.get_pathname('!ed/3') == '<unused> robustness add to non existing requirement'
+        assert index.get_oids('REQ_1') == ['!ed/3']
+
+
+def test_index_update_pathnames(local_tmpdir):
+    # asynchronous export: the deltas first, then the pathnames of the surrogate model
+    path = Path(local_tmpdir) / 'async.reqidx'
+    llrs = Path(local_tmpdir) / 'async.llrs'
+    _write_llrs(llrs)
+    reqindex.update_index(path, _deltas)
+    with reqindex.ReqIndex(path) as index:
+        links = index.get_links()[0]
+    reqindex.update_index(path, None, llrs)
+    with reqindex.ReqIndex(path) as index:
+        assert index.get_links()[0] == links
+        assert index.get_pathname('!ed/3') == 'P::Three/'
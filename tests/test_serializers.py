@@ -0,0 +1,124 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+from pathlib import Path
+import time
+
+import pytest
+
+import ansys.scade.pyalmgw.serializers as ser
+
+_ref_dir = Path(__file__).parent / 'ref'
+
+
+@pytest.mark.parametrize(
+    'object_',
+    [
+        None,
+        True,
+        False,
+        0,
+        127,
+        128,
+        -1,
+        -32,
+        -33,
+        2**31,
+        -(2**40),
+        2**64 - 1,
+        1.5,
+        '',
+        'a' * 31,
+        'é' * 100,
+        'b' * 70000,
+        [],
+        list(range(20)),
+        {'a': [1, {'b': None}], 'c': 'd' * 300},
+        {str(_): _ for _ in range(70000)},
+    ],
+)
+def test_msgpack_round_trip(object_):
+    serializer = ser.MsgPackSerializer()
+    assert serializer.loads(serializer.dumps(object_)) == object_
+
+
+def test_msgpack_reference():
+    # reference values from the MessagePack specification
+    serializer = ser.MsgPackSerializer()
+    assert serializer.dumps({'compact': True, 'schema': 0}) == (
+        b'\x82\xa7compact\xc3\xa6schema\x00'
+    )
+
+
+def test_msgpack_robustness():
+    serializer = ser.MsgPackSerializer()
+    with pytest.raises(TypeError):
+        serializer.dumps({1, 2})
+    with pytest.raises(ValueError):
+        serializer.loads(b'\x92\x01')
+    with pytest.raises(ValueError):
+        serializer.loads(b'\x01\x02')
+    with pytest.raises(ValueError):
+        serializer.loads(b'\xc4\x01\x00')
+
+
+@pytest.mark.parametrize('format', ['json', 'compact', 'msgpack'])
+def test_serializers_file(local_tmpdir, format):
+    model = json.load((_ref_dir / 'scade_llrs.json').open())
+    serializer = ser.get_serializer(format)
+    path = local_tmpdir / ('serializer' + serializer.extension)
+    assert serializer.write(model, path)
+    assert serializer.read(path) == model
+
+
+def test_serializers_errors(local_tmpdir, caplog, capsys):
+    serializer = ser.get_serializer('json')
+    path = local_tmpdir / 'missing' / 'serializer.json'
+    assert not serializer.write({}, path)
+    assert serializer.read(path) is None
+    # the errors are logged
+    assert [record.levelname for record in caplog.records] == ['ERROR', 'ERROR']
+    assert capsys.readouterr().out == ''
+
+
+def test_serializers_benchmark():
+    """Compare the size and the throughput of the serializers."""
+    model = json.load((_ref_dir / 'scade_llrs.json').open())
+    # scale the model
+    model['elements'] = model['elements'] * 50
+    sizes = {}
+    for format in ['json', 'compact', 'msgpack']:
+        serializer = ser.get_serializer(format)
+        start = time.perf_counter()
+        data = serializer.dumps(model)
+        dump_time = time.perf_counter() - start
+        start = time.perf_counter()
+        serializer.loads(data)
+        load_time = time.perf_counter() - start
+        sizes[format] = len(data)
+        print(
+            '%-8s: %9d bytes, dump %6.1f MB/s, load %6.1f MB/s'
+            % (format, len(data), len(data) / dump_time / 1e6, len(data) / load_time / 1e6)
+        )
+    assert sizes['compact'] < sizes['json']
+    assert sizes['msgpack'] < sizes['compact']
@@ -0,0 +1,174 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+
+import ansys.scade.pyalmgw.surrogate as surrogate
+
+
+def _model(*elements):
+    return {'name': 'M', 'type': 'suite', 'path': 'M.etp', 'elements': list(elements)}
+
+
+def _section(oid, *elements):
+    return {'name': oid, 'almtype': 'section', 'oid': oid, 'elements': list(elements)}
+
+
+def _req(oid, name='', *elements):
+    req = {'name': name or oid, 'almtype': 'req', 'oid': oid, 'scadetype': 'operator'}
+    if elements:
+        req['elements'] = list(elements)
+    return req
+
+
+def test_iter_elements():
+    model = _model(_section('S', _req('A', '', _req('B')), _req('C')))
+    elements = [(parent, element['oid']) for parent, element in surrogate.iter_elements(model)]
+    assert elements == [(None, 'S'), ('S', 'A'), ('A', 'B'), ('S', 'C')]
+
+
+def test_index_elements():
+    model = _model(_section('S', _req('A', '', _req('B')), _req('A', 'duplicate')))
+    index = surrogate.index_elements(model)
+    assert list(index) == ['S', 'A', 'B']
+    assert index['A']['name'] == 'A'
+    assert index['B']['parent'] == 'A'
+    assert 'elements' not in index['A']
+
+
+@pytest.mark.parametrize(
+    'current, added, changed, removed',
+    [
+        (_model(_section('S', _req('A'), _req('B'))), [], [], []),
+        (_model(_section('S', _req('A'), _req('B'), _req('C'))), ['C'], [], []),
+        (_model(_section('S', _req('A'), _req('B', 'renamed'))), [], ['B'], []),
+        (_model(_section('S', _req('A', '', _req('B')))), [], ['B'], []),
+        (_model(_section('S', _req('A'))), [], [], ['B']),
+    ],
+)
+def test_diff_models(current, added, changed, removed):
+    previous = _model(_section('S', _req('A'), _req('B')))
+    delta = surrogate.diff_models(previous, current)
+    assert [_['oid'] for _ in delta['added']] == added
+    assert [_['oid'] for _ in delta['changed']] == changed
+    assert delta['removed'] == removed
+    assert surrogate.is_empty_delta(delta) == (not added and not changed and not removed)
+
+
+def test_shards(local_tmpdir):
+    path = local_tmpdir / 'shards' / 'model.llrs'
+    path.parent.mkdir(exist_ok=True)
+    model = _model(_section('S', _section('S1', _req('A')), _section('S2', _req('B'))))
+    written = surrogate.write_shards(model, path)
+    assert len(written) == 2
+    assert surrogate.read_shards(path) == model
+    # no changes
+    written = surrogate.write_shards(model, path)
+    assert written == []
+    # one change, one deletion
+    model = _model(_section('S', _section('S1', _req('A', 'renamed'))))
+    written = surrogate.write_shards(model, path)
+    assert len(written) == 1
+    assert surrogate.read_shards(path) == model
+    assert len(list(surrogate.get_shards_dir(path).iterdir())) == 1
+
+
+def test_shards_unchanged(local_tmpdir, monkeypatch):
+    path = local_tmpdir / 'shards_unchanged' / 'model.llrs'
+    path.parent.mkdir(exist_ok=True)
+    model = _model(_section('S', *[_section('S%d' % i, _req('R%d' % i)) for i in range(10)]))
+    surrogate.write_shards(model, path)
+    # only the modified top-level element is serialized and written
+    serialized = []
+    write_shard = surrogate._write_shard
+    monkeypatch.setattr(
+        surrogate,
+        '_write_shard',
+        lambda element, file: serialized.append(element['oid']) or write_shard(element, file),
+    )
+    model['elements'][0]['elements'][3]['elements'][0]['name'] = 'renamed'
+    written = surrogate.write_shards(model, path, max_workers=4)
+    assert serialized == ['S3']
+    assert len(written) == 1
+    assert surrogate.read_shards(path) == model
+    # a missing shard is written again
+    written[0].unlink()
+    assert surrogate.write_shards(model, path) == written
+    assert serialized == ['S3', 'S3']
+
+
+def test_shards_update(local_tmpdir):
+    path = local_tmpdir / 'shards_update' / 'model.llrs'
+    path.parent.mkdir(exist_ok=True)
+    model = _model(_section('S', _section('S1', _req('A')), _section('S2', _req('B'))))
+    surrogate.write_shards(model, path)
+    # partial export
+    partial = _model(_section('S', _section('S2', _req('B', 'renamed'))))
+    written = surrogate.write_shards(partial, path, update=True)
+    assert len(written) == 1
+    expected = _model(
+        _section('S', _section('S1', _req('A')), _section('S2', _req('B', 'renamed')))
+    )
+    assert surrogate.read_shards(path) == expected
+
+
+def test_shards_duplicates(local_tmpdir):
+    path = local_tmpdir / 'shards_duplicates' / 'model.llrs'
+    path.parent.mkdir(exist_ok=True)
+    # two top-level elements with the same oid
+    model = _model(_section('S', _req('A'), _req('A', 'duplicate')))
+    written = surrogate.write_shards(model, path)
+    assert len(written) == 2
+    assert surrogate.read_shards(path) == model
+    model = _model(_section('S', _req('A'), _req('A', 'renamed')))
+    written = surrogate.write_shards(model, path)
+    assert len(written) == 1
+    assert surrogate.read_shards(path) == model
+
+
+def test_shards_update_partial(local_tmpdir):
+    path = local_tmpdir / 'shards_update_partial' / 'model.llrs'
+    path.parent.mkdir(exist_ok=True)
+    model = _model(_section('S', _section('S1', _req('A'), _req('B'))), _section('T', _req('C')))
+    surrogate.write_shards(model, path)
+    # partial export of a nested element: the rest of the shard is kept
+    partial = _model(_section('S', _section('S1', _req('B', 'renamed'), _req('D'))))
+    written = surrogate.write_shards(partial, path, update=True)
+    assert len(written) == 1
+    expected = _model(
+        _section('S', _section('S1', _req('A'), _req('B', 'renamed'), _req('D'))),
+        _section('T', _req('C')),
+    )
+    assert surrogate.read_shards(path) == expected
+
+
+def test_merge_elements():
+    old = _req('A', '', _req('B'), _req('B', 'second'), _req('C'))
+    new = _req('A', 'renamed', _req('B', 'second renamed'), _req('B', 'third'), _req('D'))
+    merged = surrogate.merge_elements(old, new)
+    assert merged['name'] == 'renamed'
+    assert [_['name'] for _ in merged['elements']] == [
+        'second renamed',
+        'third',
+        'C',
+        'D',
+    ]
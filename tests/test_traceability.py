@@ -0,0 +1,101 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+from pathlib import Path
+
+from ansys.scade.pyalmgw.documents import (
+    ReqDocument,
+    ReqProject,
+    Requirement,
+    Section,
+    TraceabilityLink,
+)
+import ansys.scade.pyalmgw.traceability as traceability
+
+_stub = Path(__file__).parent.parent / 'src' / 'ansys' / 'scade' / 'pyalmgw' / 'res' / 'stub.xml'
+
+
+def _project() -> ReqProject:
+    project = ReqProject()
+    document = ReqDocument(project, 'spec.docx', 'spec')
+    one = Section(document, '1', 'One')
+    req_1 = Requirement(one, 'REQ_1', 'first')
+    Requirement(Section(one, '1.1', 'One dot one'), 'REQ_2', 'second')
+    Requirement(document, 'REQ_3', 'third')
+    TraceabilityLink(project, req_1, '!ed/1', 'REQ_1')
+    TraceabilityLink(project, None, '!ed/2', 'REQ_3')
+    # missing element and missing requirement
+    TraceabilityLink(project, None, '!ed/9', 'REQ_2')
+    TraceabilityLink(project, None, '!ed/1', 'REQ_9')
+    return project
+
+
+def test_coverage_records():
+    elements = {'!ed/1': 'P::One/', '!ed/2': 'P::Two/', '!ed/3': 'P::Three/'}
+    coverage = traceability.Coverage(_project(), elements)
+    records = list(coverage.iter_records())
+    stats = [_ for _ in records if _['type'] in {'document', 'section'}]
+    assert [(_.get('number'), _['requirements'], _['covered']) for _ in stats] == [
+        (None, 3, 2),
+        ('1', 2, 1),
+        ('1.1', 1, 0),
+    ]
+    assert stats[2]['level'] == 2
+    assert stats[1]['ratio'] == 0.5
+    uncovered = [_['id'] for _ in records if _['type'] == 'uncovered']
+    assert uncovered == ['REQ_2']
+    untraced = [_['oid'] for _ in records if _['type'] == 'untraced']
+    assert untraced == ['!ed/3']
+    dangling = [(_['source'], _['reason']) for _ in records if _['type'] == 'dangling']
+    assert dangling == [('!ed/9', 'missing element'), ('!ed/1', 'missing requirement')]
+    summary = records[-1]
+    assert summary['type'] == 'summary'
+    assert (summary['requirements'], summary['covered'], summary['traced']) == (3, 2, 2)
+    assert summary['dangling'] == 2
+
+
+def test_coverage_empty():
+    records = list(traceability.Coverage(ReqProject(), {}).iter_records())
+    assert records == [
+        {
+            'type': 'summary',
+            'requirements': 0,
+            'covered': 0,
+            'ratio': 1.0,
+            'elements': 0,
+            'traced': 0,
+            'links': 0,
+            'dangling': 0,
+        }
+    ]
+
+
+def test_coverage_main(local_tmpdir):
+    llrs = Path(local_tmpdir) / 'coverage.llrs'
+    elements = [{'almtype': 'req', 'oid': '!ed/1', 'pathname': 'P::One/'}]
+    llrs.write_text(json.dumps({'elements': elements}))
+    output = Path(local_tmpdir) / 'coverage.jsonl'
+    assert traceability.main([str(_stub), str(llrs), '-o', str(output)]) == 0
+    records = [json.loads(_) for _ in output.read_text().splitlines()]
+    summary = records[-1]
+    assert (summary['covered'], summary['traced'], summary['dangling']) == (1, 1, 2)
@@ -0,0 +1,204 @@
+# Copyright (C) 2024 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+from pathlib import Path
+import stat
+from typing import IO
+
+import pytest
+
+import ansys.scade.pyalmgw.utils as utils
+from ansys.scade.pyalmgw.utils import (
+    JsonStreamError,
+    atomic_write,
+    copy_file,
+    iter_json_array,
+    read_json,
+    write_json,
+)
+
+_DELTAS = [
+    {'action': 'ADD', 'source': {'oid': '!ed/1'}, 'target': {'req_id': 'REQ_1'}},
+    {'action': 'REMOVE', 'source': {'oid': '!ed/2'}, 'target': {'req_id': 'REQ_2'}},
+    -1.5e3,
+    'a "quoted" string',
+    [],
+    None,
+]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 1024])
+@pytest.mark.parametrize('indent', [None, 4])
+def test_iter_json_array(local_tmpdir, chunk_size, indent):
+    path = Path(local_tmpdir) / 'deltas.json'
+    path.write_text(json.dumps(_DELTAS, indent=indent))
+    assert list(iter_json_array(path, chunk_size)) == _DELTAS
+
+
+@pytest.mark.parametrize(
+    'text',
+    [
+        '',
+        '{}',
+        '[1,]',
+        '[1 2]',
+        '[1',
+        '[1]x',
+        '[\n  1,\n  tru\n]',
+        '[\n  {"a": 1},\n  {"a" 2}\n]',
+        '[\n  "a",\n  "b]',
+    ],
+)
+@pytest.mark.parametrize('chunk_size', [1, 3, 1024])
+def test_iter_json_array_errors(local_tmpdir, text, chunk_size):
+    path = Path(local_tmpdir) / 'error.json'
+    path.write_text(text)
+    with pytest.raises(JsonStreamError) as info:
+        list(iter_json_array(path, chunk_size))
+    try:
+        json.loads(text)
+    except json.JSONDecodeError as e:
+        # same positions as the json module
+        assert (info.value.lineno, info.value.colno, info.value.pos) == (e.lineno, e.colno, e.pos)
+    else:
+        # not an array
+        assert info.value.pos == 0
+
+
+class _CountingFile:
+    def __init__(self, file: IO[str]):
+        self.file = file
+        self.count = 0
+
+    def read(self, size: int) -> str:
+        text = self.file.read(size)
+        self.count += len(text)
+        return text
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.file.close()
+
+
+class _CountingPath(type(Path())):
+    def open(self, *args, **kwargs):
+        self.file = _CountingFile(super().open(*args, **kwargs))
+        return self.file
+
+
+def test_iter_json_array_syntax_error(local_tmpdir):
+    # syntax error at the beginning of a large file
+    pathname = Path(local_tmpdir) / 'syntax.json'
+    pathname.write_text('[\n  {"a" 2},\n' + '  1,\n' * 100000 + '  1\n]')
+    path = _CountingPath(str(pathname))
+    with pytest.raises(JsonStreamError) as info:
+        list(iter_json_array(path, 16))
+    assert (info.value.lineno, info.value.colno) == (2, 8)
+    # the rest of the file is not read
+    assert path.file.count <= 64
+
+
+def test_iter_json_array_large_element(local_tmpdir):
+    path = Path(local_tmpdir) / 'large.json'
+    elements = [{'text': 'x' * 100000}, 1]
+    path.write_text(json.dumps(elements))
+    assert list(iter_json_array(path, 16)) == elements
+
+
+def test_iter_json_array_close(local_tmpdir):
+    path = Path(local_tmpdir) / 'close.json'
+    path.write_text(json.dumps(_DELTAS))
+    elements = iter_json_array(path)
+    next(elements)
+    elements.close()
+    # the file is closed: it can be removed, including on Windows
+    path.unlink()
+    assert read_json(path) is None
+
+
+def test_atomic_write(local_tmpdir):
+    path = Path(local_tmpdir) / 'atomic.txt'
+    path.write_text('previous')
+    with atomic_write(path, buffering=4) as f:
+        f.write('new content')
+        # not visible until completed
+        assert path.read_text() == 'previous'
+    assert path.read_text() == 'new content'
+    assert list(Path(local_tmpdir).glob('.atomic.txt*.tmp')) == []
+
+
+def test_atomic_write_concurrent(local_tmpdir):
+    path = Path(local_tmpdir) / 'concurrent.txt'
+
+    def write(index: int):
+        with atomic_write(path) as f:
+            f.write('writer %d' % index)
+
+    # each writer has its own temporary file
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(write, range(32)))
+    assert path.read_text().startswith('writer ')
+    assert list(Path(local_tmpdir).glob('.concurrent.txt*.tmp')) == []
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX permissions')
+def test_atomic_write_mode(local_tmpdir):
+    path = Path(local_tmpdir) / 'mode.txt'
+    path.write_text('previous')
+    path.chmod(0o640)
+    with atomic_write(path) as f:
+        f.write('new content')
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    # new file: default permissions, according to the umask
+    umask = os.umask(0o027)
+    try:
+        path = Path(local_tmpdir) / 'mode_new.txt'
+        with atomic_write(path) as f:
+            f.write('new file')
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+def test_atomic_write_error(local_tmpdir):
+    path = Path(local_tmpdir) / 'error.json'
+    assert write_json({'a': 1}, path)
+    with pytest.raises(TypeError):
+        # not serializable
+        write_json({'a': object()}, path)
+    # the file is not modified and the temporary file is removed
+    assert read_json(path) == {'a': 1}
+    assert list(Path(local_tmpdir).glob('.error.json*.tmp')) == []
+
+
+def test_copy_file(local_tmpdir, monkeypatch):
+    monkeypatch.setattr(utils, 'buffer_size', 16)
+    src = Path(local_tmpdir) / 'src.bin'
+    src.write_bytes(bytes(range(256)) * 10)
+    dst = Path(local_tmpdir) / 'dst.bin'
+    copy_file(src, dst)
+    assert dst.read_bytes() == src.read_bytes()